@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Render Micro-benchmark
+Times HTMLGenerator._process_markdown per essay against the previous
+three-pass regex implementation, and checks both put the same text in
+trajectory boxes
+
+Usage:
+    python benchmarks/bench_render.py [--repeat 50]
+"""
+
+import re
+import statistics
+import time
+from typing import List
+
+import click
+import markdown
+from rich.console import Console
+from rich.table import Table
+
+from corpus import essay_markdown
+from html_generator import HTMLGenerator
+
+
+# Layouts the essays don't cover, rendered alongside them so both pipelines'
+# trajectory boxes can be compared
+EDGE_CASES = [
+    ('edge: trajectory after a paragraph', (
+        "Where things stand today.\n## Trajectory\n\n"
+        "- Ship the renderer\n- Measure it\n\n## What's Next\n\nMore to come.\n"
+    )),
+    ('edge: heading right after trajectory', (
+        "## Trajectory\n\nNext steps for the pipeline.\n## Results\n\nNumbers below.\n"
+    )),
+]
+
+
+def trajectory_boxes(html: str) -> List[str]:
+    """Text of each trajectory box, for comparing what the two pipelines put inside them"""
+    boxes = re.findall(r'<div class="trajectory">(.*?)</div>', html, flags=re.DOTALL)
+    return [' '.join(re.sub(r'<[^>]+>', ' ', box).split()) for box in boxes]
+
+
+def legacy_process_markdown(md, content: str) -> str:
+    """The pre-extension pipeline: regex passes, shared convert, re-indent"""
+
+    def replace_callout(match):
+        header = match.group(1)
+        body_lines = match.group(2).split('\n')
+        body = ' '.join(line.replace('> ', '') for line in body_lines if line.strip())
+        return f'<div class="callout"><h4>{header}</h4><p>{body}</p></div>'
+
+    def replace_quote(match):
+        return f'<p class="pull-quote">"{match.group(1)}"</p>'
+
+    def replace_trajectory(match):
+        body_html = md.convert(match.group(1))
+        return f'<div class="trajectory"><h3>Trajectory</h3>{body_html}</div>'
+
+    content = re.sub(r'> \*\*(.+?)\*\*\n((?:> .+\n?)+)', replace_callout, content)
+    content = re.sub(r'> \*"(.+?)"\*', replace_quote, content)
+    content = re.sub(r'## Trajectory\n\n(.+?)(?=\n##|\Z)', replace_trajectory, content, flags=re.DOTALL)
+
+    html = md.convert(content)
+    lines = html.split('\n')
+    return '\n'.join('      ' + line if line.strip() else '' for line in lines)
+
+
+def time_per_call(func, repeat: int) -> float:
+    """Median seconds per call"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+@click.command()
+@click.option('--repeat', default=50, help='Renders per essay')
+def main(repeat):
+    """Compare per-post markdown render time before/after the block extension"""
+    console = Console()
+    html_gen = HTMLGenerator({})
+    legacy_md = markdown.Markdown(extensions=[
+        'tables', 'fenced_code', 'codehilite', 'nl2br', 'sane_lists'
+    ])
+
+    table = Table(title=f"Markdown render time (median of {repeat})")
+    table.add_column("Essay")
+    table.add_column("Words", justify="right")
+    table.add_column("Before", justify="right")
+    table.add_column("After", justify="right")
+    table.add_column("Speedup", justify="right")
+    table.add_column("Trajectory", justify="right")
+
+    totals = [0.0, 0.0]
+    for name, content in essay_markdown() + EDGE_CASES:
+        before = time_per_call(lambda: legacy_process_markdown(legacy_md, content), repeat)
+        after = time_per_call(lambda: html_gen._process_markdown(content), repeat)
+        totals[0] += before
+        totals[1] += after
+        # A box missing, or holding a different section, means the extension renders the post differently
+        boxes = trajectory_boxes(legacy_process_markdown(legacy_md, content))
+        same = boxes == trajectory_boxes(html_gen._process_markdown(content))
+        table.add_row(
+            name,
+            str(len(content.split())),
+            f"{before * 1000:.2f}ms",
+            f"{after * 1000:.2f}ms",
+            f"{before / after:.2f}x",
+            f"{len(boxes)} same" if same else "[red]differs[/]"
+        )
+
+    table.add_row(
+        "[bold]Total[/]", "",
+        f"{totals[0] * 1000:.2f}ms",
+        f"{totals[1] * 1000:.2f}ms",
+        f"{totals[0] / totals[1]:.2f}x",
+        ""
+    )
+    console.print(table)
+
+
+if __name__ == '__main__':
+    main()
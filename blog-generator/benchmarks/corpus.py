@@ -0,0 +1,55 @@
+"""
+Benchmark Corpus
+Recovers markdown for the site's published essays so renders can be timed
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+BENCH_DIR = Path(__file__).resolve().parent
+GENERATOR_DIR = BENCH_DIR.parent
+REPO_ROOT = GENERATOR_DIR.parent
+
+# Make src importable the same way generate.py does
+sys.path.insert(0, str(GENERATOR_DIR / 'src'))
+
+
+def essay_markdown() -> List[Tuple[str, str]]:
+    """(filename, markdown) for every essay-*.html at the repo root"""
+    essays = []
+    for path in sorted(REPO_ROOT.glob('essay-*.html')):
+        soup = BeautifulSoup(path.read_text(encoding='utf-8'), 'html.parser')
+        article = soup.find(class_='article-content') or soup.find('article') or soup.body
+        essays.append((path.name, _to_markdown(article)))
+    return essays
+
+
+def _to_markdown(element) -> str:
+    """Map the essay markup back onto the generator's markdown conventions"""
+    blocks = []
+    for child in element.find_all(recursive=False):
+        classes = child.get('class') or []
+        text = child.get_text(' ', strip=True)
+
+        if 'callout' in classes:
+            header = child.find('h4')
+            body = ' '.join(p.get_text(' ', strip=True) for p in child.find_all(['p', 'li']))
+            blocks.append(f"> **{header.get_text(strip=True) if header else 'Note'}**\n> {body}")
+        elif 'pull-quote' in classes:
+            blocks.append(f'> *"{text.strip(chr(34))}"*')
+        elif 'trajectory' in classes:
+            body = '\n\n'.join(p.get_text(' ', strip=True) for p in child.find_all(['p', 'li']))
+            blocks.append(f"## Trajectory\n\n{body}")
+        elif child.name in ('h2', 'h3', 'h4'):
+            blocks.append(f"{'#' * int(child.name[1])} {text}")
+        elif child.name in ('ul', 'ol'):
+            blocks.append('\n'.join(f"- {li.get_text(' ', strip=True)}" for li in child.find_all('li')))
+        elif child.name == 'pre':
+            blocks.append(f"```\n{child.get_text()}\n```")
+        elif text:
+            blocks.append(text)
+
+    return '\n\n'.join(blocks)
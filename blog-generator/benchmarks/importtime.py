@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+CLI Startup Benchmark
+Measures import time for a generate.py command with `python -X importtime`
+and fails if it exceeds a budget or pulls in heavyweight dependencies
+
+Usage:
+    python benchmarks/importtime.py [--command convert] [--budget-ms 500]
+"""
+
+import statistics
+import subprocess
+import sys
+
+import click
+from rich.console import Console
+from rich.table import Table
+
+from corpus import GENERATOR_DIR
+
+
+# Modules that only generation or specific input types should load
+HEAVY_MODULES = ['anthropic', 'requests', 'bs4', 'PyPDF2', 'pdfplumber', 'PIL', 'pytesseract', 'numpy']
+
+
+def measure(command: str):
+    """
+    Run one cold start
+
+    Returns (total microseconds, {top-level module: microseconds}, every
+    imported module name, including ones imported by other modules).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(GENERATOR_DIR / 'generate.py'), command, '--help'],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    modules = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.add(name.strip())
+        # Nested imports are indented; their time is already in the parent's cumulative
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+
+    return sum(modules.values()), modules, imported
+
+
+@click.command()
+@click.option('--command', default='convert', help='generate.py command to start')
+@click.option('--budget-ms', default=500.0, help='Maximum median import time')
+@click.option('--runs', default=5, help='Cold starts to measure')
+def main(command, budget_ms, runs):
+    """Fail if CLI startup regresses past the budget"""
+    console = Console()
+
+    totals = []
+    modules = {}
+    for _ in range(runs):
+        total, modules, imported = measure(command)
+        totals.append(total)
+    median_ms = statistics.median(totals) / 1000
+
+    table = Table(title=f"Slowest top-level imports for '{command}'")
+    table.add_column("Module")
+    table.add_column("Cumulative", justify="right")
+    for name, micros in sorted(modules.items(), key=lambda item: -item[1])[:10]:
+        table.add_row(name, f"{micros / 1000:.1f}ms")
+    console.print(table)
+
+    failed = False
+
+    loaded_heavy = [
+        name for name in HEAVY_MODULES
+        if any(module == name or module.startswith(name + '.') for module in imported)
+    ]
+    if loaded_heavy:
+        console.print(f"[red]✗[/] Heavy modules imported at startup: {', '.join(loaded_heavy)}")
+        failed = True
+
+    if median_ms > budget_ms:
+        console.print(f"[red]✗[/] Import time {median_ms:.0f}ms exceeds budget of {budget_ms:.0f}ms")
+        failed = True
+    else:
+        console.print(f"[green]✓[/] Import time {median_ms:.0f}ms (budget {budget_ms:.0f}ms)")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
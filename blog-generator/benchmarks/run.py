@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Times extraction, response parsing, rendering and an offline end-to-end
+generate on synthetic inputs of increasing size, measures each case's peak
+memory, stores the results per git commit and compares them with an earlier run
+
+Usage:
+    python benchmarks/run.py [--filter extract.pdf] [--compare HEAD~1] [--threshold 10]
+"""
+
+import json
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import click
+import yaml
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+
+from corpus import BENCH_DIR, GENERATOR_DIR, essay_markdown
+import synthetic
+
+RESULTS_DIR = BENCH_DIR / 'results'
+
+# name -> (params, setup); setup(param, workdir) returns the callable to time
+BENCHMARKS: Dict[str, tuple] = {}
+
+
+def benchmark(name: str, params: List):
+    """Register a benchmark run once per param"""
+    def decorator(setup):
+        BENCHMARKS[name] = (params, setup)
+        return setup
+    return decorator
+
+
+def bench_config(workdir: Path) -> Dict:
+    """The repo config with caches in a scratch dir and rate limits off"""
+    with open(GENERATOR_DIR / 'config.yaml', 'r') as f:
+        config = yaml.safe_load(f)
+    config['cache'] = dict(config.get('cache', {}), dir=str(workdir / 'cache'))
+    config['rate_limit'] = dict(config.get('rate_limit', {}), requests_per_minute=0, tokens_per_minute=0)
+    return config
+
+
+@benchmark('extract.pdf', params=[5, 20, 60])
+def bench_extract_pdf(pages: int, workdir: Path) -> Callable:
+    from input_processor import InputProcessor
+
+    path = synthetic.write_pdf(workdir / f'synthetic-{pages}.pdf', pages)
+    processor = InputProcessor(bench_config(workdir), use_cache=False)
+    return lambda: processor.process(str(path))
+
+
+@benchmark('extract.image', params=[1000, 4000, 12000])
+def bench_extract_image(height: int, workdir: Path) -> Optional[Callable]:
+    if not shutil.which('tesseract'):
+        return None
+    from input_processor import InputProcessor
+
+    path = synthetic.write_screenshot(workdir / f'screenshot-{height}.png', height)
+    processor = InputProcessor(bench_config(workdir), use_cache=False)
+    return lambda: processor.process(str(path))
+
+
+@benchmark('extract.transcript', params=[2000, 20000, 200000])
+def bench_extract_transcript(words: int, workdir: Path) -> Callable:
+    from input_processor import InputProcessor
+
+    path = workdir / f'transcript-{words}.txt'
+    path.write_text(synthetic.transcript(words), encoding='utf-8')
+    processor = InputProcessor(bench_config(workdir), use_cache=False)
+    return lambda: processor.process(str(path))
+
+
+@benchmark('clean.pages', params=[1000, 5000, 20000])
+def bench_clean_pages(pages: int, workdir: Path) -> Callable:
+    """Joining and cleaning extracted PDF pages (~3.5KB each), as _process_pdf does"""
+    import random
+    from input_processor import _iter_clean_text, _iter_page_texts
+
+    rng = random.Random(0)
+    texts = [synthetic.page_text(rng) for _ in range(min(pages, 200))]
+    sizes = [len(text) for text in texts]
+    corpus = ''.join(texts)
+
+    def run():
+        # Slicing gives each page its own string, like pages coming back from extraction
+        extracted = []
+        offset = 0
+        for number in range(pages):
+            size = sizes[number % len(sizes)]
+            if offset + size > len(corpus):
+                offset = 0
+            extracted.append({'index': number + 1, 'text': corpus[offset:offset + size]})
+            offset += size
+        return ''.join(_iter_clean_text(_iter_page_texts(extracted)))
+
+    return run
+
+
+@benchmark('extract.text', params=[1, 10, 50])
+def bench_extract_text(megabytes: int, workdir: Path) -> Callable:
+    """Reading and fingerprinting a plain-text transcript of this many MB"""
+    from input_processor import InputProcessor
+
+    path = workdir / f'transcript-{megabytes}mb.txt'
+    words = synthetic.transcript(150000)
+    with open(path, 'w', encoding='utf-8') as f:
+        for _ in range(max(1, round(megabytes * 1e6 / len(words)))):
+            f.write(words)
+            f.write('\n\n\n')
+    processor = InputProcessor(bench_config(workdir), use_cache=False)
+    return lambda: processor.process(str(path))
+
+
+@benchmark('fingerprint.simhash', params=[2000, 20000, 200000])
+def bench_fingerprint(words: int, workdir: Path) -> Callable:
+    from fingerprint import simhash
+
+    content = synthetic.transcript(words)
+    return lambda: simhash(content)
+
+
+def write_site(site: Path, posts: int) -> Path:
+    """A directory of post markdown files, ~1500 words each"""
+    site.mkdir()
+    for number in range(posts):
+        (site / f'post-{number}.md').write_text(
+            f"---\ntitle: Post {number}\ndate: 2025-01-01\ntags: [tag-{number % 20}]\n---\n\n"
+            f"{synthetic.transcript(1500, seed=number)}\n",
+            encoding='utf-8'
+        )
+    return site
+
+
+@benchmark('related.update', params=[100, 500])
+def bench_related_update(posts: int, workdir: Path) -> Callable:
+    """Re-scoring one edited post against a site of this many posts"""
+    import os
+    from post_index import PostIndex
+    from related_posts import RelatedIndex
+
+    site = write_site(workdir / f'related-{posts}', posts)
+    config = bench_config(workdir)
+    index = PostIndex(config, str(site))
+    RelatedIndex(config, str(site)).update(index.refresh())
+    edited = site / 'post-0.md'
+
+    def run():
+        stat = edited.stat()
+        os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        return RelatedIndex(config, str(site)).update(index.refresh())
+
+    return run
+
+
+@benchmark('search.index', params=[100, 500])
+def bench_search_index(posts: int, workdir: Path) -> Callable:
+    """Encoding the sharded search index with every page's terms already cached"""
+    from site_builder import SiteBuilder
+
+    site = write_site(workdir / f'search-{posts}', posts)
+    builder = SiteBuilder(bench_config(workdir), str(site))
+    builder.build()
+    entries = builder.index.refresh()
+    return lambda: builder.search.update(entries)
+
+
+@benchmark('parse.response', params=[10000, 100000, 1000000])
+def bench_parse_response(chars: int, workdir: Path) -> Callable:
+    from ai_generator import AIGenerator
+    from mock_client import MockAnthropic
+
+    generator = AIGenerator(bench_config(workdir), use_cache=False, client=MockAnthropic())
+    response = synthetic.model_response(chars)
+    return lambda: generator._parse_response(response)
+
+
+@benchmark('render.essay', params=[Path(name).stem for name, _ in essay_markdown()])
+def bench_render_essay(name: str, workdir: Path) -> Callable:
+    from html_generator import HTMLGenerator
+
+    content = {Path(essay).stem: markdown for essay, markdown in essay_markdown()}[name]
+    html_gen = HTMLGenerator(bench_config(workdir))
+    return lambda: html_gen.generate_html(
+        title=name, content=content, excerpt='', category='Research', date='2025-01-01'
+    )
+
+
+@benchmark('generate.mock', params=[2000, 20000, 200000])
+def bench_generate_mock(words: int, workdir: Path) -> Callable:
+    """Offline end-to-end generation; the largest size takes the map-reduce path"""
+    from ai_generator import AIGenerator
+    from mock_client import MockAnthropic
+
+    content = synthetic.transcript(words)
+    generator = AIGenerator(bench_config(workdir), use_cache=False, client=MockAnthropic())
+    return lambda: generator.generate_blog_post(content, 'transcript', {}, None, 'Benchmark')
+
+
+def measure(func: Callable, repeat: int, max_seconds: float) -> Dict:
+    """
+    Time func after one warm-up call, stopping early once max_seconds is spent
+
+    Cases whose warm-up alone exceeds the budget get a single timed run.
+    """
+    start = time.perf_counter()
+    func()
+    min_runs = 1 if time.perf_counter() - start > max_seconds else 3
+
+    samples = []
+    deadline = time.perf_counter() + max_seconds
+    while len(samples) < repeat and (len(samples) < min_runs or time.perf_counter() < deadline):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'runs': len(samples),
+    }
+
+
+def peak_memory(func: Callable) -> int:
+    """Peak bytes allocated by one call, as seen by tracemalloc (this process only)"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def git_revision() -> str:
+    """Short HEAD sha, suffixed with -dirty if the generator has uncommitted changes"""
+    def git(*args):
+        return subprocess.run(
+            ['git', *args], cwd=GENERATOR_DIR, capture_output=True, text=True
+        ).stdout.strip()
+
+    sha = git('rev-parse', '--short', 'HEAD') or 'unknown'
+    return f'{sha}-dirty' if git('status', '--porcelain', '--', '.') else sha
+
+
+def load_baseline(ref: Optional[str], current: str) -> Optional[Dict]:
+    """Results for ref (a commit or results file), or the latest run of another commit"""
+    if ref:
+        path = Path(ref)
+        if not path.exists():
+            sha = subprocess.run(
+                ['git', 'rev-parse', '--short', ref], cwd=GENERATOR_DIR, capture_output=True, text=True
+            ).stdout.strip() or ref
+            path = RESULTS_DIR / f'{sha}.json'
+        if not path.exists():
+            raise click.BadParameter(f"No stored results for {ref}", param_hint='--compare')
+    else:
+        runs = sorted(
+            (p for p in RESULTS_DIR.glob('*.json') if p.stem != current),
+            key=lambda p: p.stat().st_mtime
+        )
+        if not runs:
+            return None
+        path = runs[-1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@click.command()
+@click.option('--filter', 'name_filter', default='', help='Only run benchmarks whose name contains this')
+@click.option('--repeat', default=20, help='Maximum timed runs per case')
+@click.option('--max-seconds', default=3.0, help='Time budget per case (at least 3 runs unless one call exceeds it)')
+@click.option('--compare', 'compare_ref', help='Commit or results file to compare against (default: latest other run)')
+@click.option('--threshold', default=10.0, help='Percent slowdown reported as a regression')
+@click.option('--fail-on-regression', is_flag=True, help='Exit non-zero if any case regressed')
+@click.option('--memory/--no-memory', default=True, help='Measure peak memory with one extra traced call per case')
+def main(name_filter, repeat, max_seconds, compare_ref, threshold, fail_on_regression, memory):
+    """Run the benchmark suite and store results under benchmarks/results/"""
+    console = Console()
+    revision = git_revision()
+    baseline = load_baseline(compare_ref, revision)
+    baseline_cases = baseline['cases'] if baseline else {}
+
+    table = Table(title=f"Benchmarks @ {revision}" + (f" vs {baseline['revision']}" if baseline else ""))
+    table.add_column("Case", no_wrap=True)
+    table.add_column("Median", justify="right")
+    table.add_column("Min", justify="right")
+    table.add_column("Runs", justify="right")
+    table.add_column("Peak", justify="right")
+    table.add_column("Baseline", justify="right")
+    table.add_column("Change", justify="right")
+
+    cases = {}
+    regressions = []
+    with tempfile.TemporaryDirectory(prefix='blog-bench-') as tmp:
+        workdir = Path(tmp)
+        for name, (params, setup) in BENCHMARKS.items():
+            if name_filter not in name:
+                continue
+            for param in params:
+                case = f'{name}[{param}]'
+                func = setup(param, workdir)
+                if func is None:
+                    table.add_row(escape(case), "[dim]skipped[/]", "", "", "", "", "")
+                    continue
+
+                result = measure(func, repeat, max_seconds)
+                if memory:
+                    result['peak_bytes'] = peak_memory(func)
+                cases[case] = result
+
+                before = baseline_cases.get(case)
+                change = ""
+                if before:
+                    delta = (result['median'] / before['median'] - 1) * 100
+                    style = 'red' if delta > threshold else 'green' if delta < -threshold else 'dim'
+                    change = f"[{style}]{delta:+.1f}%[/]"
+                    if delta > threshold:
+                        regressions.append(case)
+
+                table.add_row(
+                    escape(case),
+                    f"{result['median'] * 1000:.2f}ms",
+                    f"{result['min'] * 1000:.2f}ms",
+                    str(result['runs']),
+                    f"{result['peak_bytes'] / 1e6:.1f}MB" if memory else "-",
+                    f"{before['median'] * 1000:.2f}ms" if before else "-",
+                    change
+                )
+
+    console.print(table)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    results_path = RESULTS_DIR / f'{revision}.json'
+
+    # A filtered run updates its cases and keeps the rest of this revision's results
+    if results_path.exists():
+        with open(results_path, 'r', encoding='utf-8') as f:
+            cases = dict(json.load(f).get('cases', {}), **cases)
+    with open(results_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'revision': revision,
+            'timestamp': time.time(),
+            'machine': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'processor': platform.processor(),
+            },
+            'cases': cases,
+        }, f, indent=2)
+    console.print(f"[dim]Results written to {results_path}[/]")
+
+    if regressions:
+        console.print(f"[red]{len(regressions)} case(s) slower than {threshold:.0f}%:[/] {escape(', '.join(regressions))}")
+        if fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+"""
+Synthetic Benchmark Inputs
+Deterministic PDFs, screenshots, transcripts and model responses of a given size
+"""
+
+import random
+from pathlib import Path
+from typing import List
+
+WORDS = (
+    'neural rendering pipeline gaussian splatting radiance field volumetric capture '
+    'compositing lighting texture artist production shot frame camera depth motion '
+    'sampling denoising latency throughput model training inference dataset workflow '
+    'studio pixel shader geometry reconstruction temporal stable diffusion control '
+    'character animation review iteration realtime engine plate matte roto tracking'
+).split()
+
+
+def sentence(rng: random.Random, words: int = 14) -> str:
+    text = ' '.join(rng.choice(WORDS) for _ in range(words))
+    return text[0].upper() + text[1:] + '.'
+
+
+def paragraph(rng: random.Random, sentences: int = 5) -> str:
+    return ' '.join(sentence(rng, rng.randint(8, 20)) for _ in range(sentences))
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int = 45, seed: int = 0) -> Path:
+    """Write a text PDF with `pages` pages of Helvetica body text (no dependencies)"""
+    rng = random.Random(seed)
+
+    def escape(text: str) -> str:
+        return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+    objects: List[bytes] = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'',  # Pages, filled in once the page object numbers are known
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    ]
+    page_refs = []
+    for number in range(pages):
+        lines = [f'Section {number + 1}'] + [
+            sentence(rng, rng.randint(10, 15)) for _ in range(lines_per_page)
+        ]
+        stream = 'BT /F1 10 Tf 12 TL 50 790 Td\n' + ''.join(
+            f'({escape(line)}) Tj T*\n' for line in lines
+        ) + 'ET'
+        data = stream.encode('latin-1')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(data), data))
+        content_ref = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+            b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % content_ref
+        )
+        page_refs.append(len(objects))
+
+    kids = ' '.join(f'{ref} 0 R' for ref in page_refs)
+    objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {pages} >>'.encode('latin-1')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+
+    path.write_bytes(bytes(out))
+    return path
+
+
+def page_text(rng: random.Random, lines: int = 45) -> str:
+    """Text of one extracted PDF page, with the ragged spacing extractors leave behind"""
+    out = []
+    for _ in range(lines):
+        line = sentence(rng, rng.randint(10, 15))
+        if rng.random() < 0.2:
+            line = line.replace(' ', '   ', 2)
+        out.append(line + ('\n\n\n' if rng.random() < 0.1 else ''))
+    return '\n'.join(out)
+
+
+def write_screenshot(path: Path, height: int, width: int = 1200, seed: int = 0) -> Path:
+    """Write a tall PNG of dark-on-light text lines, like a scrolling screenshot"""
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    image = Image.new('L', (width, height), color=245)
+    draw = ImageDraw.Draw(image)
+    for top in range(20, height - 20, 22):
+        draw.text((30, top), sentence(rng, rng.randint(10, 16)), fill=20)
+    image.save(path)
+    return path
+
+
+def transcript(words: int, seed: int = 0) -> str:
+    """A two-speaker interview transcript of roughly `words` words"""
+    rng = random.Random(seed)
+    turns = []
+    count = 0
+    speakers = ['Interviewer', 'Guest']
+    while count < words:
+        text = paragraph(rng, rng.randint(1, 4))
+        turns.append(f'{speakers[len(turns) % 2]}: {text}')
+        count += len(text.split())
+    return '\n\n'.join(turns)
+
+
+def model_response(chars: int, seed: int = 0) -> str:
+    """A well-formed TITLE/CATEGORY/EXCERPT/TAGS response with a body of ~chars characters"""
+    rng = random.Random(seed)
+    parts = [
+        'TITLE: Synthetic Benchmark Post',
+        'CATEGORY: Research',
+        'EXCERPT: ' + sentence(rng, 25),
+        'TAGS: rendering, benchmarks, synthetic',
+        '',
+        '---',
+        '',
+    ]
+    size = 0
+    section = 0
+    while size < chars:
+        section += 1
+        block = [f'## Section {section}', '', paragraph(rng), '', paragraph(rng), '']
+        if section % 3 == 0:
+            block += ['> **Key Finding**', f'> {sentence(rng)}', '']
+        if section % 4 == 0:
+            block += [f'> *"{sentence(rng, 10)}"*', '']
+        text = '\n'.join(block)
+        parts.append(text)
+        size += len(text)
+    parts += ['## Trajectory', '', paragraph(rng)]
+    return '\n'.join(parts)
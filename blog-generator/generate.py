@@ -6,6 +6,7 @@ One-command blog post generation from any input type
 
 import os
 import sys
+import time
 from pathlib import Path
 from datetime import datetime
 import yaml
@@ -15,6 +16,9 @@ from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.live import Live
+from rich.table import Table
+from rich.spinner import Spinner
 from dotenv import load_dotenv
 
 # Add src to path
@@ -22,7 +26,16 @@ sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from input_processor import InputProcessor
 from ai_generator import AIGenerator
+from mock_client import MockAnthropic
 from html_generator import HTMLGenerator
+from batch_runner import BatchRunner, load_batch_items
+from extraction_cache import ExtractionCache
+from response_cache import ResponseCache
+from site_builder import SiteBuilder
+from job_store import JobStore, content_hash
+from fingerprint import simhash
+from post_store import PostStore
+import tracing
 
 # Load environment variables
 load_dotenv()
@@ -38,6 +51,153 @@ def load_config():
         return yaml.safe_load(f)
 
 
+def build_timings_table(timings):
+    """Build the per-page/tile extraction timing table for --verbose"""
+    unit = timings['unit'].capitalize()
+    table = Table(title=f"{unit} timings ({timings['total']:.2f}s wall-clock)")
+    table.add_column(unit, justify="right")
+    table.add_column("Extractor")
+    table.add_column("Time", justify="right")
+
+    for part in timings['parts']:
+        table.add_row(str(part['index']), part['extractor'], f"{part['seconds'] * 1000:.0f}ms")
+
+    return table
+
+
+def format_usage(usage):
+    """One-line summary of a call's (or a run's) input tokens by prompt-cache status"""
+    total = usage['input_tokens'] + usage['cache_write_tokens'] + usage['cache_read_tokens']
+    line = (
+        f"{total:,} input tokens ({usage['cache_read_tokens']:,} cached, "
+        f"{usage['cache_write_tokens']:,} written to cache, {usage['input_tokens']:,} uncached), "
+        f"{usage['output_tokens']:,} output"
+    )
+    if usage.get('seconds') is not None:
+        line += f" in {usage['seconds']:.1f}s"
+    return line
+
+
+def print_last_usage(generator, calls_before):
+    """Print token usage for each API call made since calls_before"""
+    for entry in generator.usage_log[calls_before:]:
+        console.print(f"[dim]{entry['call']}: {format_usage(entry)}[/]")
+
+
+def build_profile_table(summary, run_seconds):
+    """Build the per-stage timing/size/token table shown after a --profile run"""
+    table = Table(title="Profile", expand=True)
+    table.add_column("Span", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Total", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("% of run", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Pages", justify="right")
+    table.add_column("Tokens in/out", justify="right")
+
+    for row in summary:
+        attributes = row['attributes']
+        tokens_in = sum(
+            attributes.get(key, 0) for key in ('input_tokens', 'cache_write_tokens', 'cache_read_tokens')
+        )
+        tokens = (
+            f"{tokens_in:,}/{attributes.get('output_tokens', 0):,}"
+            if 'output_tokens' in attributes else ""
+        )
+        table.add_row(
+            row['name'],
+            str(row['count']),
+            f"{row['total']:.3f}s",
+            f"{row['max']:.3f}s",
+            f"{row['total'] / run_seconds * 100:.0f}%" if run_seconds else "",
+            f"{attributes['bytes']:,}" if 'bytes' in attributes else "",
+            str(attributes['pages']) if 'pages' in attributes else "",
+            tokens
+        )
+
+    return table
+
+
+def start_profile(config, command, output=None, format='jsonl'):
+    """
+    Trace the rest of this command
+
+    Spans are written to output (default: a timestamped file under the cache
+    dir) and summarized in a table when the command exits, even on failure.
+    """
+    tracer = tracing.enable()
+    root = tracer.start(command, None, {})
+
+    if not output:
+        cache_dir = Path(config.get('cache', {}).get('dir', '~/.cache/blog-generator')).expanduser()
+        suffix = 'json' if format == 'otlp' else 'jsonl'
+        output = cache_dir / 'traces' / f"{command}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{suffix}"
+
+    def finish():
+        tracer.end(root)
+        tracing.disable()
+        tracer.write(str(output), format)
+        console.print(build_profile_table(tracer.summary(), root.seconds))
+        console.print(f"[dim]Trace written to {output}[/]")
+
+    click.get_current_context().call_on_close(finish)
+
+
+def build_post_panel(blog_post):
+    """Build the generated-metadata panel"""
+    return Panel(
+        f"[bold]Title:[/] {blog_post['title']}\n"
+        f"[bold]Category:[/] {blog_post['category']}\n"
+        f"[bold]Tags:[/] {', '.join(blog_post['tags'])}\n"
+        f"[bold]Excerpt:[/] {blog_post['excerpt']}",
+        title="📝 Generated Blog Post",
+        border_style="green"
+    )
+
+
+def search_summary(search):
+    """Panel line for SiteBuilder.build()'s search index stats, empty if search is off"""
+    if not search:
+        return ""
+    return (
+        f"[bold]Search index:[/] {search['terms']:,} terms in {search['shards']} shards, "
+        f"{search['bytes'] / 1024:.0f}KB gzipped ({search['written']} files written)\n"
+    )
+
+
+def stream_blog_post(generator, processed, prompt, title, on_response=None):
+    """Generate a post while rendering the header and markdown body as they stream in"""
+    body_parts = []
+
+    def render_body():
+        if not body_parts:
+            return Spinner("dots", text="Claude is writing your blog post...")
+        # Only the tail fits on screen while the post is still being written
+        lines = ''.join(body_parts).split('\n')
+        return Markdown('\n'.join(lines[-max(5, console.height - 4):]))
+
+    with Live(
+        get_renderable=render_body,
+        console=console,
+        refresh_per_second=8,
+        transient=True
+    ) as live:
+        blog_post = generator.stream_blog_post(
+            content=processed['content'],
+            source_type=processed['source_type'],
+            metadata=processed['metadata'],
+            user_prompt=prompt,
+            suggested_title=title or processed['title'],
+            on_header=lambda header: live.console.print(build_post_panel(header)),
+            on_body=body_parts.append,
+            on_response=on_response
+        )
+
+    console.print("[green]✓ Blog post generated[/]")
+    return blog_post
+
+
 @click.group()
 def cli():
     """Blog Post Generator - Turn any content into beautiful blog posts"""
@@ -45,13 +205,25 @@ def cli():
 
 
 @cli.command()
-@click.argument('input_path')
+@click.argument('input_path', required=False)
 @click.option('--prompt', '-p', help='Additional instructions for the AI')
 @click.option('--title', '-t', help='Override auto-detected title')
 @click.option('--category', '-c', help='Blog post category')
 @click.option('--output', '-o', help='Output file path (default: auto-generated)')
 @click.option('--no-edit', is_flag=True, help='Skip interactive editing')
-def generate(input_path, prompt, title, category, output, no_edit):
+@click.option('--no-cache', is_flag=True, help='Ignore cached extraction results and API responses')
+@click.option('--stream', is_flag=True, help='Show the post as Claude writes it')
+@click.option('--pages', help='PDF page range to extract, e.g. "1-20,25"')
+@click.option('--verbose', '-v', is_flag=True, help='Show per-page/tile extraction timings')
+@click.option('--resume', 'resume_id', metavar='JOB', help='Resume a saved job, skipping completed stages')
+@click.option('--skip-duplicates', is_flag=True, help='Stop before generating if the source was already used')
+@click.option('--dry-run', is_flag=True, help='Use an offline mock client instead of Claude (no API key, nothing billed)')
+@click.option('--profile', is_flag=True, help='Trace each stage and print a timing summary')
+@click.option('--profile-output', type=click.Path(), help='Trace file (default: under the cache dir)')
+@click.option('--profile-format', type=click.Choice(['jsonl', 'otlp']), default='jsonl',
+              help='Trace as JSONL spans or OpenTelemetry OTLP/JSON')
+def generate(input_path, prompt, title, category, output, no_edit, no_cache, stream, pages, verbose, resume_id,
+             skip_duplicates, dry_run, profile, profile_output, profile_format):
     """
     Generate a blog post from any input
 
@@ -60,68 +232,147 @@ def generate(input_path, prompt, title, category, output, no_edit):
         generate https://example.com/article
         generate screenshot.png
         generate transcript.txt --prompt "Focus on the key technical insights"
+        generate --resume 3f9a1c2b7d04
     """
 
+    job = None
     try:
         config = load_config()
+        jobs = JobStore.from_config(config)
+
+        if profile:
+            start_profile(config, 'generate', profile_output, profile_format)
+
+        # Every stage is checkpointed in the job's work directory, so a failed
+        # or abandoned run can pick up where it stopped
+        if resume_id:
+            job = jobs.open(resume_id)
+            input_path = job.meta['input']
+            options = job.meta['options']
+            prompt, title, category, pages = (
+                options['prompt'], options['title'], options['category'], options['pages']
+            )
+            console.print(f"\n[bold cyan]Resuming job {job.id}:[/] {input_path} "
+                          f"[dim](completed: {', '.join(job.meta.get('stages', [])) or 'nothing'})[/]")
+        elif not input_path:
+            raise click.UsageError("Give an INPUT_PATH or --resume JOB")
+        else:
+            options = {'prompt': prompt, 'title': title, 'category': category, 'pages': pages}
+            job = jobs.create('post', jobs.input_identity(input_path), options)
+            job.update(input=input_path)
+
+        store = PostStore.from_config(config)
+        source_hash = content_hash(input_path)
+        earlier = store.by_source(input_path, source_hash)
+        if earlier and not job.has('post'):
+            console.print(f"[yellow]Note:[/] this source already produced {earlier[0]['output']} "
+                          f"({earlier[0]['date']}, \"{earlier[0]['title']}\")")
 
         # Step 1: Process input
         console.print("\n[bold cyan]Step 1:[/] Processing input...", style="bold")
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Reading and extracting content...", total=None)
+        if job.has('processed'):
+            processed = job.load('processed')
+            source_note = " [dim](resumed)[/]"
+        else:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                task = progress.add_task("Reading and extracting content...", total=None)
 
-            processor = InputProcessor(config)
-            processed = processor.process(input_path)
+                processor = InputProcessor(config, use_cache=not no_cache, pages=pages)
+                processed = processor.process(input_path)
 
-            progress.update(task, description="✓ Content extracted successfully")
+                progress.update(task, description="✓ Content extracted successfully")
+
+            job.save('processed', {k: v for k, v in processed.items() if k not in ('cached', 'timings')})
+            source_note = " [dim](cached)[/]" if processed['cached'] else ""
 
         # Show extracted info
         console.print(Panel(
-            f"[bold]Source Type:[/] {processed['source_type']}\n"
+            f"[bold]Source Type:[/] {processed['source_type']}{source_note}\n"
             f"[bold]Detected Title:[/] {processed['title'] or 'None'}\n"
             f"[bold]Content Length:[/] {len(processed['content'])} characters",
             title="📄 Extracted Content",
             border_style="green"
         ))
 
+        if verbose and processed.get('timings'):
+            console.print(build_timings_table(processed['timings']))
+
+        # Near-duplicates of earlier sources are caught before any tokens are spent
+        dedup = config.get('dedup', {})
+        fingerprint = processed.get('fingerprint') or simhash(processed['content'], dedup.get('shingle_words', 3))
+        if not job.has('response') and not job.has('post'):
+            reported = {post['id'] for post in earlier}
+            # Empty sources (a failed OCR, a blank page) have no fingerprint to compare
+            similar = [
+                post for post in store.near_duplicates(fingerprint, dedup.get('max_distance', 6))
+                if post['id'] not in reported
+            ] if fingerprint else []
+            if similar:
+                console.print(f"[yellow]Near-duplicate:[/] this source is {similar[0]['distance']} bits from "
+                              f"the source of {similar[0]['output']} (\"{similar[0]['title']}\")")
+            if skip_duplicates and (earlier or similar):
+                console.print(f"[dim]Skipped (--skip-duplicates). To generate anyway:[/] "
+                              f"python generate.py generate --resume {job.id}")
+                return
+
         # Step 2: Generate blog post
         console.print("\n[bold cyan]Step 2:[/] Generating blog post with AI...", style="bold")
 
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console,
-        ) as progress:
-            task = progress.add_task("Claude is writing your blog post...", total=None)
-
-            generator = AIGenerator(config)
-            blog_post = generator.generate_blog_post(
-                content=processed['content'],
-                source_type=processed['source_type'],
-                metadata=processed['metadata'],
-                user_prompt=prompt,
-                suggested_title=title or processed['title']
+        # Mock responses never go into the response cache, where a real run could pick them up
+        generator = AIGenerator(
+            config,
+            use_cache=not no_cache and not dry_run,
+            client=MockAnthropic() if dry_run else None
+        )
+        generation_start = time.monotonic()
+        generation_seconds = None
+
+        if job.has('post'):
+            blog_post = job.load('post')
+            console.print(build_post_panel(blog_post))
+        elif job.has('response'):
+            blog_post = generator._parse_response(job.load('response'))
+            console.print(build_post_panel(blog_post))
+        elif stream:
+            # Metadata panel is printed as soon as the header arrives
+            blog_post = stream_blog_post(
+                generator, processed, prompt, title,
+                on_response=lambda text: job.save('response', text)
             )
+        else:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                task = progress.add_task("Claude is writing your blog post...", total=None)
+
+                blog_post = generator.generate_blog_post(
+                    content=processed['content'],
+                    source_type=processed['source_type'],
+                    metadata=processed['metadata'],
+                    user_prompt=prompt,
+                    suggested_title=title or processed['title'],
+                    on_response=lambda text: job.save('response', text)
+                )
 
-            progress.update(task, description="✓ Blog post generated")
+                progress.update(task, description="✓ Blog post generated")
 
-        # Show generated metadata
-        console.print(Panel(
-            f"[bold]Title:[/] {blog_post['title']}\n"
-            f"[bold]Category:[/] {blog_post['category']}\n"
-            f"[bold]Tags:[/] {', '.join(blog_post['tags'])}\n"
-            f"[bold]Excerpt:[/] {blog_post['excerpt']}",
-            title="📝 Generated Blog Post",
-            border_style="green"
-        ))
+            # Show generated metadata
+            console.print(build_post_panel(blog_post))
+
+        if generator.usage_log:
+            generation_seconds = time.monotonic() - generation_start
+        job.save('post', blog_post)
+        print_last_usage(generator, 0)
 
-        # Step 3: Interactive editing (unless --no-edit)
-        if not no_edit:
+        # Step 3: Interactive editing (unless --no-edit or already reviewed)
+        if not no_edit and not job.meta.get('reviewed'):
             console.print("\n[bold cyan]Step 3:[/] Review and edit", style="bold")
 
             # Show preview
@@ -139,10 +390,12 @@ def generate(input_path, prompt, title, category, output, no_edit):
                 )
 
                 if choice == "continue":
+                    job.update(reviewed=True)
                     break
                 elif choice == "edit-title":
                     new_title = Prompt.ask("Enter new title", default=blog_post['title'])
                     blog_post['title'] = new_title
+                    job.save('post', blog_post)
                     console.print("[green]✓ Title updated[/]")
                 elif choice == "edit-category":
                     new_category = Prompt.ask(
@@ -151,18 +404,23 @@ def generate(input_path, prompt, title, category, output, no_edit):
                         default=blog_post['category']
                     )
                     blog_post['category'] = new_category
+                    job.save('post', blog_post)
                     console.print("[green]✓ Category updated[/]")
                 elif choice == "refine":
                     feedback = Prompt.ask("What would you like to change?")
                     console.print("[dim]Refining with Claude...[/]")
+                    calls_before = len(generator.usage_log)
                     blog_post['content'] = generator.refine_post(blog_post['content'], feedback)
+                    job.save('post', blog_post)
                     console.print("[green]✓ Content refined[/]")
+                    print_last_usage(generator, calls_before)
                 elif choice == "preview":
                     console.print("\n[bold]Full Content:[/]")
                     console.print(Markdown(blog_post['content']))
                     console.print()
                 elif choice == "quit":
-                    console.print("[yellow]Cancelled[/]")
+                    console.print(f"[yellow]Cancelled[/] [dim]- edits saved; resume with: "
+                                  f"python generate.py generate --resume {job.id}[/]")
                     return
 
         # Step 4: Generate HTML
@@ -172,16 +430,25 @@ def generate(input_path, prompt, title, category, output, no_edit):
         if category:
             blog_post['category'] = category
 
+        date = job.meta.get('date') or datetime.now().strftime('%Y-%m-%d')
+
         html_gen = HTMLGenerator(config)
-        html = html_gen.generate_html(
-            title=blog_post['title'],
-            content=blog_post['content'],
-            excerpt=blog_post['excerpt'],
-            category=blog_post['category'],
-            date=datetime.now().strftime('%Y-%m-%d')
-        )
+        if job.has('html'):
+            html = job.load('html')
+        else:
+            html = html_gen.generate_html(
+                title=blog_post['title'],
+                content=blog_post['content'],
+                excerpt=blog_post['excerpt'],
+                category=blog_post['category'],
+                date=date
+            )
+            job.update(date=date)
+            job.save('html', html)
 
         # Determine output path
+        if not output:
+            output = job.meta.get('output')
         if not output:
             slug = html_gen._slugify(blog_post['title'])
             output = f"essay-{slug}.html"
@@ -193,32 +460,47 @@ def generate(input_path, prompt, title, category, output, no_edit):
 
         # Also save markdown version
         md_path = output_path.with_suffix('.md')
-        with open(md_path, 'w', encoding='utf-8') as f:
-            f.write(f"""---
-title: {blog_post['title']}
-category: {blog_post['category']}
-excerpt: {blog_post['excerpt']}
-tags: {', '.join(blog_post['tags'])}
-date: {datetime.now().strftime('%Y-%m-%d')}
----
-
-{blog_post['content']}
-""")
+        html_gen.save_markdown(blog_post, str(md_path), date)
+        job.update(output=str(output_path))
+
+        usage = generator.usage_stats()
+        store.record(
+            blog_post, str(output_path), date,
+            slug=html_gen._slugify(blog_post['title']),
+            reading_speed=html_gen.reading_speed,
+            source=input_path,
+            source_type=processed['source_type'],
+            source_hash=source_hash,
+            model=generator.model,
+            usage=usage if usage['calls'] else None,
+            seconds=generation_seconds,
+            fingerprint=fingerprint
+        )
+
+        cache_stats = generator.cache_stats()
 
         console.print(Panel(
             f"[bold green]✓ Blog post generated successfully![/]\n\n"
             f"[bold]HTML:[/] {output_path.absolute()}\n"
-            f"[bold]Markdown:[/] {md_path.absolute()}\n\n"
+            f"[bold]Markdown:[/] {md_path.absolute()}\n"
+            f"[bold]Stylesheet:[/] {(output_path.parent / html_gen.stylesheet_name).absolute()}\n"
+            f"[bold]API cache:[/] {cache_stats['hits']} hits, {cache_stats['misses']} misses\n"
+            f"[bold]Tokens:[/] {format_usage(generator.usage_stats())}\n\n"
             f"[dim]Next steps:[/]\n"
             f"1. Review the HTML in your browser\n"
-            f"2. Copy to your site directory when ready\n"
-            f"3. Update writing.html index",
+            f"2. Copy it and the stylesheet to your site directory when ready\n"
+            f"3. Run [bold]python generate.py index[/] to list it in writing.html and link its neighbours",
             title="🎉 Success",
             border_style="green"
         ))
 
+    except click.UsageError:
+        raise
     except Exception as e:
         console.print(f"\n[bold red]Error:[/] {str(e)}", style="bold red")
+        if job and job.meta.get('stages'):
+            console.print(f"\n[dim]Completed stages ({', '.join(job.meta['stages'])}) are saved. "
+                          f"Resume with:[/] python generate.py generate --resume {job.id}")
         console.print("\n[dim]Troubleshooting:[/]")
         console.print("• Make sure ANTHROPIC_API_KEY is set in .env")
         console.print("• Check that all dependencies are installed: pip install -r requirements.txt")
@@ -226,6 +508,152 @@ date: {datetime.now().strftime('%Y-%m-%d')}
         sys.exit(1)
 
 
+STATUS_STYLES = {
+    'queued': 'dim',
+    'extracting': 'cyan',
+    'generating': 'magenta',
+    'waiting': 'dim',
+    'in batch': 'magenta',
+    'rendering': 'blue',
+    'done': 'green',
+    'failed': 'red',
+    'duplicate': 'yellow',
+}
+
+
+def build_batch_table(states, batch_status=None):
+    """Build the live per-item progress table for batch runs"""
+    table = Table(title="Batch Progress", expand=True)
+    if batch_status:
+        table.caption = (
+            f"Message batch {batch_status['status']}: "
+            f"{batch_status['succeeded']} succeeded, {batch_status['processing']} processing, "
+            f"{batch_status['errored']} errored"
+        )
+    table.add_column("Input", overflow="fold")
+    table.add_column("Status")
+    table.add_column("Time", justify="right")
+    table.add_column("Output / Error", overflow="fold")
+
+    now = time.monotonic()
+    for state in states:
+        if state['status'] in ('done', 'failed', 'duplicate'):
+            elapsed = state['elapsed']
+        elif state['started'] is not None:
+            elapsed = now - state['started']
+        else:
+            elapsed = None
+
+        style = STATUS_STYLES.get(state['status'], '')
+        detail = state['error'] or state['output'] or ''
+        if state['duplicate_of']:
+            detail = f"{detail}\n[yellow]near-duplicate of {state['duplicate_of']}[/]".lstrip()
+        table.add_row(
+            state['input'],
+            f"[{style}]{state['status']}[/]",
+            f"{elapsed:.1f}s" if elapsed is not None else "-",
+            detail
+        )
+
+    return table
+
+
+@cli.command()
+@click.argument('source')
+@click.option('--prompt', '-p', help='Additional instructions applied to every item')
+@click.option('--category', '-c', help='Blog post category for every item')
+@click.option('--output-dir', '-o', default='.', help='Directory for generated posts')
+@click.option('--no-cache', is_flag=True, help='Ignore cached extraction results and API responses')
+@click.option('--use-batches-api', is_flag=True,
+              help='Submit all generations as one Message Batch (50% cheaper, results within 24h)')
+@click.option('--resume', is_flag=True, help='Skip items completed by an earlier run of this batch')
+@click.option('--skip-duplicates', is_flag=True,
+              help='Leave out items whose source is a near-duplicate of an earlier post or another item')
+@click.option('--dry-run', is_flag=True, help='Use an offline mock client instead of Claude (no API key, nothing billed)')
+@click.option('--profile', is_flag=True, help='Trace each stage and print a timing summary')
+@click.option('--profile-output', type=click.Path(), help='Trace file (default: under the cache dir)')
+@click.option('--profile-format', type=click.Choice(['jsonl', 'otlp']), default='jsonl',
+              help='Trace as JSONL spans or OpenTelemetry OTLP/JSON')
+def batch(source, prompt, category, output_dir, no_cache, use_batches_api, resume, skip_duplicates, dry_run,
+          profile, profile_output, profile_format):
+    """
+    Generate blog posts for many inputs concurrently
+
+    SOURCE is a directory, a glob pattern or a YAML/JSONL manifest.
+
+    Examples:
+        batch papers/
+        batch "transcripts/*.txt" --category Analysis
+        batch manifest.yaml --output-dir posts/
+        batch papers/ --use-batches-api
+        batch manifest.yaml --resume
+        batch urls.yaml --skip-duplicates
+    """
+
+    try:
+        config = load_config()
+        items = load_batch_items(source)
+
+        if profile:
+            start_profile(config, 'batch', profile_output, profile_format)
+
+        if not items:
+            console.print(f"[yellow]No inputs found for {source}[/]")
+            return
+
+        console.print(f"\n[bold cyan]Batch:[/] {len(items)} inputs\n", style="bold")
+
+        runner = BatchRunner(
+            config,
+            output_dir=output_dir,
+            default_prompt=prompt,
+            default_category=category,
+            use_cache=not no_cache,
+            use_batches_api=use_batches_api,
+            resume=resume,
+            skip_duplicates=skip_duplicates,
+            client=MockAnthropic() if dry_run else None
+        )
+
+        with Live(
+            get_renderable=lambda: build_batch_table(runner.states, runner.batch_status),
+            console=console,
+            refresh_per_second=4
+        ):
+            summary = runner.run(items)
+
+        failures = [s for s in summary['items'] if s['status'] == 'failed']
+        failure_lines = ''.join(f"\n  • {s['input']}: {s['error']}" for s in failures)
+        resumed_note = f" ({summary['resumed']} from an earlier run)" if summary['resumed'] else ""
+        duplicate_line = ""
+        if summary['duplicates']:
+            skipped_note = f" ({summary['skipped']} skipped)" if summary['skipped'] else " (generated anyway)"
+            duplicate_line = f"[bold yellow]Near-duplicates:[/] {summary['duplicates']}{skipped_note}\n"
+
+        console.print(Panel(
+            f"[bold green]Succeeded:[/] {summary['succeeded']}{resumed_note}\n"
+            f"[bold red]Failed:[/] {summary['failed']}{failure_lines}\n"
+            f"{duplicate_line}\n"
+            f"[bold]Elapsed:[/] {summary['elapsed']:.1f}s\n"
+            f"[bold]Throughput:[/] {summary['throughput']:.1f} posts/min\n"
+            f"[bold]API cache:[/] {summary['cache']['hits']} hits, {summary['cache']['misses']} misses\n"
+            f"[bold]Tokens:[/] {format_usage(summary['usage'])}\n"
+            f"[bold]Rate limits:[/] {summary['rate_limit']['throttled']} throttled, "
+            f"{summary['rate_limit']['retries']} retries, "
+            f"concurrency settled at {summary['rate_limit']['concurrency']}",
+            title="📦 Batch Summary",
+            border_style="green" if not failures else "yellow"
+        ))
+
+        if failures:
+            console.print(f"[dim]Rerun with --resume to retry only the failed items (job {summary['job']})[/]")
+            sys.exit(1)
+
+    except Exception as e:
+        console.print(f"\n[bold red]Error:[/] {str(e)}", style="bold red")
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument('markdown_file')
 @click.option('--output', '-o', help='Output HTML file')
@@ -235,25 +663,11 @@ def convert(markdown_file, output):
     try:
         config = load_config()
 
-        # Read markdown file
-        with open(markdown_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Parse frontmatter if present
-        if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
-                frontmatter = yaml.safe_load(parts[1])
-                markdown_content = parts[2].strip()
-            else:
-                frontmatter = {}
-                markdown_content = content
-        else:
-            frontmatter = {}
-            markdown_content = content
+        # Read markdown file and frontmatter
+        html_gen = HTMLGenerator(config)
+        frontmatter, markdown_content = html_gen.load_markdown(markdown_file)
 
         # Generate HTML
-        html_gen = HTMLGenerator(config)
         html = html_gen.generate_html(
             title=frontmatter.get('title', 'Untitled'),
             content=markdown_content,
@@ -275,6 +689,218 @@ def convert(markdown_file, output):
         sys.exit(1)
 
 
+@cli.command()
+@click.argument('source_dir', default='.')
+@click.option('--output-dir', '-o', help='Directory for HTML files (default: alongside sources)')
+@click.option('--pattern', default='*.md', help='Glob for post markdown files')
+@click.option('--force', is_flag=True, help='Rebuild every post even if unchanged')
+def build(source_dir, output_dir, pattern, force):
+    """
+    Build HTML for every post markdown file, re-rendering only changed posts
+
+    Examples:
+        build
+        build posts/ --output-dir ../
+        build --force
+    """
+
+    try:
+        config = load_config()
+
+        builder = SiteBuilder(config, source_dir, output_dir, pattern)
+        with console.status("Building site..."):
+            result = builder.build(force=force)
+
+        for source, seconds in result['rebuilt']:
+            console.print(f"[green]✓[/] {source} [dim]({seconds * 1000:.0f}ms)[/]")
+        for source, error in result['failed']:
+            console.print(f"[red]✗[/] {source}: {error}")
+
+        render_seconds = sum(seconds for _, seconds in result['rebuilt'])
+        console.print(Panel(
+            f"[bold green]Rebuilt:[/] {len(result['rebuilt'])}\n"
+            f"[bold]Skipped (up to date):[/] {len(result['skipped'])}\n"
+            f"[bold red]Failed:[/] {len(result['failed'])}\n\n"
+            f"[bold]Render time:[/] {render_seconds:.2f}s across workers\n"
+            f"{search_summary(result['search'])}"
+            f"[bold]Elapsed:[/] {result['elapsed']:.2f}s",
+            title="🏗  Site Build",
+            border_style="green" if not result['failed'] else "yellow"
+        ))
+
+        if result['failed']:
+            sys.exit(1)
+
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/]")
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('source_dir', default='.')
+@click.option('--output-dir', '-o', help='Directory for HTML files (default: alongside sources)')
+@click.option('--listing', help='Listing page to update (default: writing.html in the output dir)')
+@click.option('--pattern', default='*.md', help='Glob for post markdown files')
+@click.option('--force', is_flag=True, help='Re-render every post even if unchanged')
+def index(source_dir, output_dir, listing, pattern, force):
+    """
+    Regenerate the writing.html listing and prev/next links from post frontmatter
+
+    Only posts whose source or neighbours changed are re-rendered, so adding
+    a post touches it, the post before it and the listing.
+
+    Examples:
+        index
+        index posts/ --output-dir ../ --listing ../writing.html
+    """
+
+    try:
+        config = load_config()
+
+        builder = SiteBuilder(config, source_dir, output_dir, pattern)
+        with console.status("Indexing posts..."):
+            result = builder.build(force=force)
+            listing_path = Path(listing) if listing else builder.output_dir / 'writing.html'
+            listing_changed = builder.index.update_listing(str(listing_path))
+
+        for source, seconds in result['rebuilt']:
+            console.print(f"[green]✓[/] {source} [dim]({seconds * 1000:.0f}ms)[/]")
+        for source, error in result['failed']:
+            console.print(f"[red]✗[/] {source}: {error}")
+
+        categories = {entry['category'] for entry in builder.index.posts.values()}
+        console.print(Panel(
+            f"[bold]Posts indexed:[/] {len(builder.index.posts)} in {len(categories)} categories\n"
+            f"[bold]Listing:[/] {listing_path} "
+            f"{'[green](updated)[/]' if listing_changed else '[dim](unchanged)[/]'}\n"
+            f"{search_summary(result['search'])}"
+            f"[bold green]Re-rendered:[/] {len(result['rebuilt'])}\n"
+            f"[bold]Up to date:[/] {len(result['skipped'])}\n"
+            f"[bold red]Failed:[/] {len(result['failed'])}",
+            title="🗂  Site Index",
+            border_style="green" if not result['failed'] else "yellow"
+        ))
+
+        if result['failed']:
+            sys.exit(1)
+
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/]")
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--tag', help='Only posts with this tag')
+@click.option('--category', '-c', help='Only posts in this category')
+@click.option('--since', help='Only posts dated on or after YYYY-MM-DD')
+@click.option('--until', help='Only posts dated on or before YYYY-MM-DD')
+@click.option('--limit', '-n', default=50, help='Maximum posts to list')
+@click.option('--tags', 'list_tags', is_flag=True, help='List tags with post counts instead')
+def posts(tag, category, since, until, limit, list_tags):
+    """
+    Query the record of generated posts
+
+    Examples:
+        posts --tag "neural rendering"
+        posts --category Research --since 2025-01-01
+        posts --tags
+    """
+
+    try:
+        config = load_config()
+        store = PostStore.from_config(config)
+
+        if list_tags:
+            table = Table(title=f"Tags ({store.db_path})")
+            table.add_column("Tag")
+            table.add_column("Posts", justify="right")
+            for name, count in store.tags():
+                table.add_row(name, str(count))
+            console.print(table)
+            return
+
+        found = store.find(tag=tag, category=category, since=since, until=until, limit=limit)
+        table = Table(title=f"{len(found)} of {store.count()} posts ({store.db_path})")
+        table.add_column("Date", no_wrap=True)
+        table.add_column("Title")
+        table.add_column("Category")
+        table.add_column("Tags")
+        table.add_column("Words", justify="right")
+        table.add_column("Tokens in/out", justify="right")
+        table.add_column("Source")
+        for post in found:
+            tokens = "-"
+            if post['output_tokens'] is not None:
+                tokens_in = post['input_tokens'] + post['cache_write_tokens'] + post['cache_read_tokens']
+                tokens = f"{tokens_in:,}/{post['output_tokens']:,}"
+            table.add_row(
+                post['date'] or "",
+                post['title'],
+                post['category'] or "",
+                ", ".join(post['tags']),
+                str(post['word_count']),
+                tokens,
+                Path(post['source']).name if post['source'] and Path(post['source']).exists() else post['source'] or ""
+            )
+        console.print(table)
+
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/]")
+        sys.exit(1)
+
+
+@cli.group()
+def cache():
+    """Manage the on-disk caches and saved jobs"""
+    pass
+
+
+@cache.command('clear')
+def cache_clear():
+    """Remove all cached extraction results, API responses, stored pages and saved jobs"""
+
+    config = load_config()
+    removed = ExtractionCache.from_config(config).clear()
+    console.print(f"[green]✓ Removed {removed} cached extraction(s)[/]")
+    removed = ResponseCache.from_config(config).clear()
+    console.print(f"[green]✓ Removed {removed} cached API response(s)[/]")
+    from url_fetcher import URLFetcher
+    removed = URLFetcher.from_config(config).clear()
+    console.print(f"[green]✓ Removed {removed} stored page(s)[/]")
+    removed = JobStore.from_config(config).clear()
+    console.print(f"[green]✓ Removed {removed} saved job(s)[/]")
+
+
+@cache.command('info')
+def cache_info():
+    """Show cache location and size"""
+
+    config = load_config()
+    extraction_cache = ExtractionCache.from_config(config)
+    size_mb = extraction_cache.size() / 1024 / 1024
+    max_mb = extraction_cache.max_bytes / 1024 / 1024
+    console.print(f"[bold]Extraction cache:[/] {extraction_cache.cache_dir}")
+    console.print(f"  {size_mb:.1f} MB used of {max_mb:.0f} MB")
+
+    response_cache = ResponseCache.from_config(config)
+    console.print(f"[bold]Response cache:[/] {response_cache.db_path}")
+    console.print(f"  {response_cache.count()} of {response_cache.max_entries} entries")
+
+    from url_fetcher import URLFetcher
+    fetcher = URLFetcher.from_config(config)
+    console.print(f"[bold]Page store (conditional GETs):[/] {fetcher.store_dir}")
+    console.print(f"  {fetcher.size() / 1024 / 1024:.1f} MB used of {fetcher.store_max_bytes / 1024 / 1024:.0f} MB")
+
+    jobs = JobStore.from_config(config)
+    saved = jobs.list()
+    console.print(f"[bold]Saved jobs:[/] {jobs.jobs_dir}")
+    for job in saved[:10]:
+        console.print(f"  {job.id}  {job.meta.get('kind', '?'):5}  "
+                      f"{', '.join(job.meta.get('stages', [])) or '-':30}  {job.meta.get('input', '')}")
+    if len(saved) > 10:
+        console.print(f"  ... and {len(saved) - 10} more")
+
+
 @cli.command()
 def check():
     """Check if everything is set up correctly"""
@@ -4,34 +4,73 @@ Uses Claude API to generate blog posts from extracted content
 """
 
 import os
-from typing import Dict, Optional
-from anthropic import Anthropic
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rate_limiter import RateLimiter
+from response_cache import ResponseCache
+from text_chunker import chunk_text, estimate_tokens
+import tracing
+
+
+# Prompt-caching breakpoint: everything up to and including a block marked
+# with this is cached server-side for a few minutes and billed at a fraction
+# of the input price when the same prefix is sent again
+CACHE_BREAKPOINT = {'type': 'ephemeral'}
 
 
 class AIGenerator:
     """Generate blog posts using Claude AI"""
 
-    def __init__(self, config: Dict, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        config: Dict,
+        api_key: Optional[str] = None,
+        use_cache: bool = True,
+        client=None
+    ):
         self.config = config
         self.api_key = api_key or os.getenv('ANTHROPIC_API_KEY')
 
-        if not self.api_key:
-            raise ValueError("ANTHROPIC_API_KEY not found in environment or config")
+        if client is not None:
+            self.client = client
+        else:
+            if not self.api_key:
+                raise ValueError("ANTHROPIC_API_KEY not found in environment or config")
+
+            # Imported here: the SDK is heavy and only generation commands need it
+            from anthropic import Anthropic
+            # Retries are handled by the shared rate limiter instead
+            self.client = Anthropic(api_key=self.api_key, max_retries=0)
 
-        self.client = Anthropic(api_key=self.api_key)
         self.model = config.get('generation', {}).get('model', 'claude-sonnet-4')
+        self.cache = ResponseCache.from_config(config) if use_cache else None
+        self.limiter = RateLimiter.from_config(config)
+
+        # Per-call token usage, including prompt-cache reads and writes
+        self.usage_log: List[Dict] = []
+
+        # The refine loop is one growing conversation about the current post
+        self._refine_messages: List[Dict] = []
+        self._refine_content: Optional[str] = None
 
+    @tracing.traced('ai.generate_blog_post')
     def generate_blog_post(
         self,
         content: str,
         source_type: str,
         metadata: Dict,
         user_prompt: Optional[str] = None,
-        suggested_title: Optional[str] = None
+        suggested_title: Optional[str] = None,
+        on_response: Optional[Callable[[str], None]] = None
     ) -> Dict[str, str]:
         """
         Generate a blog post from processed content
 
+        on_response, if given, is called with the raw response text before
+        it is parsed (e.g. to checkpoint it).
+
         Returns:
             {
                 'title': str,
@@ -42,32 +81,430 @@ class AIGenerator:
             }
         """
 
-        # Build the prompt
-        system_prompt = self._build_system_prompt()
-        user_message = self._build_user_prompt(
+        params = self._blog_post_params(
             content, source_type, metadata, user_prompt, suggested_title
         )
 
         # Call Claude API
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.config.get('generation', {}).get('max_tokens', 4000),
-                temperature=self.config.get('generation', {}).get('temperature', 0.7),
-                system=system_prompt,
-                messages=[{
-                    "role": "user",
-                    "content": user_message
-                }]
-            )
+            response_text = self._create_message('blog post', **params)
+            if on_response:
+                on_response(response_text)
 
             # Parse response
-            result = self._parse_response(response.content[0].text)
+            result = self._parse_response(response_text)
             return result
 
         except Exception as e:
             raise Exception(f"Error generating blog post: {str(e)}")
 
+    @tracing.traced('ai.generate_bulk')
+    def generate_blog_posts_bulk(
+        self,
+        items: List[Dict],
+        poll_interval: Optional[float] = None,
+        on_status: Optional[Callable[[str, Dict], None]] = None
+    ) -> List[Dict]:
+        """
+        Generate many blog posts through the Message Batches API
+
+        Each item holds the generate_blog_post arguments (content, source_type,
+        metadata, user_prompt, suggested_title). Items already in the response
+        cache are answered locally; the rest are submitted as one batch, which
+        is polled until it ends. on_status is called with the processing status
+        and request counts after each poll.
+
+        Returns one {'post': dict or None, 'error': str or None} per item, in order.
+
+        Sources long enough to need condensing are summarized through a
+        batch of their own first, so the map step is billed at batch rates
+        too rather than as synchronous calls.
+        """
+        if poll_interval is None:
+            poll_interval = self.config.get('batch', {}).get('poll_interval', 30)
+
+        results: List[Dict] = [{'post': None, 'error': None} for _ in items]
+        contents = [item['content'] for item in items]
+
+        try:
+            # Map step: every section of every long source, in one batch
+            sections = {}
+            chunk_counts = {}
+            for index, item in enumerate(items):
+                if not self._needs_condensing(item['content']):
+                    continue
+                chunks = chunk_text(item['content'], self.config.get('generation', {}).get('chunk_tokens', 8000))
+                chunk_counts[index] = len(chunks)
+                for number, chunk in enumerate(chunks, start=1):
+                    sections[f'section-{index}-{number}'] = self._summary_params(
+                        number, len(chunks), chunk, item['source_type']
+                    )
+
+            if sections:
+                responses = self._batch_responses(sections, poll_interval, on_status)
+                for index, total in chunk_counts.items():
+                    notes = [responses[f'section-{index}-{number}'] for number in range(1, total + 1)]
+                    errors = [error for _, error in notes if error]
+                    if errors:
+                        results[index]['error'] = f"Error summarizing source: {errors[0]}"
+                    else:
+                        contents[index] = self._merge_notes([text.strip() for text, _ in notes], items[index]['source_type'])
+
+            posts = {}
+            for index, item in enumerate(items):
+                if results[index]['error']:
+                    continue
+                try:
+                    posts[f'post-{index}'] = self._blog_post_params(
+                        contents[index],
+                        item['source_type'],
+                        item.get('metadata', {}),
+                        item.get('user_prompt'),
+                        item.get('suggested_title'),
+                        condense=False
+                    )
+                except Exception as e:
+                    results[index]['error'] = f"Error preparing blog post: {str(e)}"
+
+            responses = self._batch_responses(posts, poll_interval, on_status) if posts else {}
+
+        except Exception as e:
+            raise Exception(f"Error generating blog posts in bulk: {str(e)}")
+
+        for custom_id, (text, error) in responses.items():
+            index = int(custom_id.split('-')[1])
+            if error:
+                results[index]['error'] = error
+            else:
+                results[index]['post'] = self._parse_response(text)
+
+        return results
+
+    def _batch_responses(
+        self,
+        requests: Dict[str, Dict],
+        poll_interval: float,
+        on_status: Optional[Callable[[str, Dict], None]] = None
+    ) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """
+        Run {custom_id: params} requests through one Message Batch
+
+        Requests already in the response cache are answered locally and left
+        out of the batch. Returns {custom_id: (text, error)}, one of the two
+        set, for every request.
+        """
+        responses: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        pending = {}
+        for custom_id, params in requests.items():
+            cache_key = self.cache.key(params) if self.cache else None
+            cached = self.cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                responses[custom_id] = (cached, None)
+            else:
+                pending[custom_id] = (params, cache_key)
+
+        if not pending:
+            return responses
+
+        batch = self.limiter.call(lambda: self.client.messages.batches.create(requests=[
+            {'custom_id': custom_id, 'params': params}
+            for custom_id, (params, _) in pending.items()
+        ]))
+
+        while batch.processing_status != 'ended':
+            time.sleep(poll_interval)
+            batch = self.limiter.call(
+                lambda: self.client.messages.batches.retrieve(batch.id)
+            )
+            if on_status:
+                counts = batch.request_counts
+                on_status(batch.processing_status, {
+                    name: getattr(counts, name)
+                    for name in ('processing', 'succeeded', 'errored', 'canceled', 'expired')
+                })
+
+        for entry in self.client.messages.batches.results(batch.id):
+            _, cache_key = pending.pop(entry.custom_id)
+            if entry.result.type == 'succeeded':
+                text = entry.result.message.content[0].text
+                self._record_usage(entry.custom_id, entry.result.message.usage, None)
+                if cache_key:
+                    self.cache.put(cache_key, text)
+                responses[entry.custom_id] = (text, None)
+            else:
+                responses[entry.custom_id] = (None, f"Batch request {entry.result.type}")
+
+        # Anything the batch didn't report back on
+        for custom_id in pending:
+            responses[custom_id] = (None, "No result returned for batch request")
+
+        return responses
+
+    @tracing.traced('ai.stream_blog_post')
+    def stream_blog_post(
+        self,
+        content: str,
+        source_type: str,
+        metadata: Dict,
+        user_prompt: Optional[str] = None,
+        suggested_title: Optional[str] = None,
+        on_header: Optional[Callable[[Dict], None]] = None,
+        on_body: Optional[Callable[[str], None]] = None,
+        on_response: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, str]:
+        """
+        Generate a blog post, streaming the response as it is written
+
+        on_header is called once with the parsed TITLE/CATEGORY/EXCERPT/TAGS
+        fields as soon as the header separator arrives; on_body is called
+        with each chunk of markdown body text after that. on_response gets the
+        complete raw text, as in generate_blog_post.
+
+        Returns the same structure as generate_blog_post.
+        """
+        params = self._blog_post_params(
+            content, source_type, metadata, user_prompt, suggested_title
+        )
+        parser = StreamingResponseParser(on_header, on_body)
+
+        try:
+            response_text = self._stream_message(parser.feed, 'blog post', **params)
+            parser.close()
+            if on_response:
+                on_response(response_text)
+
+            return self._parse_response(response_text)
+
+        except Exception as e:
+            raise Exception(f"Error generating blog post: {str(e)}")
+
+    def _blog_post_params(
+        self,
+        content: str,
+        source_type: str,
+        metadata: Dict,
+        user_prompt: Optional[str],
+        suggested_title: Optional[str],
+        condense: bool = True
+    ) -> Dict:
+        """Build the messages request for a blog post, condensing a long source first unless condense=False"""
+        if condense and self._needs_condensing(content):
+            content = self._condense_content(content, source_type)
+
+        user_content = self._build_user_prompt(
+            content, source_type, metadata, user_prompt, suggested_title
+        )
+
+        return {
+            'model': self.model,
+            'max_tokens': self.config.get('generation', {}).get('max_tokens', 4000),
+            'temperature': self.config.get('generation', {}).get('temperature', 0.7),
+            'system': self._system_blocks(),
+            'messages': [{
+                "role": "user",
+                "content": user_content
+            }]
+        }
+
+    def _needs_condensing(self, content: str) -> bool:
+        """True if a source is too long to send whole and gets map-reduced"""
+        return estimate_tokens(content) > self.config.get('generation', {}).get('map_reduce_threshold', 30000)
+
+    @tracing.traced('ai.condense')
+    def _condense_content(self, content: str, source_type: str) -> str:
+        """
+        Map-reduce a long source into ordered section notes
+
+        The source is split into token-budgeted chunks on paragraph/speaker
+        boundaries and each chunk is summarized concurrently; the merged notes
+        then stand in for the full content in the blog post prompt.
+        """
+        generation = self.config.get('generation', {})
+        chunks = chunk_text(content, generation.get('chunk_tokens', 8000))
+
+        # Pool threads don't inherit the caller's span, so hand it over
+        parent = tracing.current_span()
+
+        def summarize(args):
+            with tracing.span('ai.summarize_chunk', parent=parent, section=args[0]):
+                return self._summarize_chunk(*args, source_type)
+
+        with ThreadPoolExecutor(max_workers=generation.get('map_concurrency', 4)) as pool:
+            notes = list(pool.map(
+                summarize,
+                [(i + 1, len(chunks), chunk) for i, chunk in enumerate(chunks)]
+            ))
+
+        return self._merge_notes(notes, source_type)
+
+    def _merge_notes(self, notes: List[str], source_type: str) -> str:
+        """Section notes joined in order into the content the blog post prompt gets (reduce step)"""
+        parts = [
+            f"(The original {source_type} was too long to include in full. "
+            f"Below are detailed notes on each of its {len(notes)} sections, in order.)\n"
+        ]
+        for i, note in enumerate(notes):
+            parts.append(f"\n### Section {i + 1} of {len(notes)}\n\n{note}\n")
+
+        return ''.join(parts)
+
+    def _summarize_chunk(self, index: int, total: int, chunk: str, source_type: str) -> str:
+        """Summarize one chunk of a long source (map step)"""
+        try:
+            return self._create_message(
+                f'section {index}/{total}',
+                **self._summary_params(index, total, chunk, source_type)
+            ).strip()
+
+        except Exception as e:
+            raise Exception(f"Error summarizing section {index} of {total}: {str(e)}")
+
+    def _summary_params(self, index: int, total: int, chunk: str, source_type: str) -> Dict:
+        """The messages request summarizing one chunk of a long source"""
+        generation = self.config.get('generation', {})
+        return {
+            'model': self.model,
+            'max_tokens': generation.get('map_max_tokens', 1500),
+            'temperature': 0.3,
+            'messages': [{
+                "role": "user",
+                "content": f"""The following is section {index} of {total} of a long {source_type}.
+
+Write detailed notes on this section for someone who will later write a blog post from the full source. Keep:
+- Key claims, findings and arguments
+- Concrete numbers, names, examples and technical details
+- Notable quotes, verbatim, with the speaker if known
+
+Return only the notes as a markdown bullet list.
+
+---
+{chunk}
+---
+"""
+            }]
+        }
+
+    def _create_message(self, label: str, **params) -> str:
+        """Send a messages request, serving identical requests from the response cache"""
+        with tracing.span('api.message', call=label, model=params.get('model')) as span:
+            cache_key = self.cache.key(params) if self.cache else None
+
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    span.set(response_cache='hit')
+                    return cached
+
+            start = time.perf_counter()
+            response = self.limiter.call(
+                lambda: self.client.messages.create(**params),
+                _estimate_request_tokens(params),
+                lambda response: _billed_input_tokens(response.usage)
+            )
+            text = response.content[0].text
+            span.set(**_usage_attributes(
+                self._record_usage(label, response.usage, time.perf_counter() - start)
+            ))
+
+            if cache_key:
+                self.cache.put(cache_key, text)
+
+            return text
+
+    def _stream_message(self, on_text: Callable[[str], None], label: str, **params) -> str:
+        """Stream a messages request, passing text deltas to on_text as they arrive"""
+        with tracing.span('api.message', call=label, model=params.get('model'), streaming=True) as span:
+            cache_key = self.cache.key(params) if self.cache else None
+
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    span.set(response_cache='hit')
+                    on_text(cached)
+                    return cached
+
+            def run():
+                parts = []
+                try:
+                    with self.client.messages.stream(**params) as stream:
+                        for text in stream.text_stream:
+                            parts.append(text)
+                            on_text(text)
+                        return ''.join(parts), stream.get_final_message().usage
+                except Exception as e:
+                    # Text already shown can't be taken back, so only a stream
+                    # that failed before its first delta is retried
+                    if parts:
+                        raise Exception(f"Stream interrupted: {str(e)}")
+                    raise
+
+            start = time.perf_counter()
+            text, usage = self.limiter.call(
+                run,
+                _estimate_request_tokens(params),
+                lambda result: _billed_input_tokens(result[1])
+            )
+            span.set(**_usage_attributes(
+                self._record_usage(label, usage, time.perf_counter() - start)
+            ))
+
+            if cache_key:
+                self.cache.put(cache_key, text)
+
+            return text
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Response cache hit/miss counters for this generator"""
+        if not self.cache:
+            return {'hits': 0, 'misses': 0}
+        return {'hits': self.cache.hits, 'misses': self.cache.misses}
+
+    def usage_stats(self) -> Dict[str, int]:
+        """
+        Token usage summed over every API call this generator made
+
+        Returns:
+            {
+                'calls': int,
+                'input_tokens': int,  # Uncached input tokens
+                'cache_write_tokens': int,  # Input tokens written to the prompt cache
+                'cache_read_tokens': int,  # Input tokens served from the prompt cache
+                'output_tokens': int,
+            }
+        """
+        totals = {
+            'calls': len(self.usage_log),
+            'input_tokens': 0,
+            'cache_write_tokens': 0,
+            'cache_read_tokens': 0,
+            'output_tokens': 0,
+        }
+        for entry in self.usage_log:
+            for field in ('input_tokens', 'cache_write_tokens', 'cache_read_tokens', 'output_tokens'):
+                totals[field] += entry[field]
+        return totals
+
+    def _record_usage(self, label: str, usage, seconds: Optional[float]) -> Dict:
+        """Append one call's token usage to usage_log"""
+        entry = {
+            'call': label,
+            'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+            'cache_write_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+            'cache_read_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+            'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+            'seconds': seconds,
+        }
+        self.usage_log.append(entry)
+        return entry
+
+    def _system_blocks(self) -> List[Dict]:
+        """The style-guide system prompt as a cacheable content block"""
+        return [{
+            'type': 'text',
+            'text': self._build_system_prompt(),
+            'cache_control': CACHE_BREAKPOINT
+        }]
+
     def _build_system_prompt(self) -> str:
         """Build system prompt with style guide and examples"""
         return """You are a skilled technical writer creating blog posts for Michael Pistorio's website about VFX, AI, and computer graphics.
@@ -123,8 +560,14 @@ TAGS: [comma-separated tags]
         metadata: Dict,
         user_prompt: Optional[str],
         suggested_title: Optional[str]
-    ) -> str:
-        """Build user prompt with context"""
+    ) -> List[Dict]:
+        """
+        Build user prompt content blocks
+
+        The source block comes first and ends in a cache breakpoint, so
+        regenerating from the same source with a different title or
+        instructions reuses the cached prefix.
+        """
 
         prompt_parts = [
             "Create a blog post from the following source material:\n",
@@ -139,6 +582,15 @@ TAGS: [comma-separated tags]
                     prompt_parts.append(f"- {key}: {value}\n")
             prompt_parts.append("\n")
 
+        # Add the source content
+        prompt_parts.append("**Source Content:**\n\n")
+        prompt_parts.append("---\n")
+        prompt_parts.append(content)
+        prompt_parts.append("\n---\n\n")
+
+        source_block = ''.join(prompt_parts)
+        prompt_parts = []
+
         # Add suggested title if available
         if suggested_title:
             prompt_parts.append(f"**Suggested Title:** {suggested_title}\n\n")
@@ -147,12 +599,6 @@ TAGS: [comma-separated tags]
         if user_prompt:
             prompt_parts.append(f"**Additional Instructions:** {user_prompt}\n\n")
 
-        # Add the source content
-        prompt_parts.append("**Source Content:**\n\n")
-        prompt_parts.append("---\n")
-        prompt_parts.append(content)
-        prompt_parts.append("\n---\n\n")
-
         # Add instructions
         prompt_parts.append("""
 Please create a compelling blog post based on this material.
@@ -169,8 +615,12 @@ Requirements:
 Remember to follow the style guide and format the output correctly.
 """)
 
-        return ''.join(prompt_parts)
+        return [
+            {'type': 'text', 'text': source_block, 'cache_control': CACHE_BREAKPOINT},
+            {'type': 'text', 'text': ''.join(prompt_parts)},
+        ]
 
+    @tracing.traced('ai.parse_response')
     def _parse_response(self, response_text: str) -> Dict[str, any]:
         """Parse Claude's response into structured data"""
         lines = response_text.split('\n')
@@ -186,18 +636,10 @@ Remember to follow the style guide and format the output correctly.
         # Parse header section
         content_start = 0
         for i, line in enumerate(lines):
-            if line.startswith('TITLE:'):
-                result['title'] = line.replace('TITLE:', '').strip()
-            elif line.startswith('CATEGORY:'):
-                result['category'] = line.replace('CATEGORY:', '').strip()
-            elif line.startswith('EXCERPT:'):
-                result['excerpt'] = line.replace('EXCERPT:', '').strip()
-            elif line.startswith('TAGS:'):
-                tags_str = line.replace('TAGS:', '').strip()
-                result['tags'] = [t.strip() for t in tags_str.split(',')]
-            elif line.strip() == '---':
+            if line.strip() == '---':
                 content_start = i + 1
                 break
+            _parse_header_line(line, result)
 
         # Extract content (everything after ---)
         if content_start > 0:
@@ -208,16 +650,26 @@ Remember to follow the style guide and format the output correctly.
 
         return result
 
+    @tracing.traced('ai.refine')
     def refine_post(self, current_content: str, feedback: str) -> str:
-        """Refine an existing blog post based on feedback"""
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4000,
-                temperature=0.7,
-                messages=[{
-                    "role": "user",
-                    "content": f"""Please refine the following blog post based on this feedback:
+        """
+        Refine an existing blog post based on feedback
+
+        Successive refinements of the same post continue one conversation:
+        the post is sent once, each round adds only the feedback and the
+        reply, and a cache breakpoint on the latest turn lets the next round
+        read the whole history from the prompt cache. Refining content that
+        was edited elsewhere starts a fresh conversation.
+        """
+        if self._refine_messages and current_content == self._refine_content:
+            turn = f"""Please refine the post again based on this feedback:
+
+**Feedback:** {feedback}
+
+Return only the refined blog post content (markdown)."""
+            messages = self._refine_messages
+        else:
+            turn = f"""Please refine the following blog post based on this feedback:
 
 **Feedback:** {feedback}
 
@@ -229,10 +681,119 @@ Remember to follow the style guide and format the output correctly.
 - Keep the same writing style and tone
 - Return only the refined blog post content (markdown)
 """
-                }]
+            messages = []
+
+        # Only the newest turn carries a breakpoint; earlier prefixes are
+        # still matched by the cache lookup
+        request_messages = messages + [{
+            "role": "user",
+            "content": [{'type': 'text', 'text': turn, 'cache_control': CACHE_BREAKPOINT}]
+        }]
+
+        try:
+            response_text = self._create_message(
+                f'refine {len(messages) // 2 + 1}',
+                model=self.model,
+                max_tokens=4000,
+                temperature=0.7,
+                system=self._system_blocks(),
+                messages=request_messages
             )
 
-            return response.content[0].text.strip()
+            refined = response_text.strip()
 
         except Exception as e:
             raise Exception(f"Error refining blog post: {str(e)}")
+
+        self._refine_messages = messages + [
+            {"role": "user", "content": turn},
+            {"role": "assistant", "content": refined},
+        ]
+        self._refine_content = refined
+
+        return refined
+
+
+def _estimate_request_tokens(params: Dict) -> int:
+    """Rough input token count of a messages request, for the rate limiter"""
+    parts = [params.get('system', '')] + [m['content'] for m in params['messages']]
+    text = ''.join(
+        ''.join(block.get('text', '') for block in part) if isinstance(part, list) else part
+        for part in parts
+    )
+    return estimate_tokens(text)
+
+
+def _usage_attributes(entry: Dict) -> Dict:
+    """Token counts from a usage_log entry, as span attributes"""
+    return {
+        key: entry[key]
+        for key in ('input_tokens', 'cache_write_tokens', 'cache_read_tokens', 'output_tokens')
+    }
+
+
+def _billed_input_tokens(usage) -> int:
+    """Input tokens that count against the per-minute limit (cache reads don't)"""
+    return (getattr(usage, 'input_tokens', 0) or 0) + (getattr(usage, 'cache_creation_input_tokens', 0) or 0)
+
+
+def _parse_header_line(line: str, result: Dict):
+    """Apply a single TITLE/CATEGORY/EXCERPT/TAGS header line to result"""
+    if line.startswith('TITLE:'):
+        result['title'] = line.replace('TITLE:', '').strip()
+    elif line.startswith('CATEGORY:'):
+        result['category'] = line.replace('CATEGORY:', '').strip()
+    elif line.startswith('EXCERPT:'):
+        result['excerpt'] = line.replace('EXCERPT:', '').strip()
+    elif line.startswith('TAGS:'):
+        tags_str = line.replace('TAGS:', '').strip()
+        result['tags'] = [t.strip() for t in tags_str.split(',')]
+
+
+class StreamingResponseParser:
+    """Incrementally split a streamed response into header fields and body text"""
+
+    def __init__(
+        self,
+        on_header: Optional[Callable[[Dict], None]] = None,
+        on_body: Optional[Callable[[str], None]] = None
+    ):
+        self.on_header = on_header or (lambda header: None)
+        self.on_body = on_body or (lambda text: None)
+        self.header = {
+            'title': '',
+            'category': 'Research',
+            'excerpt': '',
+            'tags': [],
+        }
+        self.in_body = False
+        self._buffer = ''
+        self._raw = []
+
+    def feed(self, text: str):
+        """Consume the next chunk of streamed text"""
+        if self.in_body:
+            self.on_body(text)
+            return
+
+        self._raw.append(text)
+        self._buffer += text
+
+        # Header fields are line-based, so only act on complete lines
+        while '\n' in self._buffer:
+            line, self._buffer = self._buffer.split('\n', 1)
+            if line.strip() == '---':
+                self.in_body = True
+                self.on_header(self.header)
+                body = self._buffer.lstrip('\n')
+                self._buffer = ''
+                if body:
+                    self.on_body(body)
+                return
+            _parse_header_line(line, self.header)
+
+    def close(self):
+        """Flush at end of stream; without a separator the whole text is body"""
+        if not self.in_body:
+            self.in_body = True
+            self.on_body(''.join(self._raw))
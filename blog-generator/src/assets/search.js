@@ -0,0 +1,178 @@
+/*
+ * Client-side search over the site index written by `generate.py build`.
+ *
+ * Nothing is downloaded until a search box is focused. The manifest is
+ * fetched first, then only the shards holding the query's terms, each at
+ * most once per page.
+ *
+ *   <input type="search" data-blog-search="search/manifest.json" data-results="search-results">
+ *   <ol id="search-results"></ol>
+ *   <script src="search/search.js" defer></script>
+ */
+(function () {
+  'use strict';
+
+  var MAX_RESULTS = 10;
+  var indexes = {};
+
+  // Must agree with tokenize() in search_index.py
+  function tokenize(text, stopwords) {
+    return (text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || []).filter(function (word) {
+      return Array.from(word).length > 1 && !stopwords.has(word);
+    });
+  }
+
+  function fetchJSON(url) {
+    return fetch(url).then(function (response) {
+      if (!response.ok) throw new Error(url + ': ' + response.status);
+      return response.arrayBuffer();
+    }).then(function (buffer) {
+      var bytes = new Uint8Array(buffer);
+      // Servers that send .gz files with Content-Encoding: gzip hand back plain JSON
+      if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+        var stream = new Blob([buffer]).stream().pipeThrough(new DecompressionStream('gzip'));
+        return new Response(stream).text();
+      }
+      return new TextDecoder().decode(bytes);
+    }).then(JSON.parse);
+  }
+
+  function openIndex(manifestUrl) {
+    if (!indexes[manifestUrl]) {
+      var base = new URL(manifestUrl, document.baseURI);
+      var shards = {};
+      var docs = null;
+      indexes[manifestUrl] = fetchJSON(base).then(function (manifest) {
+        var stopwords = new Set(manifest.stopwords);
+        return {
+          tokenize: function (text) { return tokenize(text, stopwords); },
+          count: manifest.count,
+          docs: function () {
+            docs = docs || fetchJSON(new URL(manifest.docs, base)).then(function (list) {
+              return list.map(function (doc) {
+                // Page links are relative to the output dir, manifest.root from the index
+                return { url: new URL(manifest.root + doc[0], base).href, title: doc[1], excerpt: doc[2], date: doc[3] };
+              });
+            });
+            return docs;
+          },
+          shard: function (term) {
+            var chars = Array.from(term);
+            var name = manifest.shards[chars.slice(0, 2).join('')] || manifest.shards[chars[0]];
+            if (!name) return Promise.resolve({});
+            shards[name] = shards[name] || fetchJSON(new URL(name, base));
+            return shards[name];
+          }
+        };
+      });
+      indexes[manifestUrl].catch(function () { delete indexes[manifestUrl]; });
+    }
+    return indexes[manifestUrl];
+  }
+
+  // {doc id: weight} for a term, or for every term starting with it
+  function lookup(shard, term, prefix) {
+    var weights = {};
+    Object.keys(shard).forEach(function (key) {
+      if (key !== term && !(prefix && key.lastIndexOf(term, 0) === 0)) return;
+      var posting = shard[key];
+      var doc = 0;
+      for (var i = 0; i < posting.length; i += 2) {
+        doc += posting[i];
+        weights[doc] = Math.max(weights[doc] || 0, posting[i + 1]);
+      }
+    });
+    return weights;
+  }
+
+  function search(manifestUrl, query) {
+    return openIndex(manifestUrl).then(function (index) {
+      var terms = index.tokenize(query);
+      if (!terms.length) return [];
+      // The last word is still being typed unless followed by a space
+      var prefix = !/\s$/.test(query);
+
+      return Promise.all(terms.map(index.shard)).then(function (shards) {
+        var scores = null;
+        terms.forEach(function (term, i) {
+          var weights = lookup(shards[i], term, prefix && i === terms.length - 1);
+          var docs = Object.keys(weights);
+          // Rarer terms count for more; a doc must match every term
+          var idf = Math.log(1 + index.count / Math.max(docs.length, 1));
+          var next = {};
+          docs.forEach(function (doc) {
+            var score = (1 + Math.log(weights[doc])) * idf;
+            if (scores === null || doc in scores) next[doc] = (scores ? scores[doc] : 0) + score;
+          });
+          scores = next;
+        });
+
+        var ranked = Object.keys(scores).map(Number).sort(function (a, b) {
+          return scores[b] - scores[a] || a - b;
+        }).slice(0, MAX_RESULTS);
+        return ranked.length ? index.docs().then(function (docs) {
+          return ranked.map(function (doc) { return docs[doc]; });
+        }) : [];
+      });
+    });
+  }
+
+  function render(list, results) {
+    list.textContent = '';
+    results.forEach(function (doc) {
+      var item = document.createElement('li');
+      var link = document.createElement('a');
+      link.href = doc.url;
+      link.textContent = doc.title;
+      item.appendChild(link);
+      if (doc.date) {
+        var date = document.createElement('span');
+        date.className = 'search-date';
+        date.textContent = doc.date;
+        item.appendChild(date);
+      }
+      if (doc.excerpt) {
+        var excerpt = document.createElement('p');
+        excerpt.textContent = doc.excerpt;
+        item.appendChild(excerpt);
+      }
+      list.appendChild(item);
+    });
+  }
+
+  function attach(input) {
+    var manifestUrl = input.getAttribute('data-blog-search') || 'search/manifest.json';
+    var list = document.getElementById(input.getAttribute('data-results') || '');
+    if (!list) {
+      list = document.createElement('ol');
+      list.className = 'search-results';
+      input.insertAdjacentElement('afterend', list);
+    }
+
+    var latest = 0;
+    var timer = null;
+    input.addEventListener('focus', function () { openIndex(manifestUrl); }, { once: true });
+    input.addEventListener('input', function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        var request = ++latest;
+        search(manifestUrl, input.value).then(function (results) {
+          if (request === latest) render(list, results);
+        }, function () {
+          if (request === latest) render(list, []);
+        });
+      }, 80);
+    });
+  }
+
+  function attachAll() {
+    Array.prototype.forEach.call(document.querySelectorAll('input[data-blog-search]'), attach);
+  }
+
+  window.BlogSearch = { search: search };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', attachAll);
+  } else {
+    attachAll();
+  }
+})();
@@ -0,0 +1,468 @@
+"""
+Batch Runner for Blog Post Generator
+Runs many inputs through extract → generate → render concurrently
+"""
+
+import glob
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+import yaml
+
+from input_processor import InputProcessor
+from ai_generator import AIGenerator
+from fingerprint import SimhashIndex, simhash
+from html_generator import HTMLGenerator
+from job_store import JobStore, content_hash
+from post_store import PostStore
+
+
+SUPPORTED_SUFFIXES = {
+    '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.tif', '.webp',
+    '.txt', '.md', '.markdown'
+}
+
+
+def load_batch_items(source: str) -> List[Dict]:
+    """
+    Expand a batch source into a list of items
+
+    Accepts a directory, a glob pattern, or a YAML/JSONL manifest. Manifest
+    entries are either plain input strings or dicts with an 'input' key and
+    optional 'prompt', 'title', 'category' and 'output' overrides.
+    """
+    path = Path(source)
+
+    if path.is_file() and path.suffix.lower() in ['.yaml', '.yml']:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or []
+        if isinstance(data, dict):
+            data = data.get('items', [])
+        entries = data
+    elif path.is_file() and path.suffix.lower() == '.jsonl':
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    elif path.is_dir():
+        entries = sorted(
+            str(p) for p in path.iterdir()
+            if p.is_file() and p.suffix.lower() in SUPPORTED_SUFFIXES
+        )
+    else:
+        entries = sorted(glob.glob(source))
+
+    items = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {'input': entry}
+        if not entry.get('input'):
+            raise ValueError(f"Manifest entry missing 'input': {entry}")
+        items.append(entry)
+
+    return items
+
+
+def _extract(config: Dict, input_path: str, use_cache: bool) -> Dict:
+    """Process pool worker - extract a single input"""
+    processor = InputProcessor(config, use_cache=use_cache)
+    return processor.process(input_path)
+
+
+class BatchRunner:
+    """Run a list of batch items through the full pipeline"""
+
+    def __init__(
+        self,
+        config: Dict,
+        output_dir: str = '.',
+        default_prompt: Optional[str] = None,
+        default_category: Optional[str] = None,
+        use_cache: bool = True,
+        use_batches_api: bool = False,
+        resume: bool = False,
+        skip_duplicates: bool = False,
+        client=None
+    ):
+        self.config = config
+        self.output_dir = Path(output_dir)
+        self.default_prompt = default_prompt
+        self.default_category = default_category
+        self.use_cache = use_cache
+        self.use_batches_api = use_batches_api
+        self.resume = resume
+        self.skip_duplicates = skip_duplicates
+        # An API client to use instead of Claude, e.g. MockAnthropic for a dry run
+        self.client = client
+        self.job = None
+        self.store: Optional[PostStore] = None
+        self.batch_status: Optional[Dict] = None
+        self.states: List[Dict] = []
+
+        # Sources seen in this run, so near-duplicates within one batch are caught too
+        self.max_distance = config.get('dedup', {}).get('max_distance', 6)
+        self.seen = SimhashIndex(self.max_distance)
+        self._seen_lock = threading.Lock()
+
+        # Output paths handed out in this run, so two titles with the same slug don't collide
+        self.claimed: Set[str] = set()
+        self._claim_lock = threading.Lock()
+
+        batch_config = config.get('batch', {})
+        self.extract_workers = batch_config.get('extract_workers', 4)
+        # The shared rate limiter adapts in-flight calls between api_concurrency
+        # and rate_limit.max_concurrency; size the pool for the upper bound
+        self.api_concurrency = max(
+            batch_config.get('api_concurrency', 3),
+            config.get('rate_limit', {}).get('max_concurrency', 8)
+        )
+
+    def run(self, items: List[Dict]) -> Dict:
+        """
+        Process all items and return a summary
+
+        Completed items are recorded in a job keyed by the item list and
+        defaults; with resume=True, items already completed by an earlier
+        (crashed or interrupted) run of the same batch are skipped.
+
+        After extraction, items whose source is a near-duplicate of an
+        earlier post's (or of another item's) are flagged, and with
+        skip_duplicates=True left out before any API call.
+
+        Returns:
+            {
+                'items': list,  # Per-item state dicts
+                'succeeded': int,
+                'failed': int,
+                'duplicates': int,  # Items flagged as near-duplicates
+                'skipped': int,  # Duplicates left out (skip_duplicates)
+                'elapsed': float,  # Wall-clock seconds
+                'throughput': float,  # Items per minute
+                'cache': dict,  # Response cache hits/misses
+                'usage': dict,  # Token totals incl. prompt-cache reads/writes
+                'rate_limit': dict,  # Retries, throttled calls, concurrency limit
+                'resumed': int,  # Items skipped as completed by an earlier run
+                'job': str,  # Job id
+            }
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.states = states = [{
+            'index': index,
+            'input': item['input'],
+            'status': 'queued',
+            'output': None,
+            'error': None,
+            'duplicate_of': None,
+            'started': None,
+            'elapsed': None,
+        } for index, item in enumerate(items)]
+
+        # Fail fast on a missing API key before spawning any workers
+        # Responses from a stand-in client stay out of the response cache real runs read
+        generator = AIGenerator(self.config, use_cache=self.use_cache and self.client is None, client=self.client)
+
+        self.store = PostStore.from_config(self.config)
+        jobs = JobStore.from_config(self.config)
+        self.job = jobs.create(
+            'batch',
+            json.dumps([items, str(self.output_dir.resolve())], sort_keys=True),
+            {'prompt': self.default_prompt, 'category': self.default_category},
+            fresh=not self.resume
+        )
+        completed = self.job.meta.get('completed', {})
+
+        pending = []
+        for index, state in enumerate(states):
+            output = completed.get(str(index))
+            if output and Path(output).exists():
+                self._update(state, status='done', output=output)
+            else:
+                pending.append(index)
+
+        start = time.monotonic()
+
+        if pending and self.use_batches_api:
+            self._run_bulk(items, states, generator, pending)
+        elif pending:
+            self._run_concurrent(items, states, generator, pending)
+
+        elapsed = time.monotonic() - start
+        succeeded = sum(1 for s in states if s['status'] == 'done')
+        skipped = sum(1 for s in states if s['status'] == 'duplicate')
+
+        return {
+            'items': states,
+            'succeeded': succeeded,
+            'failed': len(states) - succeeded - skipped,
+            'duplicates': sum(1 for s in states if s['duplicate_of']),
+            'skipped': skipped,
+            'elapsed': elapsed,
+            'throughput': succeeded / elapsed * 60 if elapsed > 0 else 0.0,
+            'cache': generator.cache_stats(),
+            'usage': generator.usage_stats(),
+            'rate_limit': generator.limiter.stats(),
+            'resumed': len(states) - len(pending),
+            'job': self.job.id,
+        }
+
+    def _run_concurrent(
+        self,
+        items: List[Dict],
+        states: List[Dict],
+        generator: AIGenerator,
+        pending: List[int]
+    ):
+        """Stream each extracted item straight into a bounded pool of API calls"""
+        with ProcessPoolExecutor(max_workers=self.extract_workers) as extract_pool, \
+                ThreadPoolExecutor(max_workers=self.api_concurrency) as api_pool:
+
+            extract_futures = {}
+            for index in pending:
+                self._update(states[index], status='extracting', started=time.monotonic())
+                future = extract_pool.submit(_extract, self.config, items[index]['input'], self.use_cache)
+                extract_futures[future] = index
+
+            generate_futures = []
+            for future in as_completed(extract_futures):
+                index = extract_futures[future]
+                try:
+                    processed = future.result()
+                except Exception as e:
+                    self._fail(states[index], e)
+                    continue
+
+                if self._check_duplicate(states[index], processed):
+                    continue
+
+                self._update(states[index], status='generating')
+                generate_futures.append(api_pool.submit(
+                    self._generate, items[index], states[index], processed, generator
+                ))
+
+            for future in as_completed(generate_futures):
+                future.result()
+
+    def _run_bulk(
+        self,
+        items: List[Dict],
+        states: List[Dict],
+        generator: AIGenerator,
+        pending: List[int]
+    ):
+        """Extract everything, then submit all generations as one Message Batch"""
+        extracted = {}
+        with ProcessPoolExecutor(max_workers=self.extract_workers) as extract_pool:
+            extract_futures = {}
+            for index in pending:
+                self._update(states[index], status='extracting', started=time.monotonic())
+                future = extract_pool.submit(_extract, self.config, items[index]['input'], self.use_cache)
+                extract_futures[future] = index
+
+            for future in as_completed(extract_futures):
+                index = extract_futures[future]
+                try:
+                    processed = future.result()
+                except Exception as e:
+                    self._fail(states[index], e)
+                    continue
+
+                if self._check_duplicate(states[index], processed):
+                    continue
+                extracted[index] = processed
+                self._update(states[index], status='waiting')
+
+        if not extracted:
+            return
+
+        indexes = sorted(extracted)
+        for index in indexes:
+            self._update(states[index], status='in batch')
+
+        def on_status(status: str, counts: Dict):
+            self.batch_status = dict(counts, status=status)
+            for index in indexes:
+                self._update(states[index])
+
+        try:
+            results = generator.generate_blog_posts_bulk([
+                {
+                    'content': extracted[index]['content'],
+                    'source_type': extracted[index]['source_type'],
+                    'metadata': extracted[index]['metadata'],
+                    'user_prompt': items[index].get('prompt') or self.default_prompt,
+                    'suggested_title': items[index].get('title') or extracted[index]['title'],
+                }
+                for index in indexes
+            ], on_status=on_status)
+        except Exception as e:
+            for index in indexes:
+                self._fail(states[index], e)
+            return
+
+        html_gen = HTMLGenerator(self.config)
+        for index, result in zip(indexes, results):
+            if result['error']:
+                self._fail(states[index], Exception(result['error']))
+                continue
+            try:
+                self._update(states[index], status='rendering')
+                self._render(items[index], states[index], result['post'], html_gen, extracted[index])
+            except Exception as e:
+                self._fail(states[index], e)
+
+    def _generate(
+        self,
+        item: Dict,
+        state: Dict,
+        processed: Dict,
+        generator: AIGenerator
+    ):
+        """Generate and render one post (runs on the API thread pool)"""
+        try:
+            # Markdown instances are stateful, so each thread renders with its own
+            html_gen = HTMLGenerator(self.config)
+            blog_post = generator.generate_blog_post(
+                content=processed['content'],
+                source_type=processed['source_type'],
+                metadata=processed['metadata'],
+                user_prompt=item.get('prompt') or self.default_prompt,
+                suggested_title=item.get('title') or processed['title']
+            )
+
+            self._update(state, status='rendering')
+            self._render(item, state, blog_post, html_gen, processed)
+
+        except Exception as e:
+            self._fail(state, e)
+
+    def _render(
+        self,
+        item: Dict,
+        state: Dict,
+        blog_post: Dict,
+        html_gen: HTMLGenerator,
+        processed: Dict
+    ):
+        """Render a generated post to HTML and markdown, record it and mark the item done"""
+        category = item.get('category') or self.default_category
+        if category:
+            blog_post['category'] = category
+
+        date = datetime.now().strftime('%Y-%m-%d')
+        html = html_gen.generate_html(
+            title=blog_post['title'],
+            content=blog_post['content'],
+            excerpt=blog_post['excerpt'],
+            category=blog_post['category'],
+            date=date
+        )
+
+        output = item.get('output')
+        slug = html_gen._slugify(blog_post['title'])
+        if output:
+            output_path = Path(output)
+        else:
+            output_path = self._claim_output(item, slug)
+            slug = output_path.stem[len('essay-'):]
+
+        html_gen.save_html(html, str(output_path))
+        html_gen.save_markdown(blog_post, str(output_path.with_suffix('.md')), date)
+
+        # Calls run concurrently on a shared generator, so per-post tokens aren't known here
+        self._update(state)
+        self.store.record(
+            blog_post, str(output_path), date,
+            slug=slug,
+            reading_speed=html_gen.reading_speed,
+            source=item['input'],
+            source_type=processed['source_type'],
+            source_hash=content_hash(item['input']),
+            model=self.config.get('generation', {}).get('model'),
+            seconds=state['elapsed'],
+            fingerprint=processed.get('fingerprint')
+        )
+
+        self._update(state, status='done', output=str(output_path))
+
+        # Checkpoint completion so a rerun with resume skips this item
+        self.job.record('completed', str(state['index']), str(output_path))
+
+    def _claim_output(self, item: Dict, slug: str) -> Path:
+        """
+        essay-<slug>.html in the output dir, or essay-<slug>-2.html and so on
+        if another item in this run or an existing file already has that name
+
+        A file written earlier from this same source is regenerated in place
+        rather than moved aside.
+        """
+        own = {
+            str(Path(post['output']).resolve())
+            for post in self.store.by_source(item['input'], content_hash(item['input']))
+        }
+        with self._claim_lock:
+            number = 1
+            while True:
+                suffix = f'-{number}' if number > 1 else ''
+                path = self.output_dir / f"essay-{slug}{suffix}.html"
+                key = str(path.resolve())
+                on_disk = path.exists() or path.with_suffix('.md').exists()
+                if key not in self.claimed and (not on_disk or key in own):
+                    self.claimed.add(key)
+                    return path
+                number += 1
+
+    def _check_duplicate(self, state: Dict, processed: Dict) -> bool:
+        """
+        Flag an item whose source is a near-duplicate of an earlier post's or
+        of another item in this run; returns True if it should be skipped
+
+        Earlier posts generated from the same source (by content hash, or by
+        path for URLs) don't count. A source with no words has no fingerprint
+        and is never a duplicate.
+        """
+        fingerprint = processed.get('fingerprint') or simhash(
+            processed['content'], self.config.get('dedup', {}).get('shingle_words', 3)
+        )
+        if not fingerprint:
+            return False
+
+        with self._seen_lock:
+            in_run = self.seen.query(fingerprint)
+            self.seen.add(state['input'], fingerprint)
+
+        # Posts from this same source are regenerations, not duplicates, as in generate
+        own = {post['id'] for post in self.store.by_source(state['input'], content_hash(state['input']))}
+        earlier = [
+            post for post in self.store.near_duplicates(fingerprint, self.max_distance)
+            if post['id'] not in own
+        ]
+        if earlier:
+            duplicate_of, distance = earlier[0]['output'], earlier[0]['distance']
+        elif in_run:
+            duplicate_of, distance = in_run[0]
+        else:
+            return False
+
+        self._update(state, duplicate_of=f"{duplicate_of} ({distance} bits apart)")
+        if self.skip_duplicates:
+            self._update(state, status='duplicate')
+            return True
+        return False
+
+    def _fail(self, state: Dict, error: Exception):
+        """Mark an item as failed"""
+        self._update(state, status='failed', error=str(error))
+
+    def _update(self, state: Dict, **changes):
+        """Apply changes to an item state"""
+        state.update(changes)
+        if state['started'] is not None:
+            state['elapsed'] = time.monotonic() - state['started']
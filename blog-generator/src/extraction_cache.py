@@ -0,0 +1,127 @@
+"""
+Extraction Cache for Blog Post Generator
+Content-addressed on-disk cache of InputProcessor results
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class ExtractionCache:
+    """Size-bounded LRU cache of extracted content, one JSON file per entry"""
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ExtractionCache':
+        """Build the cache from the `cache:` section of config.yaml"""
+        cache_config = config.get('cache', {})
+        cache_dir = Path(cache_config.get('dir', '~/.cache/blog-generator')).expanduser()
+        max_mb = cache_config.get('extraction_max_mb', 200)
+        return cls(cache_dir / 'extraction', max_mb * 1024 * 1024)
+
+    def key_for_file(self, path: Path, settings: Dict) -> str:
+        """Key a local file by the hash of its bytes plus processor settings"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return self._key('file', digest.hexdigest(), settings)
+
+    def key_for_files(self, paths: List[Path], settings: Dict) -> str:
+        """Key an ordered set of files (e.g. a screenshot folder) by names and contents"""
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(path.name.encode('utf-8') + b'\0')
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        return self._key('files', digest.hexdigest(), settings)
+
+    def key_for_url(self, url: str, validators: Dict, settings: Dict) -> str:
+        """Key a URL by its address plus ETag/Last-Modified validators"""
+        return self._key('url', json.dumps([url, validators], sort_keys=True), settings)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached result for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Bump mtime so eviction treats this entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Store a result and evict least-recently-used entries over the size bound"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+        self._evict()
+
+    def clear(self) -> int:
+        """Remove every cached entry, returning the number removed"""
+        removed = 0
+        for path in self._entries():
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def size(self) -> int:
+        """Total bytes currently stored"""
+        return sum(self._stat(path)[1] for path in self._entries())
+
+    def _evict(self):
+        """Drop oldest entries until the cache fits in max_bytes"""
+        entries = [(path, *self._stat(path)) for path in self._entries()]
+        total = sum(size for _, _, size in entries)
+        if total <= self.max_bytes:
+            return
+
+        for path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _entries(self):
+        if not self.cache_dir.exists():
+            return []
+        return list(self.cache_dir.glob('*/*.json'))
+
+    def _stat(self, path: Path):
+        try:
+            stat = path.stat()
+            return stat.st_mtime, stat.st_size
+        except FileNotFoundError:
+            return 0.0, 0
+
+    def _key(self, kind: str, identity: str, settings: Dict) -> str:
+        payload = json.dumps([kind, identity, settings], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f'{key}.json'
@@ -0,0 +1,121 @@
+"""
+Source Fingerprints for Blog Post Generator
+64-bit SimHash of extracted text, and a band index for near-duplicate lookups
+"""
+
+import hashlib
+import re
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+
+BITS = 64
+
+# The fingerprint is split into this many 8-bit bands. Two fingerprints at
+# most BANDS - 1 bits apart agree exactly on at least one band, so a lookup
+# only has to compare against sources sharing a band
+BANDS = 8
+MAX_DISTANCE = BANDS - 1
+
+# Letters only: timestamps, numbering and punctuation that differ between
+# re-exports of the same transcript don't change the fingerprint
+_WORD = re.compile(r'[^\W\d_]+')
+
+# Shingle hashes voted per pass, and recent shingles remembered so a
+# repeated run of words votes once; both bound memory for very large sources
+_BLOCK = 16384
+_RECENT = 16384
+
+
+def simhash(text: str, shingle_words: int = 3) -> Optional[str]:
+    """
+    SimHash of the text's word shingles, as 16 hex digits, or None if the
+    text has no words
+
+    Each run of shingle_words words votes on every bit with its hash, unless
+    it already appeared among the last _RECENT shingles; sources that share
+    most of their shingles end up a few bits apart. Words are read as a
+    stream, so memory doesn't grow with the text.
+    """
+    ones = [0] * BITS
+    total = 0
+    hashes: List[int] = []
+    recent: OrderedDict = OrderedDict()
+
+    def vote():
+        # Per-bit vote counts, taken column-wise over the hashes' bit strings
+        bits = ''.join(format(value, '064b') for value in hashes)
+        for position in range(BITS):
+            ones[position] += bits[position::BITS].count('1')
+        hashes.clear()
+
+    def add(shingle: str):
+        nonlocal total
+        value = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        if value in recent:
+            recent.move_to_end(value)
+            return
+        recent[value] = None
+        if len(recent) > _RECENT:
+            recent.popitem(last=False)
+        hashes.append(value)
+        total += 1
+        if len(hashes) >= _BLOCK:
+            vote()
+
+    window: Deque[str] = deque(maxlen=shingle_words)
+    for match in _WORD.finditer(text):
+        window.append(match.group().lower())
+        if len(window) == shingle_words:
+            add(' '.join(window))
+    if not total and window:
+        # Fewer words than one shingle
+        add(' '.join(window))
+    if not total:
+        return None
+    vote()
+
+    value = 0
+    for position, count in enumerate(ones):
+        if count * 2 > total:
+            value |= 1 << (BITS - 1 - position)
+    return f'{value:016x}'
+
+
+def hamming(a: str, b: str) -> int:
+    """Number of differing bits between two fingerprints"""
+    return bin(int(a, 16) ^ int(b, 16)).count('1')
+
+
+def bands(fingerprint: str) -> List[int]:
+    """The fingerprint's BANDS band values, most significant first"""
+    width = BITS // BANDS
+    value = int(fingerprint, 16)
+    return [(value >> (BITS - width * (i + 1))) & ((1 << width) - 1) for i in range(BANDS)]
+
+
+class SimhashIndex:
+    """In-memory band index of fingerprints, for duplicates within one run"""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = min(max_distance, MAX_DISTANCE)
+        self.fingerprints: Dict[str, str] = {}
+        self.buckets: List[Dict[int, Set[str]]] = [{} for _ in range(BANDS)]
+
+    def add(self, key: str, fingerprint: str):
+        self.fingerprints[key] = fingerprint
+        for band, value in enumerate(bands(fingerprint)):
+            self.buckets[band].setdefault(value, set()).add(key)
+
+    def query(self, fingerprint: str) -> List[Tuple[str, int]]:
+        """(key, distance) of indexed fingerprints within max_distance, closest first"""
+        candidates: Set[str] = set()
+        for band, value in enumerate(bands(fingerprint)):
+            candidates |= self.buckets[band].get(value, set())
+
+        matches = []
+        for key in candidates:
+            distance = hamming(fingerprint, self.fingerprints[key])
+            if distance <= self.max_distance:
+                matches.append((key, distance))
+        return sorted(matches, key=lambda match: (match[1], match[0]))
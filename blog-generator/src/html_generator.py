@@ -3,12 +3,63 @@ HTML Generator for Blog Posts
 Converts markdown to HTML with site styling
 """
 
+import hashlib
+import html as html_lib
+import json
 import re
-from datetime import datetime
-from typing import Dict, Optional
+from datetime import date as date_type, datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 import markdown
+import yaml
 from markdown.extensions import tables, fenced_code, codehilite
 
+from markdown_blocks import SiteBlocksExtension
+import tracing
+
+
+TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+# Frontmatter date formats accepted by load_markdown, normalised to YYYY-MM-DD
+DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%d %b %Y')
+
+# Config sections read while rendering a post (search places the search box)
+RENDER_CONFIG_SECTIONS = ('site', 'defaults', 'style', 'related', 'search')
+
+
+class CompiledTemplate:
+    """Page template pre-split into static segments and {field} slots"""
+
+    FIELD = re.compile(r'\{(\w+)\}')
+
+    def __init__(self, text: str):
+        parts = self.FIELD.split(text)
+        self.static = parts[0::2]
+        self.fields = parts[1::2]
+
+    def render(self, **values) -> str:
+        """Fill every slot, joining the pieces in a single pass"""
+        pieces = [self.static[0]]
+        for field, static in zip(self.fields, self.static[1:]):
+            pieces.append(str(values[field]))
+            pieces.append(static)
+        return ''.join(pieces)
+
+
+@lru_cache(maxsize=None)
+def _page_template() -> CompiledTemplate:
+    """Article page template, loaded and compiled once per process"""
+    return CompiledTemplate((TEMPLATE_DIR / 'article.tmpl').read_text(encoding='utf-8'))
+
+
+@lru_cache(maxsize=None)
+def _stylesheet() -> Tuple[str, str]:
+    """(content-hashed filename, css) for the shared article stylesheet"""
+    css = (TEMPLATE_DIR / 'article.css').read_text(encoding='utf-8')
+    digest = hashlib.sha256(css.encode('utf-8')).hexdigest()[:10]
+    return f'article.{digest}.css', css
+
 
 class HTMLGenerator:
     """Generate HTML files from blog post content"""
@@ -17,6 +68,10 @@ class HTMLGenerator:
         self.config = config
         self.author = config.get('site', {}).get('author', 'Michael Pistorio')
         self.reading_speed = config.get('defaults', {}).get('reading_speed', 200)
+        search = config.get('search', {})
+        self.search_dir = search.get('dir', 'search') if search.get('enabled', True) else None
+
+        self.stylesheet_name, self.stylesheet = _stylesheet()
 
         # Configure markdown processor
         self.md = markdown.Markdown(extensions=[
@@ -24,9 +79,11 @@ class HTMLGenerator:
             'fenced_code',
             'codehilite',
             'nl2br',
-            'sane_lists'
+            'sane_lists',
+            SiteBlocksExtension()
         ])
 
+    @tracing.traced('html.render')
     def generate_html(
         self,
         title: str,
@@ -36,7 +93,8 @@ class HTMLGenerator:
         date: Optional[str] = None,
         slug: Optional[str] = None,
         prev_link: Optional[str] = None,
-        next_link: Optional[str] = None
+        next_link: Optional[str] = None,
+        related: Optional[List[Tuple[str, str]]] = None
     ) -> str:
         """
         Generate complete HTML file from blog post data
@@ -50,6 +108,7 @@ class HTMLGenerator:
             slug: URL slug or None to auto-generate
             prev_link: Previous post link (optional)
             next_link: Next post link (optional)
+            related: (link, title) pairs for the Related reading block (optional)
 
         Returns:
             Complete HTML string ready to save
@@ -74,148 +133,32 @@ class HTMLGenerator:
 
         # Build navigation
         nav_html = self._build_navigation(prev_link, next_link)
+        related_html = self._build_related(related or [])
 
         # Build complete HTML
-        html = f"""<!doctype html>
-<html lang="en">
-<head>
-  <meta charset="utf-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1" />
-  <title>{title} | {self.author}</title>
-  <meta name="description" content="{excerpt}">
-  <meta property="og:title" content="{title}" />
-  <meta property="og:description" content="{excerpt}" />
-  <meta property="og:type" content="article" />
-  <style>
-    :root {{
-      --bg:#ffffff;
-      --card:#fafafa;
-      --text:#1f2937;
-      --muted:#6b7280;
-      --accent:#1e3a8a;
-      --cyan:#06b6d4;
-      --border:#e5e7eb;
-    }}
-    html,body{{margin:0;padding:0;background:var(--bg);color:var(--text);font:17px/1.8 -apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif}}
-    .article-wrap{{max-width:740px;margin:0 auto;padding:60px 20px}}
-    .article-header{{border-bottom:1px solid var(--border);padding-bottom:32px;margin-bottom:40px}}
-    .article-meta{{display:flex;gap:16px;align-items:center;margin-bottom:20px;font-size:14px;color:var(--muted)}}
-    .article-tag{{background:rgba(76,201,240,0.15);color:var(--accent);padding:6px 14px;border-radius:6px;font-size:12px;font-weight:600;text-transform:uppercase;letter-spacing:0.5px}}
-    h1{{margin:0 0 20px;font-size:clamp(32px,5vw,44px);line-height:1.2;letter-spacing:-0.5px}}
-    .article-lede{{font-size:20px;color:var(--muted);line-height:1.6;margin:0}}
-    .article-content h2{{font-size:28px;margin:48px 0 20px;color:var(--text);letter-spacing:-0.3px}}
-    .article-content h3{{font-size:22px;margin:36px 0 16px;color:var(--accent)}}
-    .article-content p{{margin:20px 0;color:var(--muted)}}
-    .article-content strong{{color:var(--text);font-weight:600}}
-    .article-content a{{color:var(--cyan);text-decoration:none;border-bottom:1px solid rgba(6,182,212,0.3)}}
-    .article-content a:hover{{border-bottom-color:var(--cyan)}}
-    .article-content ul,.article-content ol{{margin:20px 0;padding-left:24px;color:var(--muted)}}
-    .article-content li{{margin:8px 0}}
-    .article-content code{{background:var(--card);padding:2px 6px;border-radius:3px;font-size:0.9em;font-family:Monaco,Consolas,monospace;color:var(--accent)}}
-    .article-content pre{{background:var(--card);padding:20px;border-radius:8px;overflow-x:auto;margin:24px 0}}
-    .article-content pre code{{background:none;padding:0}}
-    .callout{{background:var(--card);border-left:4px solid var(--accent);border-radius:8px;padding:24px 28px;margin:32px 0}}
-    .callout h4{{margin:0 0 12px;color:var(--accent);font-size:14px;text-transform:uppercase;letter-spacing:0.5px}}
-    .callout p{{margin:0;color:var(--muted)}}
-    .pull-quote{{font-size:24px;line-height:1.5;color:var(--accent);font-style:italic;margin:40px 0;padding:24px 0;border-top:1px solid var(--border);border-bottom:1px solid var(--border);text-align:center}}
-    .trajectory{{background:linear-gradient(135deg, #1a1d2a 0%, #0f1115 100%);border:1px solid var(--border);border-radius:16px;padding:32px;margin:48px 0}}
-    .trajectory h3{{margin:0 0 16px;color:var(--cyan);font-size:22px}}
-    .trajectory p,.trajectory ul,.trajectory li{{color:#d1d5db}}
-    .article-footer{{margin-top:60px;padding-top:32px;border-top:1px solid var(--border)}}
-    .footer-nav{{display:flex;justify-content:space-between;gap:20px;flex-wrap:wrap}}
-    .footer-nav a{{color:var(--accent);text-decoration:none;font-size:15px}}
-    .footer-nav a:hover{{text-decoration:underline}}
-    nav{{margin:20px auto;padding:16px 0;border-bottom:1px solid var(--border);max-width:740px}}
-    nav a{{margin-right:24px;color:var(--muted);font-size:14px;text-transform:uppercase;letter-spacing:0.5px;text-decoration:none}}
-    nav a:hover{{color:var(--accent)}}
-  </style>
-</head>
-<body>
-  <nav style="padding-left:20px;padding-right:20px">
-    <a href="index.html">← Back to Work</a> |
-    <a href="writing.html">All Writing</a>
-  </nav>
-
-  <article class="article-wrap">
-    <header class="article-header">
-      <div class="article-meta">
-        <span class="article-tag">{category}</span>
-        <span>{reading_time} min read</span>
-        <span>{formatted_date}</span>
-      </div>
-      <h1>{title}</h1>
-      <p class="article-lede">{excerpt}</p>
-    </header>
-
-    <div class="article-content">
-{html_content}
-    </div>
-
-    <div class="article-footer">
-{nav_html}
-    </div>
-  </article>
-</body>
-</html>"""
-
+        html = _page_template().render(
+            title=title,
+            author=self.author,
+            excerpt=excerpt,
+            stylesheet=self.stylesheet_name,
+            category=category,
+            reading_time=reading_time,
+            formatted_date=formatted_date,
+            html_content=html_content,
+            related_html=related_html,
+            nav_html=nav_html,
+            search_html=self._build_search()
+        )
+
+        tracing.annotate(bytes=len(html.encode('utf-8')))
         return html
 
+    @tracing.traced('markdown.convert')
     def _process_markdown(self, content: str) -> str:
-        """Convert markdown to HTML with special handling for callouts and quotes"""
-
-        # First, handle special blockquote syntax
-        content = self._process_callouts(content)
-        content = self._process_pull_quotes(content)
-        content = self._process_trajectory(content)
-
-        # Convert markdown to HTML
-        html = self.md.convert(content)
-
-        # Add proper indentation
-        lines = html.split('\n')
-        indented = ['      ' + line if line.strip() else '' for line in lines]
-        return '\n'.join(indented)
-
-    def _process_callouts(self, content: str) -> str:
-        """Process callout boxes (blockquotes with bold headers)"""
-
-        # Pattern: > **Header**\n> Content
-        pattern = r'> \*\*(.+?)\*\*\n((?:> .+\n?)+)'
-
-        def replace_callout(match):
-            header = match.group(1)
-            body_lines = match.group(2).split('\n')
-            body = ' '.join(line.replace('> ', '') for line in body_lines if line.strip())
-
-            return f'<div class="callout"><h4>{header}</h4><p>{body}</p></div>'
-
-        return re.sub(pattern, replace_callout, content)
-
-    def _process_pull_quotes(self, content: str) -> str:
-        """Process pull quotes (blockquotes with italic text)"""
-
-        # Pattern: > *"Quote text"*
-        pattern = r'> \*"(.+?)"\*'
-
-        def replace_quote(match):
-            quote = match.group(1)
-            return f'<p class="pull-quote">"{quote}"</p>'
-
-        return re.sub(pattern, replace_quote, content)
-
-    def _process_trajectory(self, content: str) -> str:
-        """Process trajectory sections (special dark sections)"""
-
-        # Pattern: ## Trajectory (heading followed by content)
-        pattern = r'## Trajectory\n\n(.+?)(?=\n##|\Z)'
-
-        def replace_trajectory(match):
-            body = match.group(1)
-            # Convert the body markdown to HTML
-            body_html = self.md.convert(body)
-            return f'<div class="trajectory"><h3>Trajectory</h3>{body_html}</div>'
-
-        return re.sub(pattern, replace_trajectory, content, flags=re.DOTALL)
+        """Convert markdown to HTML, including callouts, pull quotes and Trajectory sections"""
+        self.md.reset()
+        tracing.annotate(bytes=len(content.encode('utf-8')))
+        return self.md.convert(content)
 
     def _build_navigation(
         self,
@@ -243,6 +186,35 @@ class HTMLGenerator:
 {chr(10).join(nav_items)}
       </div>"""
 
+    def _build_related(self, related: List[Tuple[str, str]]) -> str:
+        """Build the Related reading list HTML"""
+
+        if not related:
+            return ''
+
+        items = '\n'.join(
+            f'          <li><a href="{html_lib.escape(link)}">{html_lib.escape(title)}</a></li>'
+            for link, title in related
+        )
+        return f"""      <aside class="related-reading">
+        <h2>Related reading</h2>
+        <ul>
+{items}
+        </ul>
+      </aside>"""
+
+    def _build_search(self) -> str:
+        """Build the site search box, backed by the index SearchIndex writes next to the post"""
+
+        if not self.search_dir:
+            return ''
+
+        search_dir = html_lib.escape(self.search_dir.strip('/'))
+        return f"""    <div class="site-search">
+      <input type="search" placeholder="Search" aria-label="Search the site" data-blog-search="{search_dir}/manifest.json">
+    </div>
+    <script src="{search_dir}/search.js" defer></script>"""
+
     def _slugify(self, text: str) -> str:
         """Convert title to URL-friendly slug"""
         text = text.lower()
@@ -250,7 +222,91 @@ class HTMLGenerator:
         text = re.sub(r'[-\s]+', '-', text)
         return text.strip('-')
 
+    @tracing.traced('html.write')
     def save_html(self, html: str, output_path: str):
-        """Save HTML to file"""
+        """Save HTML to file, alongside the shared stylesheet it links to"""
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(html)
+        tracing.annotate(bytes=len(html.encode('utf-8')), path=output_path)
+
+        self.save_stylesheet(str(Path(output_path).parent))
+
+    def save_stylesheet(self, output_dir: str) -> Path:
+        """Write the content-hashed stylesheet into output_dir unless already there"""
+        path = Path(output_dir) / self.stylesheet_name
+        if not path.exists():
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.stylesheet)
+        return path
+
+    def load_markdown(self, path: str) -> Tuple[Dict, str]:
+        """Read a markdown post, returning (frontmatter, markdown body)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        frontmatter = {}
+        markdown_content = content
+
+        if content.startswith('---'):
+            parts = content.split('---', 2)
+            if len(parts) >= 3:
+                try:
+                    frontmatter = yaml.safe_load(parts[1]) or {}
+                except yaml.YAMLError as e:
+                    mark = getattr(e, 'problem_mark', None)
+                    where = f" on line {mark.line + 1}" if mark else ''
+                    raise Exception(f"Error parsing frontmatter{where}: {getattr(e, 'problem', None) or e}")
+                markdown_content = parts[2].strip()
+
+        # Dates are normalised once here, so sorting and rendering can rely on YYYY-MM-DD
+        if frontmatter.get('date'):
+            frontmatter['date'] = self._normalize_date(frontmatter['date'])
+
+        return frontmatter, markdown_content
+
+    def _normalize_date(self, value) -> str:
+        """A frontmatter date as YYYY-MM-DD; raises if it isn't a date"""
+        # YAML turns bare dates into date objects
+        if isinstance(value, date_type):
+            return value.strftime('%Y-%m-%d')
+        text = ' '.join(str(value).split())
+        for date_format in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, date_format).strftime('%Y-%m-%d')
+            except ValueError:
+                continue
+        raise Exception(f"Unrecognised date '{value}' in frontmatter; use YYYY-MM-DD")
+
+    def template_fingerprint(self) -> str:
+        """Hash of the templates, CSS and rendering settings - everything besides the post that affects output"""
+        digest = hashlib.sha256()
+        for module in ('html_generator.py', 'markdown_blocks.py'):
+            digest.update((Path(__file__).parent / module).read_bytes())
+        for template in sorted(TEMPLATE_DIR.iterdir()):
+            digest.update(template.read_bytes())
+        # Only the settings that reach the page; rate limits, caching etc. don't force a rebuild
+        rendering = {section: self.config.get(section) for section in RENDER_CONFIG_SECTIONS}
+        digest.update(json.dumps(rendering, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    @tracing.traced('markdown.write')
+    def save_markdown(self, blog_post: Dict, output_path: str, date: Optional[str] = None):
+        """Save markdown version of a blog post with frontmatter"""
+        if not date:
+            date = datetime.now().strftime('%Y-%m-%d')
+
+        # Titles and excerpts often hold colons or quotes, so let YAML do the quoting
+        frontmatter = yaml.safe_dump({
+            'title': blog_post['title'],
+            'category': blog_post['category'],
+            'excerpt': blog_post['excerpt'],
+            'tags': ', '.join(blog_post['tags']),
+            'date': date,
+        }, sort_keys=False, allow_unicode=True, width=float('inf'))
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(f"""---
+{frontmatter}---
+
+{blog_post['content']}
+""")
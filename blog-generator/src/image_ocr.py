@@ -0,0 +1,180 @@
+"""
+Image OCR for Blog Post Generator
+Preprocessing and tiled, parallel OCR for screenshots and scans
+"""
+
+import math
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image, ImageOps
+import pytesseract
+
+
+# Lines compared when stitching the overlap between neighbouring tiles
+OVERLAP_WINDOW = 15
+# Matched overlap must carry at least this much text, so short repeated
+# lines like "Reply" don't cause false joins
+MIN_OVERLAP_CHARS = 20
+
+
+def downsample_to_budget(image: Image.Image, file_size: int, max_file_size: int) -> Image.Image:
+    """Shrink an oversized image so its pixel count scales down with the size budget"""
+    if file_size <= max_file_size:
+        return image
+
+    scale = math.sqrt(max_file_size / file_size)
+    new_size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    return image.resize(new_size, Image.LANCZOS)
+
+
+def preprocess(
+    image: Image.Image,
+    max_width: Optional[int] = None,
+    binarize_threshold: Optional[int] = None
+) -> Image.Image:
+    """Grayscale, stretch contrast, cap the width and optionally binarize"""
+    image = ImageOps.autocontrast(image.convert('L'))
+
+    if max_width and image.width > max_width:
+        height = max(1, round(image.height * max_width / image.width))
+        image = image.resize((max_width, height), Image.LANCZOS)
+
+    if binarize_threshold is not None:
+        image = image.point(lambda p: 255 if p > binarize_threshold else 0, mode='1')
+
+    return image
+
+
+def split_tiles(image: Image.Image, tile_height: int, overlap: int) -> List[Image.Image]:
+    """Cut a tall image into horizontal bands that overlap by `overlap` pixels"""
+    if image.height <= tile_height:
+        return [image]
+
+    step = max(1, tile_height - overlap)
+    tiles = []
+    top = 0
+    while True:
+        bottom = min(top + tile_height, image.height)
+        tiles.append(image.crop((0, top, image.width, bottom)))
+        if bottom >= image.height:
+            break
+        top += step
+    return tiles
+
+
+def ocr_images(images: List[Image.Image], lang: str, workers: Optional[int] = None) -> List[Tuple[str, float]]:
+    """
+    OCR images concurrently, returning (text, seconds) in input order
+
+    Tesseract runs as a subprocess per call, so a thread pool is enough to
+    keep every core busy.
+    """
+    def run(image):
+        start = time.perf_counter()
+        text = pytesseract.image_to_string(image, lang=lang)
+        return text, time.perf_counter() - start
+
+    if len(images) == 1:
+        return [run(images[0])]
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        return list(pool.map(run, images))
+
+
+def merge_overlapping(texts: List[str]) -> str:
+    """Join tile texts, dropping lines repeated in the overlap between neighbours"""
+    merged: List[str] = []
+    for text in texts:
+        lines = text.split('\n')
+        if not merged:
+            merged = lines
+            continue
+
+        tail_start = max(0, len(merged) - OVERLAP_WINDOW)
+        tail = [_normalize(line) for line in merged[tail_start:]]
+        head = [_normalize(line) for line in lines[:OVERLAP_WINDOW]]
+
+        match = SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(
+            0, len(tail), 0, len(head)
+        )
+        matched_chars = sum(len(line) for line in tail[match.a:match.a + match.size])
+
+        if match.size and matched_chars >= MIN_OVERLAP_CHARS:
+            # Keep the next tile's copy of the overlap - lines cut off at the
+            # bottom edge of the previous tile are whole there
+            merged = merged[:tail_start + match.a] + lines[match.b:]
+        else:
+            merged.extend(lines)
+
+    return '\n'.join(merged)
+
+
+def ocr_frames(frames: List[Image.Image], lang: str, settings: Dict) -> List[Tuple[str, float, int]]:
+    """
+    Preprocess, tile and OCR a sequence of images
+
+    Tiles from every frame share one worker pool, so a folder of short
+    screenshots parallelizes as well as one long one. Returns
+    (text, OCR seconds, tile count) per frame, in order.
+    """
+    frame_tiles = [_prepare_tiles(frame, settings) for frame in frames]
+
+    results = ocr_images(
+        [tile for tiles in frame_tiles for tile in tiles],
+        lang,
+        settings.get('ocr_workers')
+    )
+
+    frame_results = []
+    offset = 0
+    for tiles in frame_tiles:
+        tile_results = results[offset:offset + len(tiles)]
+        offset += len(tiles)
+        frame_results.append((
+            merge_overlapping([text for text, _ in tile_results]),
+            sum(seconds for _, seconds in tile_results),
+            len(tiles)
+        ))
+
+    return frame_results
+
+
+def ocr_image(image: Image.Image, lang: str, settings: Dict) -> Tuple[str, List[Dict]]:
+    """
+    Preprocess, tile and OCR one image
+
+    Returns (text, per-tile timings).
+    """
+    tiles = _prepare_tiles(image, settings)
+
+    results = ocr_images(tiles, lang, settings.get('ocr_workers'))
+    text = merge_overlapping([text for text, _ in results])
+
+    timings = [
+        {'index': i + 1, 'seconds': seconds, 'extractor': 'tesseract'}
+        for i, (_, seconds) in enumerate(results)
+    ]
+    return text, timings
+
+
+def _prepare_tiles(image: Image.Image, settings: Dict) -> List[Image.Image]:
+    """Preprocess an image and cut it into OCR tiles per the processing settings"""
+    image = preprocess(
+        image,
+        max_width=settings.get('ocr_max_width', 2000),
+        binarize_threshold=settings.get('ocr_binarize_threshold')
+    )
+    return split_tiles(
+        image,
+        tile_height=settings.get('ocr_tile_height', 2000),
+        overlap=settings.get('ocr_tile_overlap', 200)
+    )
+
+
+def _normalize(line: str) -> str:
+    return re.sub(r'\s+', ' ', line).strip().lower()
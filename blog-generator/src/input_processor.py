@@ -5,25 +5,151 @@ Handles: URLs, PDFs, images, plain text, transcripts, academic papers
 
 import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 from urllib.parse import urlparse
 
-import requests
-from bs4 import BeautifulSoup
-import PyPDF2
-import pdfplumber
-from PIL import Image
-import pytesseract
+# PDF, OCR and HTML parsing libraries are imported inside the extractors that
+# use them, so commands that never touch a given input type don't pay for them
+from extraction_cache import ExtractionCache
+from fingerprint import simhash
+import tracing
+
+
+# Bump whenever extraction output changes so stale cache entries are ignored
+EXTRACTOR_VERSION = 8
+
+IMAGE_SUFFIXES = ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.tif', '.webp']
+
+
+def _extract_pdf_shard(path: str, page_numbers: List[int]) -> List[Dict]:
+    """
+    Extract text from a contiguous run of PDF pages (process pool worker)
+
+    pdfplumber is tried first; pages that come back empty fall back to PyPDF2
+    individually rather than re-reading the whole document.
+    """
+    import pdfplumber
+
+    pages = []
+    reader = None
+
+    with pdfplumber.open(path) as pdf:
+        for page_number in page_numbers:
+            start = time.perf_counter()
+            text = pdf.pages[page_number].extract_text() or ''
+            extractor = 'pdfplumber'
+
+            if not text.strip():
+                if reader is None:
+                    import PyPDF2
+                    reader = PyPDF2.PdfReader(path)
+                text = reader.pages[page_number].extract_text() or ''
+                extractor = 'pypdf2' if text.strip() else 'none'
+
+            pages.append({
+                'index': page_number + 1,
+                'text': text,
+                'seconds': time.perf_counter() - start,
+                'extractor': extractor,
+            })
+
+    return pages
+
+
+def _iter_clean_text(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Clean and normalize extracted text piece by piece (PDF pages)
+
+    Whitespace at the end of each piece is held back until the next one, so
+    blank-line and space runs split across pieces collapse exactly as they
+    would in one string, without ever joining the raw input.
+    """
+    pending = ''
+    started = False
+    for chunk in chunks:
+        # Remove common artifacts
+        text = pending + chunk.replace('\x00', '').replace('\uf0b7', '•')  # Fix bullet points
+        head = text.rstrip()
+        pending = text[len(head):] if started or head else ''
+        if not head:
+            continue
+
+        # Remove excessive whitespace
+        head = re.sub(r'\n\s*\n\s*\n+', '\n\n', head)
+        head = re.sub(r' {2,}', ' ', head)
+        if not started:
+            head = head.lstrip()
+            started = True
+        yield head
+
+
+def _iter_page_texts(pages: List[Dict]) -> Iterator[str]:
+    """Non-empty page texts separated by blank lines, releasing each page's text once read"""
+    separator = ''
+    for page in pages:
+        text = page.pop('text', '')
+        if text:
+            yield separator
+            yield text
+            separator = '\n\n'
+
+
+def _first_lines(text: str, count: int) -> List[str]:
+    """The first count lines of text, without splitting (and copying) the rest"""
+    lines = []
+    start = 0
+    while len(lines) < count and start <= len(text):
+        end = text.find('\n', start)
+        if end < 0:
+            end = len(text)
+        lines.append(text[start:end])
+        start = end + 1
+    return lines
+
+
+def _parse_page_ranges(spec: str) -> List[int]:
+    """Parse a 1-based page spec like "1-20,25" into sorted zero-based page numbers"""
+    page_numbers = set()
+    for part in str(spec).split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            page_numbers.update(range(int(first) - 1, int(last)))
+        else:
+            page_numbers.add(int(part) - 1)
+    return sorted(n for n in page_numbers if n >= 0)
+
+
+def _format_page_ranges(page_numbers: List[int]) -> str:
+    """Format zero-based page numbers back into a compact 1-based spec"""
+    ranges = []
+    for n in page_numbers:
+        if ranges and n == ranges[-1][1] + 1:
+            ranges[-1][1] = n
+        else:
+            ranges.append([n, n])
+    return ','.join(
+        str(first + 1) if first == last else f'{first + 1}-{last + 1}'
+        for first, last in ranges
+    )
 
 
 class InputProcessor:
     """Process various input types and extract text content"""
 
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, use_cache: bool = True, pages: Optional[str] = None):
         self.config = config
+        self.pages = pages or config.get('processing', {}).get('pdf_pages')
         self.timeout = config.get('processing', {}).get('fetch_timeout', 30)
         self.max_image_size = config.get('processing', {}).get('max_image_size', 5242880)
+        self.cache = ExtractionCache.from_config(config) if use_cache else None
+        self.use_cache = use_cache
+        self._fetcher = None
 
     def process(self, input_path: str) -> Dict[str, any]:
         """
@@ -35,21 +161,84 @@ class InputProcessor:
                 'source_type': str,  # Type of input
                 'metadata': dict,  # Any extracted metadata
                 'title': Optional[str],  # Auto-detected title
+                'fingerprint': Optional[str],  # SimHash of the content for near-duplicate checks; None if it has no words
+                'cached': bool,  # True if served from the extraction cache
+                'timings': Optional[dict],  # Per-page/tile timings (fresh PDF and image extractions only)
             }
         """
-        # Detect input type
+        with tracing.span('input.process', input=input_path) as span:
+            # URLs are fetched up front (cheaply, via conditional GET) so their
+            # validators can key the cache
+            fetched = self._fetch_url(input_path) if self._is_url(input_path) else None
+            cache_key = self._cache_key(input_path, fetched) if self.cache else None
+
+            if cache_key:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    cached['cached'] = True
+                    cached['timings'] = None
+                    if span.recording:
+                        span.set(cached=True, **self._span_attributes(cached))
+                    return cached
+
+            with tracing.span('input.extract'):
+                result = self._extract(input_path, fetched)
+                timings = result.pop('timings', None)
+
+                # Pages/tiles/frames are timed inside worker pools; report them
+                # as child spans of the extraction
+                if timings:
+                    for part in timings['parts']:
+                        tracing.record(
+                            f"extract.{timings['unit']}",
+                            part['seconds'],
+                            index=part['index'],
+                            extractor=part.get('extractor')
+                        )
+
+            with tracing.span('input.fingerprint'):
+                result['fingerprint'] = simhash(
+                    result['content'], self.config.get('dedup', {}).get('shingle_words', 3)
+                )
+
+            if cache_key:
+                self.cache.put(cache_key, result)
+
+            result['cached'] = False
+            result['timings'] = timings
+            if span.recording:
+                span.set(cached=False, **self._span_attributes(result))
+            if timings and timings['unit'] == 'page':
+                span.set(pages=len(timings['parts']))
+            return result
+
+    def _span_attributes(self, result: Dict) -> Dict:
+        """Size attributes of an extraction result for the trace; only worked out while tracing"""
+        metadata = result.get('metadata') or {}
+        pages = metadata.get('pages') or metadata.get('frame_count')
+        return {
+            'source_type': result['source_type'],
+            'bytes': len(result['content'].encode('utf-8')),
+            'pages': pages if isinstance(pages, int) else None,
+        }
+
+    def _extract(self, input_path: str, fetched: Optional[Dict] = None) -> Dict:
+        """Detect input type and run the matching extractor"""
         if self._is_url(input_path):
-            return self._process_url(input_path)
+            return self._process_url(input_path, fetched)
 
         path = Path(input_path)
         if not path.exists():
             raise FileNotFoundError(f"Input file not found: {input_path}")
 
+        if path.is_dir():
+            return self._process_image_set(self._image_files(path))
+
         suffix = path.suffix.lower()
 
         if suffix == '.pdf':
             return self._process_pdf(path)
-        elif suffix in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff']:
+        elif suffix in IMAGE_SUFFIXES:
             return self._process_image(path)
         elif suffix in ['.txt', '.md', '.markdown']:
             return self._process_text_file(path)
@@ -57,6 +246,35 @@ class InputProcessor:
             # Try to process as text
             return self._process_text_file(path)
 
+    def _cache_settings(self) -> Dict:
+        """Processor settings that change extraction output"""
+        return {
+            'extractor_version': EXTRACTOR_VERSION,
+            'ocr_language': self.config.get('processing', {}).get('ocr_language', 'eng'),
+            'pdf_pages': self.pages,
+            'max_pages': self.config.get('processing', {}).get('max_pages'),
+            'shingle_words': self.config.get('dedup', {}).get('shingle_words', 3),
+            'ocr': {
+                key: value for key, value in self.config.get('processing', {}).items()
+                if key.startswith('ocr_') and key != 'ocr_workers'
+            },
+        }
+
+    def _cache_key(self, input_path: str, fetched: Optional[Dict] = None) -> Optional[str]:
+        """Build the extraction cache key, or None if the input can't be cached"""
+        if fetched is not None:
+            if not fetched['validators']:
+                # Nothing to revalidate against, so always extract fresh
+                return None
+            return self.cache.key_for_url(input_path, fetched['validators'], self._cache_settings())
+
+        path = Path(input_path)
+        if path.is_dir():
+            return self.cache.key_for_files(self._image_files(path), self._cache_settings())
+        if not path.is_file():
+            return None
+        return self.cache.key_for_file(path, self._cache_settings())
+
     def _is_url(self, text: str) -> bool:
         """Check if input is a URL"""
         try:
@@ -65,16 +283,37 @@ class InputProcessor:
         except Exception:
             return False
 
-    def _process_url(self, url: str) -> Dict:
+    @property
+    def fetcher(self):
+        """Pooled URL fetcher, created on first use"""
+        if self._fetcher is None:
+            from url_fetcher import URLFetcher
+            self._fetcher = URLFetcher.from_config(self.config, use_store=self.use_cache)
+        return self._fetcher
+
+    def _fetch_url(self, url: str) -> Dict:
+        """Fetch a URL through the pooled fetcher"""
+        try:
+            with tracing.span('input.fetch', url=url) as span:
+                fetched = self.fetcher.fetch(url)
+                span.set(
+                    bytes=len(fetched['content']),
+                    not_modified=fetched['not_modified'],
+                    truncated=fetched['truncated']
+                )
+                return fetched
+        except Exception as e:
+            raise Exception(f"Error processing URL: {str(e)}")
+
+    def _process_url(self, url: str, fetched: Optional[Dict] = None) -> Dict:
         """Process web URL - fetch and extract content"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=self.timeout)
-            response.raise_for_status()
+            from bs4 import BeautifulSoup
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if fetched is None:
+                fetched = self.fetcher.fetch(url)
+
+            soup = BeautifulSoup(fetched['content'], 'html.parser')
 
             # Remove script and style elements
             for script in soup(['script', 'style', 'nav', 'footer', 'header']):
@@ -104,7 +343,8 @@ class InputProcessor:
                 'source_type': 'url',
                 'metadata': {
                     'url': url,
-                    'domain': urlparse(url).netloc
+                    'domain': urlparse(url).netloc,
+                    'truncated': fetched['truncated']
                 },
                 'title': title
             }
@@ -113,61 +353,53 @@ class InputProcessor:
             raise Exception(f"Error processing URL: {str(e)}")
 
     def _process_pdf(self, path: Path) -> Dict:
-        """Process PDF file - extract text and metadata"""
-        content_parts = []
+        """Process PDF file - extract text and metadata page by page in parallel"""
         metadata = {}
         title = None
 
         try:
-            # Try pdfplumber first (better for complex PDFs)
+            import pdfplumber
+
             with pdfplumber.open(path) as pdf:
-                # Extract metadata
+                page_count = len(pdf.pages)
                 if pdf.metadata:
                     metadata = {
                         'title': pdf.metadata.get('Title'),
                         'author': pdf.metadata.get('Author'),
                         'subject': pdf.metadata.get('Subject'),
-                        'pages': len(pdf.pages)
+                        'pages': page_count
                     }
-                    title = metadata.get('title')
 
-                # Extract text from all pages
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        content_parts.append(text)
+            page_numbers = self._select_pages(page_count)
 
-            content = '\n\n'.join(content_parts)
+            start = time.perf_counter()
+            pages = self._extract_pdf_pages(path, page_numbers)
+            total_seconds = time.perf_counter() - start
 
-            # If pdfplumber fails, fall back to PyPDF2
-            if not content.strip():
+            # PyPDF2 was needed for some pages, so it may also read the metadata
+            if not metadata and any(page['extractor'] != 'pdfplumber' for page in pages):
+                import PyPDF2
                 with open(path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-
-                    if not metadata:
-                        pdf_metadata = reader.metadata
-                        if pdf_metadata:
-                            metadata = {
-                                'title': pdf_metadata.get('/Title'),
-                                'author': pdf_metadata.get('/Author'),
-                                'subject': pdf_metadata.get('/Subject'),
-                                'pages': len(reader.pages)
-                            }
-                            title = metadata.get('title')
+                    pdf_metadata = PyPDF2.PdfReader(file).metadata
+                if pdf_metadata:
+                    metadata = {
+                        'title': pdf_metadata.get('/Title'),
+                        'author': pdf_metadata.get('/Author'),
+                        'subject': pdf_metadata.get('/Subject'),
+                        'pages': page_count
+                    }
 
-                    for page in reader.pages:
-                        text = page.extract_text()
-                        if text:
-                            content_parts.append(text)
+            title = metadata.get('title')
 
-                content = '\n\n'.join(content_parts)
+            if len(page_numbers) < page_count:
+                metadata['pages_extracted'] = _format_page_ranges(page_numbers)
 
-            content = self._clean_text(content)
+            # Pages are cleaned as they are joined so the raw text is never copied whole
+            content = ''.join(_iter_clean_text(_iter_page_texts(pages)))
 
             # Try to extract title from first lines if not in metadata
             if not title and content:
-                lines = content.split('\n')
-                for line in lines[:10]:
+                for line in _first_lines(content, 10):
                     if len(line.strip()) > 10 and len(line.strip()) < 200:
                         title = line.strip()
                         break
@@ -176,29 +408,81 @@ class InputProcessor:
                 'content': content,
                 'source_type': 'pdf',
                 'metadata': metadata,
-                'title': title
+                'title': title,
+                'timings': {
+                    'total': total_seconds,
+                    'unit': 'page',
+                    'parts': [
+                        {key: page[key] for key in ('index', 'seconds', 'extractor')}
+                        for page in pages
+                    ]
+                }
             }
 
         except Exception as e:
             raise Exception(f"Error processing PDF: {str(e)}")
 
+    def _select_pages(self, page_count: int) -> List[int]:
+        """Zero-based page numbers to extract, honouring page range and max_pages"""
+        if self.pages:
+            page_numbers = [n for n in _parse_page_ranges(self.pages) if n < page_count]
+        else:
+            page_numbers = list(range(page_count))
+
+        max_pages = self.config.get('processing', {}).get('max_pages')
+        if max_pages:
+            page_numbers = page_numbers[:max_pages]
+
+        return page_numbers
+
+    def _extract_pdf_pages(self, path: Path, page_numbers: List[int]) -> List[Dict]:
+        """Extract pages, sharded across a process pool for large documents"""
+        processing = self.config.get('processing', {})
+        workers = processing.get('pdf_workers') or os.cpu_count() or 1
+        min_shard = processing.get('pdf_pages_per_shard', 16)
+
+        shard_count = min(workers, max(1, len(page_numbers) // min_shard))
+        if shard_count <= 1:
+            return _extract_pdf_shard(str(path), page_numbers)
+
+        # Contiguous shards keep each worker's reads local within the file
+        shard_size = -(-len(page_numbers) // shard_count)
+        shards = [
+            page_numbers[i:i + shard_size]
+            for i in range(0, len(page_numbers), shard_size)
+        ]
+
+        pages = []
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            for shard_pages in pool.map(_extract_pdf_shard, [str(path)] * len(shards), shards):
+                pages.extend(shard_pages)
+        return pages
+
     def _process_image(self, path: Path) -> Dict:
-        """Process image file - OCR to extract text"""
+        """Process image file - preprocess, tile and OCR to extract text"""
         try:
-            # Check file size
-            if path.stat().st_size > self.max_image_size:
-                raise ValueError(f"Image too large (max {self.max_image_size / 1024 / 1024}MB)")
+            from PIL import Image
+            from image_ocr import downsample_to_budget, ocr_image
 
-            # Open and process image
-            image = Image.open(path)
+            start = time.perf_counter()
 
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            # Open and process image; the file is closed before any hand-off
+            with Image.open(path) as image:
+                original_size = image.size
+                image_format = image.format
+                # Multi-page TIFFs and animated images are OCR'd frame by frame
+                multi_frame = getattr(image, 'n_frames', 1) > 1
 
-            # Extract text using OCR
-            ocr_lang = self.config.get('processing', {}).get('ocr_language', 'eng')
-            text = pytesseract.image_to_string(image, lang=ocr_lang)
+                if not multi_frame:
+                    # Oversized images are downsampled rather than rejected
+                    image = downsample_to_budget(image, path.stat().st_size, self.max_image_size)
+
+                    # Extract text using OCR
+                    ocr_lang = self.config.get('processing', {}).get('ocr_language', 'eng')
+                    text, tile_timings = ocr_image(image, ocr_lang, self.config.get('processing', {}))
+
+            if multi_frame:
+                return self._process_image_set([path])
 
             text = self._clean_text(text)
 
@@ -209,19 +493,94 @@ class InputProcessor:
                 'content': text,
                 'source_type': 'image_ocr',
                 'metadata': {
-                    'image_size': image.size,
-                    'format': image.format,
+                    'image_size': original_size,
+                    'format': image_format,
                     'is_reddit_screenshot': is_reddit
                 },
-                'title': None
+                'title': None,
+                'timings': {
+                    'total': time.perf_counter() - start,
+                    'unit': 'tile',
+                    'parts': tile_timings
+                }
             }
 
         except Exception as e:
             raise Exception(f"Error processing image: {str(e)}")
 
+    def _image_files(self, directory: Path) -> List[Path]:
+        """Image files in a directory, in natural filename order (shot-2 before shot-10)"""
+        def natural_key(path):
+            return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', path.name)]
+
+        files = [
+            path for path in directory.iterdir()
+            if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES
+        ]
+        if not files:
+            raise ValueError(f"No images found in {directory}")
+        return sorted(files, key=natural_key)
+
+    def _process_image_set(self, paths: List[Path]) -> Dict:
+        """Process a folder of images or multi-frame files as one OCR source"""
+        try:
+            from PIL import Image, ImageSequence
+            from image_ocr import downsample_to_budget, merge_overlapping, ocr_frames
+
+            start = time.perf_counter()
+
+            frames = []
+            frame_info = []
+            for path in paths:
+                with Image.open(path) as image:
+                    frame_count = getattr(image, 'n_frames', 1)
+                    # Split the size budget evenly across a file's frames
+                    frame_bytes = path.stat().st_size // frame_count
+                    for number, frame in enumerate(ImageSequence.Iterator(image), start=1):
+                        frame = downsample_to_budget(frame.copy(), frame_bytes, self.max_image_size)
+                        frames.append(frame)
+                        frame_info.append({
+                            'name': path.name if frame_count == 1 else f'{path.name}#{number}',
+                            'image_size': frame.size,
+                            'format': image.format,
+                        })
+
+            ocr_lang = self.config.get('processing', {}).get('ocr_language', 'eng')
+            results = ocr_frames(frames, ocr_lang, self.config.get('processing', {}))
+
+            # Sequential screenshots often overlap where the page was scrolled
+            text = merge_overlapping([frame_text for frame_text, _, _ in results])
+            text = self._clean_text(text)
+
+            is_reddit = 'reddit' in text.lower() or 'r/' in text.lower()
+
+            return {
+                'content': text,
+                'source_type': 'image_ocr',
+                'metadata': {
+                    'frame_count': len(frames),
+                    'frames': frame_info,
+                    'is_reddit_screenshot': is_reddit
+                },
+                'title': None,
+                'timings': {
+                    'total': time.perf_counter() - start,
+                    'unit': 'frame',
+                    'parts': [
+                        {'index': i + 1, 'seconds': seconds, 'extractor': f'tesseract ({tiles} tiles)'}
+                        for i, (_, seconds, tiles) in enumerate(results)
+                    ]
+                }
+            }
+
+        except Exception as e:
+            raise Exception(f"Error processing images: {str(e)}")
+
     def _process_text_file(self, path: Path) -> Dict:
         """Process plain text or markdown file"""
         try:
+            # Read as written: indentation and blank lines carry meaning in
+            # markdown and aligned transcripts, so only PDF text is cleaned
             with open(path, 'r', encoding='utf-8') as f:
                 content = f.read()
 
@@ -234,8 +593,7 @@ class InputProcessor:
 
             # Try to extract title from first line
             title = None
-            lines = content.split('\n')
-            first_line = lines[0].strip() if lines else ''
+            first_line = _first_lines(content, 1)[0].strip()
             if first_line and not first_line.startswith('#'):
                 title = first_line
             elif first_line.startswith('# '):
@@ -256,12 +614,4 @@ class InputProcessor:
 
     def _clean_text(self, text: str) -> str:
         """Clean and normalize extracted text"""
-        # Remove excessive whitespace
-        text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-        text = re.sub(r' +', ' ', text)
-
-        # Remove common artifacts
-        text = text.replace('\x00', '')
-        text = text.replace('\uf0b7', '•')  # Fix bullet points
-
-        return text.strip()
+        return ''.join(_iter_clean_text([text]))
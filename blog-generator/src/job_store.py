@@ -0,0 +1,153 @@
+"""
+Job Store for Blog Post Generator
+Per-job work directories that checkpoint each pipeline stage for --resume
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+# Stage name -> checkpoint file, in pipeline order
+STAGE_FILES = {
+    'processed': 'processed.json',  # InputProcessor result
+    'response': 'response.md',  # Raw model response
+    'post': 'post.json',  # Parsed (and possibly edited) post
+    'html': 'page.html',  # Rendered page
+}
+JOB_FILE = 'job.json'
+
+
+def _write_atomic(path: Path, text: str):
+    tmp_path = path.with_suffix(f'{path.suffix}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def content_hash(input_path: str) -> Optional[str]:
+    """SHA-256 of a local file, or of a folder's files and names; None if it doesn't exist"""
+    path = Path(input_path)
+    if not path.exists():
+        return None
+
+    digest = hashlib.sha256()
+    files = sorted(p for p in path.iterdir() if p.is_file()) if path.is_dir() else [path]
+    for file in files:
+        digest.update(file.name.encode('utf-8') + b'\0')
+        with open(file, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+class Job:
+    """One job's work directory: stage checkpoints plus a job.json of metadata"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.id = path.name
+        self.lock = threading.Lock()
+        try:
+            with open(path / JOB_FILE, 'r', encoding='utf-8') as f:
+                self.meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.meta = {}
+
+    def has(self, stage: str) -> bool:
+        return (self.path / STAGE_FILES[stage]).exists()
+
+    def load(self, stage: str):
+        """Read a stage checkpoint - parsed JSON for .json stages, text otherwise"""
+        path = self.path / STAGE_FILES[stage]
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f) if path.suffix == '.json' else f.read()
+
+    def save(self, stage: str, data):
+        """Write a stage checkpoint and record it as completed"""
+        path = self.path / STAGE_FILES[stage]
+        _write_atomic(path, json.dumps(data, indent=2) if path.suffix == '.json' else data)
+        self.update(stages=[s for s in STAGE_FILES if self.has(s)])
+
+    def update(self, **fields):
+        """Merge fields into job.json"""
+        with self.lock:
+            self.meta.update(fields, updated=time.time())
+            self._write_meta()
+
+    def record(self, field: str, key: str, value):
+        """Set one entry of a dict field in job.json (safe across threads)"""
+        with self.lock:
+            self.meta.setdefault(field, {})[key] = value
+            self.meta['updated'] = time.time()
+            self._write_meta()
+
+    def _write_meta(self):
+        _write_atomic(self.path / JOB_FILE, json.dumps(self.meta, indent=2))
+
+
+class JobStore:
+    """Work directories under the cache dir, keyed by input hash and options"""
+
+    def __init__(self, jobs_dir: str):
+        self.jobs_dir = Path(jobs_dir).expanduser()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'JobStore':
+        """Build the store from the `cache:` section of config.yaml"""
+        cache_dir = Path(config.get('cache', {}).get('dir', '~/.cache/blog-generator')).expanduser()
+        return cls(cache_dir / 'jobs')
+
+    def job_id(self, kind: str, identity: str, options: Dict) -> str:
+        """Short stable id for a job on this input with these options"""
+        payload = json.dumps([kind, identity, options], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+    def input_identity(self, input_path: str) -> str:
+        """Hash a local file or folder by content; URLs are identified by address"""
+        return content_hash(input_path) or input_path
+
+    def create(self, kind: str, identity: str, options: Dict, fresh: bool = True) -> Job:
+        """
+        Open the work directory for this input and options
+
+        With fresh=True any checkpoints from an earlier run are discarded.
+        """
+        path = self.jobs_dir / self.job_id(kind, identity, options)
+        if fresh and path.exists():
+            shutil.rmtree(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        job = Job(path)
+        if not job.meta:
+            job.update(kind=kind, options=options, created=time.time())
+        return job
+
+    def open(self, job_id: str) -> Job:
+        """Open an existing job by id (or unique id prefix)"""
+        matches = [job for job in self.list() if job.id.startswith(job_id)] if job_id else []
+        if not matches:
+            raise ValueError(f"No saved job matches '{job_id}'")
+        if len(matches) > 1:
+            raise ValueError(f"Job id '{job_id}' is ambiguous: {', '.join(j.id for j in matches)}")
+        return matches[0]
+
+    def list(self) -> List[Job]:
+        """Every saved job, most recently updated first"""
+        if not self.jobs_dir.exists():
+            return []
+        jobs = [Job(path) for path in self.jobs_dir.iterdir() if (path / JOB_FILE).exists()]
+        return sorted(jobs, key=lambda job: job.meta.get('updated', 0), reverse=True)
+
+    def clear(self) -> int:
+        """Remove every job directory, returning the number removed"""
+        jobs = self.list()
+        for job in jobs:
+            shutil.rmtree(job.path, ignore_errors=True)
+        return len(jobs)
+
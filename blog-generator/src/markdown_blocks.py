@@ -0,0 +1,129 @@
+"""
+Markdown Extension for Blog Posts
+Block processors for the site's callouts, pull quotes and Trajectory sections
+"""
+
+import re
+import xml.etree.ElementTree as etree
+
+from markdown.blockprocessors import BlockProcessor
+from markdown.extensions import Extension
+
+
+CALLOUT_HEADER = re.compile(r'^> \*\*(.+?)\*\*\s*$')
+PULL_QUOTE = re.compile(r'^> \*"(.+?)"\*\s*$')
+TRAJECTORY_HEADING = re.compile(r'^##\s+Trajectory\s*#*\s*$', re.MULTILINE)
+SECTION_HEADING = re.compile(r'^#{1,2}\s')
+SECTION_HEADING_LINE = re.compile(r'^#{1,2}\s', re.MULTILINE)
+
+
+class CalloutProcessor(BlockProcessor):
+    """
+    Callout boxes - a blockquote opening with a bold header line:
+
+        > **Key Finding**
+        > Important insight here
+    """
+
+    def test(self, parent, block):
+        lines = block.split('\n')
+        return (
+            len(lines) > 1
+            and bool(CALLOUT_HEADER.match(lines[0]))
+            and lines[1].startswith('> ')
+        )
+
+    def run(self, parent, blocks):
+        lines = blocks.pop(0).split('\n')
+        header = CALLOUT_HEADER.match(lines[0]).group(1)
+
+        body_lines = []
+        rest = []
+        for i, line in enumerate(lines[1:], start=1):
+            if not line.startswith('>'):
+                rest = lines[i:]
+                break
+            body_lines.append(line[1:].strip())
+
+        div = etree.SubElement(parent, 'div')
+        div.set('class', 'callout')
+        h4 = etree.SubElement(div, 'h4')
+        h4.text = header
+        p = etree.SubElement(div, 'p')
+        p.text = ' '.join(line for line in body_lines if line)
+
+        if rest:
+            blocks.insert(0, '\n'.join(rest))
+
+
+class PullQuoteProcessor(BlockProcessor):
+    """
+    Pull quotes - a blockquote line holding an italic quotation:
+
+        > *"A particularly insightful statement"*
+    """
+
+    def test(self, parent, block):
+        return bool(PULL_QUOTE.match(block.split('\n', 1)[0]))
+
+    def run(self, parent, blocks):
+        lines = blocks.pop(0).split('\n', 1)
+        quote = PULL_QUOTE.match(lines[0]).group(1)
+
+        p = etree.SubElement(parent, 'p')
+        p.set('class', 'pull-quote')
+        p.text = f'"{quote}"'
+
+        if len(lines) > 1 and lines[1].strip():
+            blocks.insert(0, lines[1])
+
+
+class TrajectoryProcessor(BlockProcessor):
+    """
+    Trajectory sections - everything from a `## Trajectory` heading up to the
+    next H1/H2 is wrapped in the dark trajectory box
+    """
+
+    def test(self, parent, block):
+        return bool(TRAJECTORY_HEADING.search(block))
+
+    def run(self, parent, blocks):
+        block = blocks.pop(0)
+        match = TRAJECTORY_HEADING.search(block)
+
+        # The heading may follow other lines with no blank line between, as
+        # HashHeaderProcessor allows; those lines are parsed on their own first
+        before = block[:match.start()].rstrip('\n')
+        if before.strip():
+            self.parser.parseBlocks(parent, [before])
+        after = block[match.end():].lstrip('\n')
+        if after.strip():
+            blocks.insert(0, after)
+
+        body_blocks = []
+        while blocks and not SECTION_HEADING.match(blocks[0]):
+            block = blocks.pop(0)
+            # A heading with no blank line before it sits inside a block; split it off
+            heading = SECTION_HEADING_LINE.search(block)
+            if heading:
+                blocks.insert(0, block[heading.start():])
+                block = block[:heading.start()].rstrip('\n')
+            if block.strip():
+                body_blocks.append(block)
+            if heading:
+                break
+
+        div = etree.SubElement(parent, 'div')
+        div.set('class', 'trajectory')
+        h3 = etree.SubElement(div, 'h3')
+        h3.text = 'Trajectory'
+        self.parser.parseBlocks(div, body_blocks)
+
+
+class SiteBlocksExtension(Extension):
+    """Register the site's special blocks ahead of the stock blockquote/heading processors"""
+
+    def extendMarkdown(self, md):
+        md.parser.blockprocessors.register(TrajectoryProcessor(md.parser), 'trajectory', 75)
+        md.parser.blockprocessors.register(CalloutProcessor(md.parser), 'callout', 25)
+        md.parser.blockprocessors.register(PullQuoteProcessor(md.parser), 'pull_quote', 24)
@@ -0,0 +1,212 @@
+"""
+Mock Anthropic Client for Blog Post Generator
+Offline stand-in for the parts of the SDK the generator uses, for tests,
+benchmarks and dry runs (--dry-run)
+"""
+
+import hashlib
+import itertools
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+
+def _message_text(params: Dict) -> str:
+    """Flatten the last user message of a request into plain text"""
+    content = params['messages'][-1]['content']
+    if isinstance(content, list):
+        return '\n'.join(block.get('text', '') for block in content)
+    return content
+
+
+def _system_text(params: Dict) -> str:
+    system = params.get('system', '')
+    if isinstance(system, list):
+        return '\n'.join(block.get('text', '') for block in system)
+    return system
+
+
+def canned_response(params: Dict) -> str:
+    """Deterministic response text shaped like a real reply to this request"""
+    message = _message_text(params)
+
+    # Chunk summaries (map step) and refinements are free-form markdown
+    if 'TITLE:' not in _system_text(params) or '**Feedback:**' in message:
+        words = re.findall(r'[A-Za-z]{4,}', message)[:40]
+        return '\n'.join(f"- {' '.join(words[i:i + 8])}" for i in range(0, len(words), 8))
+
+    match = re.search(r'\*\*Suggested Title:\*\* (.+)', message)
+    title = match.group(1).strip() if match else 'Notes on the Source Material'
+    digest = hashlib.sha256(message.encode('utf-8')).hexdigest()[:8]
+    words = re.findall(r'[A-Za-z]{5,}', message)
+    tags = sorted(set(word.lower() for word in words[:30]))[:4] or ['notes']
+
+    paragraphs = [' '.join(words[i:i + 60]) for i in range(0, min(len(words), 600), 60)]
+    body = '\n\n'.join(paragraphs) or 'No content.'
+
+    return f"""TITLE: {title}
+CATEGORY: Research
+EXCERPT: An offline draft ({digest}) generated from the source material.
+TAGS: {', '.join(tags)}
+
+---
+
+## Overview
+
+{body}
+
+> **Key Finding**
+> This draft was produced by the offline mock client.
+
+## Trajectory
+
+Where this is heading next.
+"""
+
+
+def _prompt_blocks(params: Dict) -> List[Dict]:
+    """Every prompt content block in request order: system, then messages"""
+    blocks = []
+    for part in [params.get('system', '')] + [m['content'] for m in params['messages']]:
+        if isinstance(part, list):
+            blocks.extend(part)
+        elif part:
+            blocks.append({'text': part})
+    return blocks
+
+
+class _PromptCache:
+    """Prefixes up to a cache_control breakpoint, as the API would cache them"""
+
+    def __init__(self):
+        self.prefixes = set()
+
+    def usage(self, params: Dict, text: str) -> SimpleNamespace:
+        blocks = _prompt_blocks(params)
+        total = sum(len(block.get('text', '')) for block in blocks) // 4
+
+        # Reads match a cached prefix at any block boundary; writes happen
+        # only at breakpoints
+        read_chars = written_chars = 0
+        prefix = ''
+        for block in blocks:
+            prefix += block.get('text', '')
+            digest = hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+            if digest in self.prefixes:
+                read_chars = len(prefix)
+            elif 'cache_control' in block:
+                self.prefixes.add(digest)
+                written_chars = len(prefix)
+
+        read = read_chars // 4
+        written = max(0, written_chars - read_chars) // 4
+
+        return SimpleNamespace(
+            input_tokens=total - read - written,
+            output_tokens=len(text) // 4,
+            cache_creation_input_tokens=written,
+            cache_read_input_tokens=read
+        )
+
+
+def _message(params: Dict, text: str, prompt_cache: Optional[_PromptCache] = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(type='text', text=text)],
+        usage=(prompt_cache or _PromptCache()).usage(params, text),
+        stop_reason='end_turn',
+        model=params.get('model')
+    )
+
+
+class _MockStream:
+    """Context manager mirroring MessageStream.text_stream"""
+
+    def __init__(self, params: Dict, latency: float, prompt_cache: _PromptCache):
+        self.params = params
+        self.latency = latency
+        self.prompt_cache = prompt_cache
+        self.text = canned_response(params)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    @property
+    def text_stream(self) -> Iterator[str]:
+        for i in range(0, len(self.text), 24):
+            if self.latency:
+                time.sleep(self.latency / 50)
+            yield self.text[i:i + 24]
+
+    def get_final_message(self) -> SimpleNamespace:
+        return _message(self.params, self.text, self.prompt_cache)
+
+
+class _MockBatches:
+    """In-memory Message Batches: a batch ends after `polls_until_ended` retrieves"""
+
+    def __init__(self, polls_until_ended: int):
+        self.polls_until_ended = polls_until_ended
+        self._batches: Dict[str, Dict] = {}
+        self._ids = itertools.count(1)
+
+    def create(self, requests: List[Dict], **kwargs) -> SimpleNamespace:
+        batch_id = f'msgbatch_mock_{next(self._ids)}'
+        self._batches[batch_id] = {'requests': list(requests), 'polls': 0}
+        return self._status(batch_id)
+
+    def retrieve(self, batch_id: str, **kwargs) -> SimpleNamespace:
+        self._batches[batch_id]['polls'] += 1
+        return self._status(batch_id)
+
+    def results(self, batch_id: str, **kwargs) -> Iterator[SimpleNamespace]:
+        for request in self._batches[batch_id]['requests']:
+            params = request['params']
+            yield SimpleNamespace(
+                custom_id=request['custom_id'],
+                result=SimpleNamespace(
+                    type='succeeded',
+                    message=_message(params, canned_response(params))
+                )
+            )
+
+    def _status(self, batch_id: str) -> SimpleNamespace:
+        batch = self._batches[batch_id]
+        ended = batch['polls'] >= self.polls_until_ended
+        return SimpleNamespace(
+            id=batch_id,
+            processing_status='ended' if ended else 'in_progress',
+            request_counts=SimpleNamespace(
+                processing=0 if ended else len(batch['requests']),
+                succeeded=len(batch['requests']) if ended else 0,
+                errored=0, canceled=0, expired=0
+            )
+        )
+
+
+class _MockMessages:
+    def __init__(self, latency: float, polls_until_ended: int):
+        self.latency = latency
+        self.batches = _MockBatches(polls_until_ended)
+        self.prompt_cache = _PromptCache()
+        self.calls: List[Dict] = []
+
+    def create(self, **params) -> SimpleNamespace:
+        self.calls.append(params)
+        if self.latency:
+            time.sleep(self.latency)
+        return _message(params, canned_response(params), self.prompt_cache)
+
+    def stream(self, **params) -> _MockStream:
+        self.calls.append(params)
+        return _MockStream(params, self.latency, self.prompt_cache)
+
+
+class MockAnthropic:
+    """Drop-in for anthropic.Anthropic covering messages.create/stream/batches"""
+
+    def __init__(self, latency: float = 0.0, polls_until_ended: int = 1, api_key: Optional[str] = None):
+        self.messages = _MockMessages(latency, polls_until_ended)
@@ -0,0 +1,248 @@
+"""
+Post Index for Blog Post Generator
+Frontmatter of every post markdown file, parsed once and cached, driving the
+writing.html listing and each post's prev/next links
+"""
+
+import html
+import json
+import os
+from datetime import date as date_type, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from html_generator import HTMLGenerator
+
+
+INDEX_NAME = '.post-index.json'
+INDEX_VERSION = 2
+
+# The listing page is only rewritten between these markers
+LISTING_START = '<!-- blog-generator:index:start -->'
+LISTING_END = '<!-- blog-generator:index:end -->'
+
+
+class PostIndex:
+    """Metadata of the posts under source_dir, re-parsing only files that changed"""
+
+    def __init__(
+        self,
+        config: Dict,
+        source_dir: str = '.',
+        output_dir: Optional[str] = None,
+        pattern: str = '*.md'
+    ):
+        self.config = config
+        self.source_dir = Path(source_dir)
+        self.output_dir = Path(output_dir) if output_dir else self.source_dir
+        self.pattern = pattern
+        self.reading_speed = config.get('defaults', {}).get('reading_speed', 200)
+        search = config.get('search', {})
+        self.search_dir = self.output_dir / search.get('dir', 'search') if search.get('enabled', True) else None
+        self.index_path = self.output_dir / INDEX_NAME
+        self.posts: Optional[Dict[str, Dict]] = None
+        # {source: error} for posts the last refresh() couldn't read
+        self.failed: Dict[str, str] = {}
+
+    def find_posts(self) -> List[Path]:
+        """Markdown files under source_dir that carry post frontmatter"""
+        posts = []
+        for path in sorted(self.source_dir.glob(self.pattern)):
+            if not path.is_file():
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                head = f.read(512)
+            if head.startswith('---') and '\ntitle:' in head:
+                posts.append(path)
+        return posts
+
+    def refresh(self) -> Dict[str, Dict]:
+        """
+        Bring the index up to date with the files on disk
+
+        Posts whose size and mtime match the cached entry aren't re-read.
+        A post that can't be read is left out and recorded in self.failed,
+        so one bad file doesn't stop the others being indexed.
+
+        Returns:
+            {source: {
+                'title': str,
+                'category': str,
+                'excerpt': str,
+                'tags': list,
+                'date': str,  # YYYY-MM-DD, '' if the post has none
+                'words': int,
+                'output': str,  # Rendered HTML path
+                'mtime_ns': int,
+                'size': int,
+            }}
+        """
+        cached = self.posts if self.posts is not None else self._load()
+        html_gen = None
+
+        posts = {}
+        failed = {}
+        for path in self.find_posts():
+            key = str(path)
+            stat = path.stat()
+            entry = cached.get(key)
+            if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                html_gen = html_gen or HTMLGenerator(self.config)
+                try:
+                    entry = self._read_post(html_gen, path, stat)
+                except Exception as e:
+                    failed[key] = str(e)
+                    continue
+            posts[key] = entry
+
+        if posts != cached:
+            self._save(posts)
+        self.posts = posts
+        self.failed = failed
+        return posts
+
+    def ordered(self) -> List[Tuple[str, Dict]]:
+        """(source, entry) pairs oldest first; undated posts render with today's date, so they sort as today"""
+        posts = self.posts if self.posts is not None else self.refresh()
+        today = date_type.today()
+
+        def published(entry: Dict) -> date_type:
+            return datetime.strptime(entry['date'], '%Y-%m-%d').date() if entry['date'] else today
+
+        return sorted(posts.items(), key=lambda item: (published(item[1]), item[1]['title'], item[0]))
+
+    def navigation(self) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+        """Each post's (previous, next) links in date order, relative to the output dir"""
+        ordered = self.ordered()
+        links = [Path(entry['output']).name for _, entry in ordered]
+
+        navigation = {}
+        for i, (source, _) in enumerate(ordered):
+            navigation[source] = (
+                links[i - 1] if i > 0 else None,
+                links[i + 1] if i + 1 < len(ordered) else None
+            )
+        return navigation
+
+    def render_listing(self, listing_dir: Path) -> str:
+        """Listing cards grouped by category, newest category and post first"""
+        sections: Dict[str, List[Dict]] = {}
+        for _, entry in reversed(self.ordered()):
+            sections.setdefault(entry['category'], []).append(entry)
+
+        blocks = []
+        for category, entries in sections.items():
+            cards = '\n\n'.join(self._render_card(entry, listing_dir) for entry in entries)
+            blocks.append(
+                f'    <h2>{html.escape(category)}</h2>\n'
+                f'    <div class="article-list">\n{cards}\n    </div>'
+            )
+        return '\n\n'.join(blocks)
+
+    def render_search(self, listing_dir: Path) -> str:
+        """Search box for the listing page, backed by SearchIndex; empty if search is off"""
+        if not self.search_dir:
+            return ''
+
+        search_dir = html.escape(Path(os.path.relpath(self.search_dir, listing_dir)).as_posix())
+        return f"""    <div class="site-search" style="margin:0 0 32px">
+      <input type="search" placeholder="Search all writing" aria-label="Search the site"
+        data-blog-search="{search_dir}/manifest.json"
+        style="width:100%;box-sizing:border-box;padding:10px 14px;font:inherit;border:1px solid var(--border-color, #e5e7eb);border-radius:8px;background:transparent;color:inherit">
+    </div>
+    <script src="{search_dir}/search.js" defer></script>
+
+"""
+
+    def update_listing(self, listing_path: str) -> bool:
+        """
+        Regenerate the cards between the index markers of a listing page
+
+        A page without markers gets them inserted before its <footer>.
+        Returns True if the page changed.
+        """
+        listing_path = Path(listing_path)
+        with open(listing_path, 'r', encoding='utf-8') as f:
+            page = f.read()
+
+        block = (
+            f'{LISTING_START}\n{self.render_search(listing_path.parent)}'
+            f'{self.render_listing(listing_path.parent)}\n    {LISTING_END}'
+        )
+
+        start = page.find(LISTING_START)
+        end = page.find(LISTING_END)
+        if start >= 0 and end > start:
+            updated = page[:start] + block + page[end + len(LISTING_END):]
+        else:
+            footer = page.find('<footer')
+            if footer < 0:
+                raise Exception(
+                    f"{listing_path} has no <footer> or {LISTING_START} / {LISTING_END} markers to place the index"
+                )
+            line_start = page.rfind('\n', 0, footer) + 1
+            updated = page[:line_start] + '    ' + block + '\n\n' + page[line_start:]
+
+        if updated == page:
+            return False
+
+        tmp_path = listing_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(updated)
+        os.replace(tmp_path, listing_path)
+        return True
+
+    def _render_card(self, entry: Dict, listing_dir: Path) -> str:
+        href = os.path.relpath(entry['output'], listing_dir)
+        meta = []
+        if entry['date']:
+            try:
+                meta.append(datetime.strptime(entry['date'], '%Y-%m-%d').strftime('%b %Y'))
+            except ValueError:
+                # Frontmatter dates like "October 3, 2025" are shown as written
+                meta.append(html.escape(str(entry['date'])))
+        meta.append(f"{max(1, round(entry['words'] / self.reading_speed))} min read")
+
+        return f"""      <a href="{html.escape(href)}" class="article-card">
+        <div class="article-meta">
+{chr(10).join(f'          <span>{item}</span>' for item in meta)}
+        </div>
+        <h3>{html.escape(entry['title'])}</h3>
+        <p>
+          {html.escape(entry['excerpt'])}
+        </p>
+      </a>"""
+
+    def _read_post(self, html_gen: HTMLGenerator, path: Path, stat: os.stat_result) -> Dict:
+        frontmatter, markdown_content = html_gen.load_markdown(str(path))
+
+        tags = frontmatter.get('tags') or []
+        if isinstance(tags, str):
+            tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+
+        return {
+            'title': str(frontmatter.get('title', 'Untitled')),
+            'category': str(frontmatter.get('category', 'Research')),
+            'excerpt': str(frontmatter.get('excerpt', '')),
+            'tags': tags,
+            'date': str(frontmatter.get('date') or ''),
+            'words': len(markdown_content.split()),
+            'output': str(self.output_dir / path.with_suffix('.html').name),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+        }
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get('posts', {}) if data.get('version') == INDEX_VERSION else {}
+
+    def _save(self, posts: Dict[str, Dict]):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'posts': posts}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
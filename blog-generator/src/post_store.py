@@ -0,0 +1,277 @@
+"""
+Post Store for Blog Post Generator
+SQLite record of every generated post: metadata, tags, source and generation cost
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from fingerprint import BANDS, MAX_DISTANCE, bands, hamming
+
+
+class PostStore:
+    """Posts keyed by output path, with indexed lookups by tag, category, date and source"""
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path).expanduser()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id INTEGER PRIMARY KEY,
+                    output TEXT NOT NULL UNIQUE,
+                    slug TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    category TEXT,
+                    excerpt TEXT,
+                    date TEXT,
+                    word_count INTEGER NOT NULL,
+                    reading_time INTEGER NOT NULL,
+                    source TEXT,
+                    source_type TEXT,
+                    source_hash TEXT,
+                    model TEXT,
+                    api_calls INTEGER,
+                    input_tokens INTEGER,
+                    cache_write_tokens INTEGER,
+                    cache_read_tokens INTEGER,
+                    output_tokens INTEGER,
+                    seconds REAL,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS post_tags (
+                    tag TEXT NOT NULL COLLATE NOCASE,
+                    post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                    PRIMARY KEY (tag, post_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS source_fingerprints (
+                    post_id INTEGER PRIMARY KEY REFERENCES posts(id) ON DELETE CASCADE,
+                    fingerprint TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS fingerprint_bands (
+                    band INTEGER NOT NULL,
+                    value INTEGER NOT NULL,
+                    post_id INTEGER NOT NULL REFERENCES posts(id) ON DELETE CASCADE,
+                    PRIMARY KEY (band, value, post_id)
+                ) WITHOUT ROWID
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_post_tags_post ON post_tags(post_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_fingerprint_bands_post ON fingerprint_bands(post_id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_date ON posts(date)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_category_date ON posts(category, date)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_source_hash ON posts(source_hash)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_source ON posts(source)')
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'PostStore':
+        """Open the store under the `cache:` dir of config.yaml"""
+        cache_dir = Path(config.get('cache', {}).get('dir', '~/.cache/blog-generator')).expanduser()
+        return cls(cache_dir / 'posts.sqlite3')
+
+    def record(
+        self,
+        blog_post: Dict,
+        output: str,
+        date: str,
+        slug: str,
+        reading_speed: int = 200,
+        source: Optional[str] = None,
+        source_type: Optional[str] = None,
+        source_hash: Optional[str] = None,
+        model: Optional[str] = None,
+        usage: Optional[Dict] = None,
+        seconds: Optional[float] = None,
+        fingerprint: Optional[str] = None
+    ) -> int:
+        """
+        Insert or update the post written to output, returning its id
+
+        Args:
+            blog_post: Parsed post (title, content, excerpt, category, tags)
+            output: HTML path; regenerating to the same path updates the row
+            date: Publication date (YYYY-MM-DD)
+            slug: URL slug
+            reading_speed: Words per minute for the reading time
+            source: Input path or URL the post was generated from
+            source_type: InputProcessor source type
+            source_hash: Content hash of a local source
+            model: Model that wrote the post
+            usage: AIGenerator.usage_stats() totals for the post, if known
+            seconds: Wall-clock generation time, if known
+            fingerprint: SimHash of the extracted source, for near_duplicates()
+        """
+        word_count = len(blog_post['content'].split())
+        usage = usage or {}
+        now = time.time()
+        output = str(Path(output).resolve())
+
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO posts (
+                    output, slug, title, category, excerpt, date, word_count, reading_time,
+                    source, source_type, source_hash, model, api_calls, input_tokens,
+                    cache_write_tokens, cache_read_tokens, output_tokens, seconds, created, updated
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(output) DO UPDATE SET
+                    slug = excluded.slug, title = excluded.title, category = excluded.category,
+                    excerpt = excluded.excerpt, date = excluded.date, word_count = excluded.word_count,
+                    reading_time = excluded.reading_time, source = excluded.source,
+                    source_type = excluded.source_type, source_hash = excluded.source_hash,
+                    model = excluded.model, api_calls = excluded.api_calls,
+                    input_tokens = excluded.input_tokens, cache_write_tokens = excluded.cache_write_tokens,
+                    cache_read_tokens = excluded.cache_read_tokens, output_tokens = excluded.output_tokens,
+                    seconds = excluded.seconds, updated = excluded.updated
+            """, (
+                output, slug, blog_post['title'], blog_post.get('category'), blog_post.get('excerpt'),
+                date, word_count, max(1, round(word_count / reading_speed)),
+                source, source_type, source_hash, model, usage.get('calls'), usage.get('input_tokens'),
+                usage.get('cache_write_tokens'), usage.get('cache_read_tokens'), usage.get('output_tokens'),
+                seconds, now, now
+            ))
+            post_id = conn.execute('SELECT id FROM posts WHERE output = ?', (output,)).fetchone()[0]
+
+            conn.execute('DELETE FROM post_tags WHERE post_id = ?', (post_id,))
+            conn.executemany(
+                'INSERT OR IGNORE INTO post_tags (tag, post_id) VALUES (?, ?)',
+                [(tag.strip(), post_id) for tag in blog_post.get('tags', []) if tag.strip()]
+            )
+
+            conn.execute('DELETE FROM source_fingerprints WHERE post_id = ?', (post_id,))
+            conn.execute('DELETE FROM fingerprint_bands WHERE post_id = ?', (post_id,))
+            if fingerprint:
+                conn.execute(
+                    'INSERT INTO source_fingerprints (post_id, fingerprint) VALUES (?, ?)',
+                    (post_id, fingerprint)
+                )
+                conn.executemany(
+                    'INSERT INTO fingerprint_bands (band, value, post_id) VALUES (?, ?, ?)',
+                    [(band, value, post_id) for band, value in enumerate(bands(fingerprint))]
+                )
+        return post_id
+
+    def get(self, output: str) -> Optional[Dict]:
+        """The post written to output, or None"""
+        posts = self._select('WHERE p.output = ?', (str(Path(output).resolve()),))
+        return posts[0] if posts else None
+
+    def find(
+        self,
+        tag: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """Posts matching every given filter, newest first (dates are YYYY-MM-DD, inclusive)"""
+        clauses = []
+        args: List = []
+        if tag:
+            clauses.append('p.id IN (SELECT post_id FROM post_tags WHERE tag = ?)')
+            args.append(tag)
+        if category:
+            clauses.append('p.category = ?')
+            args.append(category)
+        if since:
+            clauses.append('p.date >= ?')
+            args.append(since)
+        if until:
+            clauses.append('p.date <= ?')
+            args.append(until)
+
+        sql = ('WHERE ' + ' AND '.join(clauses) if clauses else '') + ' ORDER BY p.date DESC, p.id DESC'
+        if limit:
+            sql += ' LIMIT ?'
+            args.append(limit)
+        return self._select(sql, tuple(args))
+
+    def by_source(self, source: str, source_hash: Optional[str] = None) -> List[Dict]:
+        """Posts generated from this source (matched by content hash when given, else by path/URL)"""
+        if source_hash:
+            return self._select('WHERE p.source_hash = ? ORDER BY p.date DESC', (source_hash,))
+        return self._select('WHERE p.source = ? ORDER BY p.date DESC', (source,))
+
+    def near_duplicates(self, fingerprint: str, max_distance: int = MAX_DISTANCE) -> List[Dict]:
+        """
+        Posts whose source fingerprint is within max_distance bits, closest first
+
+        Only posts sharing one of the fingerprint's bands are compared, found
+        through the band index; max_distance is capped at MAX_DISTANCE, the
+        largest distance the bands are guaranteed to catch.
+        """
+        max_distance = min(max_distance, MAX_DISTANCE)
+        band_values = bands(fingerprint)
+        with self._connect() as conn:
+            candidates = conn.execute(
+                'SELECT DISTINCT f.post_id, f.fingerprint FROM fingerprint_bands b '
+                'JOIN source_fingerprints f ON f.post_id = b.post_id WHERE '
+                + ' OR '.join(['(b.band = ? AND b.value = ?)'] * BANDS),
+                [arg for band, value in enumerate(band_values) for arg in (band, value)]
+            ).fetchall()
+
+        distances = {}
+        for post_id, other in candidates:
+            distance = hamming(fingerprint, other)
+            if distance <= max_distance:
+                distances[post_id] = distance
+        if not distances:
+            return []
+
+        posts = self._select(
+            f"WHERE p.id IN ({', '.join('?' * len(distances))})", tuple(distances)
+        )
+        for post in posts:
+            post['distance'] = distances[post['id']]
+        return sorted(posts, key=lambda post: (post['distance'], -post['updated']))
+
+    def tags(self) -> List[Tuple[str, int]]:
+        """(tag, post count) pairs, most used first"""
+        with self._connect() as conn:
+            return conn.execute(
+                'SELECT tag, COUNT(*) AS n FROM post_tags GROUP BY tag ORDER BY n DESC, tag'
+            ).fetchall()
+
+    def count(self) -> int:
+        """Number of recorded posts"""
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM posts').fetchone()[0]
+
+    def _select(self, where: str, args: tuple) -> List[Dict]:
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"""
+                SELECT p.*, (
+                    SELECT group_concat(tag, ', ') FROM post_tags t WHERE t.post_id = p.id
+                ) AS tag_list
+                FROM posts p {where}
+            """, args).fetchall()
+
+        posts = []
+        for row in rows:
+            post = dict(row)
+            tag_list = post.pop('tag_list')
+            post['tags'] = tag_list.split(', ') if tag_list else []
+            posts.append(post)
+        return posts
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation keeps the store safe to share across threads
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute('PRAGMA foreign_keys = ON')
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
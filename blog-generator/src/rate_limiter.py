@@ -0,0 +1,220 @@
+"""
+Rate Limiter for Blog Post Generator
+Shared request/token budgets, retries and adaptive concurrency for Claude calls
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+
+# Statuses worth retrying: rate limited (429), overloaded (529) and transient
+# server/conflict errors
+RETRYABLE_STATUSES = {408, 409, 429, 500, 502, 503, 504, 529}
+THROTTLE_STATUSES = {429, 529}
+RETRYABLE_ERRORS = {'APIConnectionError', 'APITimeoutError'}
+
+# One limiter per process and settings, so every AIGenerator and worker
+# thread draws from the same account budget
+_limiters: Dict[tuple, 'RateLimiter'] = {}
+_limiters_lock = threading.Lock()
+
+
+class TokenBucket:
+    """Continuously refilling budget of `capacity` units per minute"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0):
+        """Block until `amount` units are available, then take them"""
+        # A request larger than the whole bucket would never fit - let it
+        # drain the bucket instead of waiting forever
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def adjust(self, amount: float):
+        """Charge (or refund, if negative) units after the fact"""
+        with self.lock:
+            self._refill()
+            self.tokens = max(-self.capacity, min(self.capacity, self.tokens - amount))
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD cap on in-flight calls
+
+    The limit grows by one after a full window of successful calls and halves
+    when the API pushes back, settling just under what the account allows.
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.limit = max(minimum, min(initial, self.maximum))
+        self.active = 0
+        self.successes = 0
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self) -> float:
+        """Wait for a free slot; returns the start time to pass to release()"""
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+            return time.monotonic()
+
+    def release(self, started: float, throttled: bool = False):
+        with self.condition:
+            self.active -= 1
+            if throttled:
+                # Calls already in flight when the limit was cut fail together;
+                # count them as one congestion event
+                if started >= self.last_decrease:
+                    self.limit = max(self.minimum, self.limit // 2)
+                    self.last_decrease = time.monotonic()
+                self.successes = 0
+            else:
+                self.successes += 1
+                if self.successes >= self.limit:
+                    self.limit = min(self.maximum, self.limit + 1)
+                    self.successes = 0
+            self.condition.notify_all()
+
+
+class RateLimiter:
+    """Gate API calls on request/token budgets and retry throttled calls"""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        initial_concurrency: int = 3,
+        max_concurrency: int = 8,
+        max_retries: int = 5,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 60.0
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(initial_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self.lock = threading.Lock()
+        self.retries = 0
+        self.throttled = 0
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'RateLimiter':
+        """Return the process-wide limiter for the `rate_limit:` section of config.yaml"""
+        limits = config.get('rate_limit', {})
+        settings = (
+            limits.get('requests_per_minute', 50),
+            limits.get('tokens_per_minute', 30000),
+            config.get('batch', {}).get('api_concurrency', 3),
+            limits.get('max_concurrency', 8),
+            limits.get('max_retries', 5),
+            limits.get('backoff_seconds', 1.0),
+            limits.get('max_backoff_seconds', 60.0),
+        )
+        with _limiters_lock:
+            limiter = _limiters.get(settings)
+            if limiter is None:
+                limiter = _limiters[settings] = cls(*settings)
+            return limiter
+
+    def call(self, fn: Callable, estimated_tokens: int = 0, usage_tokens: Optional[Callable] = None):
+        """
+        Run fn() within the budgets, retrying retryable API errors
+
+        estimated_tokens is charged up front; if usage_tokens is given it maps
+        fn's result to the tokens actually billed, and the difference is
+        settled with the token bucket.
+        """
+        attempt = 0
+        while True:
+            if self.requests:
+                self.requests.acquire()
+            if self.tokens and estimated_tokens:
+                self.tokens.acquire(estimated_tokens)
+
+            started = self.concurrency.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                status = getattr(e, 'status_code', None)
+                throttled = status in THROTTLE_STATUSES
+                self.concurrency.release(started, throttled=throttled)
+
+                if not self._retryable(e) or attempt >= self.max_retries:
+                    if attempt:
+                        raise Exception(f"API still failing after {attempt + 1} attempts: {str(e)}")
+                    raise
+
+                attempt += 1
+                with self.lock:
+                    self.retries += 1
+                    self.throttled += throttled
+                time.sleep(self._delay(e, attempt))
+                continue
+
+            self.concurrency.release(started)
+            if self.tokens and usage_tokens:
+                self.tokens.adjust(usage_tokens(result) - estimated_tokens)
+            return result
+
+    def stats(self) -> Dict:
+        """
+        Counters since the limiter was created
+
+        Returns:
+            {
+                'retries': int,  # Calls retried after a retryable error
+                'throttled': int,  # 429/529 responses
+                'concurrency': int,  # Current adaptive concurrency limit
+            }
+        """
+        return {
+            'retries': self.retries,
+            'throttled': self.throttled,
+            'concurrency': self.concurrency.limit,
+        }
+
+    def _retryable(self, error: Exception) -> bool:
+        if getattr(error, 'status_code', None) in RETRYABLE_STATUSES:
+            return True
+        return type(error).__name__ in RETRYABLE_ERRORS
+
+    def _delay(self, error: Exception, attempt: int) -> float:
+        """Seconds to wait before a retry: retry-after if the API sent one, else jittered backoff"""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        retry_after = headers.get('retry-after')
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff_seconds)
+            except ValueError:
+                pass
+
+        backoff = min(self.backoff_seconds * 2 ** (attempt - 1), self.max_backoff_seconds)
+        return backoff * random.uniform(0.5, 1.0)
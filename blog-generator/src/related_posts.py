@@ -0,0 +1,238 @@
+"""
+Related Posts for Blog Post Generator
+TF-IDF similarity over post bodies and tags, updated incrementally as posts
+are added and cached next to the site
+"""
+
+import json
+import os
+import re
+import secrets
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from html_generator import HTMLGenerator
+
+
+INDEX_NAME = '.related-index'
+INDEX_VERSION = 1
+
+_WORD = re.compile(r"[a-z][a-z'-]+[a-z]")
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+me more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom
+why will with would you your yours yourself yourselves one two new like well way even much many
+make makes made get gets use used using via within without
+""".split())
+
+
+def tokenize(text: str) -> Counter:
+    """Term counts of lowercased words, minus stopwords"""
+    return Counter(word for word in _WORD.findall(text.lower()) if word not in STOPWORDS)
+
+
+class RelatedIndex:
+    """
+    Per-post term counts and top related posts, persisted between builds
+
+    Adding or editing a post tokenizes only that post and scores it against
+    the rest in one vectorized pass; other posts' lists are updated with its
+    scores instead of being recomputed. Every list is recomputed once the
+    corpus has grown by rebuild_growth since the last full pass, so IDF
+    weights don't drift far.
+    """
+
+    def __init__(self, config: Dict, output_dir: str):
+        related = config.get('related', {})
+        self.config = config
+        self.count = related.get('count', 3)
+        self.min_score = related.get('min_score', 0.1)
+        self.tag_weight = related.get('tag_weight', 3)
+        self.rebuild_growth = related.get('rebuild_growth', 0.2)
+        self.path = Path(output_dir) / INDEX_NAME
+
+        self.vocab: Dict[str, int] = {}
+        self.docs: Dict[str, Dict] = {}  # source -> stamp, terms, counts, related
+        self.built_size = 0  # Posts at the last full pass
+        self._load()
+
+    def update(self, posts: Dict[str, Dict]) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Bring the index in line with PostIndex.refresh() entries
+
+        Returns each post's related posts as (source, score), best first.
+        """
+        removed = [key for key in self.docs if key not in posts]
+        changed = [
+            key for key, entry in posts.items()
+            if key not in self.docs or self.docs[key]['stamp'] != [entry['mtime_ns'], entry['size']]
+        ]
+        if not removed and not changed:
+            return self.related()
+
+        # Posts that listed a removed or edited post need a fresh list; its
+        # score may have dropped below their next-best candidate
+        touched = set(removed) | set(changed)
+        dirty = set(changed) | {
+            key for key, doc in self.docs.items()
+            if key not in touched and any(other in touched for other, _ in doc['related'])
+        }
+
+        for key in removed:
+            del self.docs[key]
+
+        html_gen = HTMLGenerator(self.config)
+        for key in changed:
+            _, markdown_content = html_gen.load_markdown(key)
+            counts = tokenize(markdown_content)
+            for tag in posts[key]['tags']:
+                counts[f'tag:{tag.lower()}'] += self.tag_weight
+            self.docs[key] = {
+                'stamp': [posts[key]['mtime_ns'], posts[key]['size']],
+                'terms': np.array([self._term_id(term) for term in counts], dtype=np.int32),
+                'counts': np.array(list(counts.values()), dtype=np.float32),
+                'related': [],
+            }
+
+        full = bool(removed) or len(self.docs) > self.built_size * (1 + self.rebuild_growth)
+        if full:
+            dirty = set(self.docs)
+            self.built_size = len(self.docs)
+
+        keys, matrix = self._matrix()
+        positions = {key: i for i, key in enumerate(keys)}
+        for key in dirty:
+            scores = self._scores(positions[key], *matrix)
+            self.docs[key]['related'] = self._top(keys, scores)
+
+        # Fold each new row's scores into the other posts' lists
+        if not full:
+            for key in changed:
+                scores = self._scores(positions[key], *matrix)
+                for other, score in zip(keys, scores.tolist()):
+                    if other in dirty or score < self.min_score:
+                        continue
+                    related = self.docs[other]['related'] + [[key, round(score, 4)]]
+                    related.sort(key=lambda item: -item[1])
+                    self.docs[other]['related'] = related[:self.count]
+
+        self._save(keys)
+        return self.related()
+
+    def related(self) -> Dict[str, List[Tuple[str, float]]]:
+        return {key: [(other, score) for other, score in doc['related']] for key, doc in self.docs.items()}
+
+    def _term_id(self, term: str) -> int:
+        if term not in self.vocab:
+            self.vocab[term] = len(self.vocab)
+        return self.vocab[term]
+
+    def _matrix(self) -> Tuple[List[str], Tuple[np.ndarray, ...]]:
+        """
+        Every post as an L2-normalized TF-IDF row
+
+        Returns (keys, (indptr, indices, weights, row_of)): CSR arrays plus
+        each stored value's row number.
+        """
+        keys = list(self.docs)
+        lengths = np.array([len(self.docs[key]['terms']) for key in keys], dtype=np.int64)
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+        indices = np.concatenate([self.docs[key]['terms'] for key in keys] or [np.zeros(0, np.int32)])
+        counts = np.concatenate([self.docs[key]['counts'] for key in keys] or [np.zeros(0, np.float32)])
+
+        df = np.bincount(indices, minlength=len(self.vocab))
+        idf = np.log((1 + len(keys)) / (1 + df)) + 1
+        weights = (1 + np.log(counts)) * idf[indices]
+
+        # Row norms; empty rows are left at zero
+        row_of = np.repeat(np.arange(len(keys)), lengths)
+        norms = np.sqrt(np.bincount(row_of, weights=weights * weights, minlength=len(keys)))
+        weights = weights / np.where(norms > 0, norms, 1)[row_of]
+        return keys, (indptr, indices, weights.astype(np.float32), row_of)
+
+    def _scores(
+        self,
+        row: int,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray,
+        row_of: np.ndarray
+    ) -> np.ndarray:
+        """Cosine similarity of one row against every row; the row itself scores -1"""
+        dense = np.zeros(len(self.vocab), dtype=np.float32)
+        dense[indices[indptr[row]:indptr[row + 1]]] = weights[indptr[row]:indptr[row + 1]]
+
+        scores = np.bincount(row_of, weights=dense[indices] * weights, minlength=len(indptr) - 1)
+        scores[row] = -1
+        return scores
+
+    def _top(self, keys: List[str], scores: np.ndarray) -> List[List]:
+        count = min(self.count, len(keys))
+        if count == 0:
+            return []
+        best = np.argpartition(-scores, count - 1)[:count]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [[keys[i], round(float(scores[i]), 4)] for i in best if scores[i] >= self.min_score]
+
+    def _load(self):
+        try:
+            with open(self.path.with_suffix('.json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with np.load(self.path.with_suffix('.npz')) as arrays:
+                arrays = {name: arrays[name] for name in ('token', 'offsets', 'terms', 'counts')}
+        except (FileNotFoundError, KeyError, json.JSONDecodeError, ValueError, OSError):
+            return
+        if (meta.get('version') != INDEX_VERSION or meta.get('settings') != self._settings()
+                or str(arrays['token']) != meta.get('token')):
+            return
+
+        self.vocab = {term: i for i, term in enumerate(meta['vocab'])}
+        self.built_size = meta['built_size']
+        offsets, terms, counts = arrays['offsets'], arrays['terms'], arrays['counts']
+        for i, (key, doc) in enumerate(meta['docs'].items()):
+            self.docs[key] = {
+                'stamp': doc['stamp'],
+                'terms': terms[offsets[i]:offsets[i + 1]],
+                'counts': counts[offsets[i]:offsets[i + 1]],
+                'related': doc['related'],
+            }
+
+    def _save(self, keys: List[str]):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        offsets = np.concatenate([[0], np.cumsum([len(self.docs[key]['terms']) for key in keys])])
+        token = secrets.token_hex(8)
+
+        # Both files carry the same token; a pair from different saves is ignored
+        tmp_path = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                terms=np.concatenate([self.docs[key]['terms'] for key in keys] or [np.zeros(0, np.int32)]),
+                counts=np.concatenate([self.docs[key]['counts'] for key in keys] or [np.zeros(0, np.float32)]),
+                offsets=offsets,
+                token=np.array(token),
+            )
+        os.replace(tmp_path, self.path.with_suffix('.npz'))
+
+        meta = {
+            'version': INDEX_VERSION,
+            'token': token,
+            'settings': self._settings(),
+            'built_size': self.built_size,
+            'vocab': sorted(self.vocab, key=self.vocab.get),
+            'docs': {key: {'stamp': self.docs[key]['stamp'], 'related': self.docs[key]['related']} for key in keys},
+        }
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.path.with_suffix('.json'))
+
+    def _settings(self) -> Dict:
+        return {'count': self.count, 'min_score': self.min_score, 'tag_weight': self.tag_weight}
@@ -0,0 +1,107 @@
+"""
+Response Cache for Blog Post Generator
+Persistent SQLite cache of Claude responses keyed by request hash
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Hash-keyed response cache with TTL and max-entry eviction"""
+
+    def __init__(self, db_path: str, ttl_seconds: float, max_entries: int):
+        self.db_path = Path(db_path).expanduser()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed)')
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'ResponseCache':
+        """Build the cache from the `cache:` section of config.yaml"""
+        cache_config = config.get('cache', {})
+        cache_dir = Path(cache_config.get('dir', '~/.cache/blog-generator')).expanduser()
+        ttl_days = cache_config.get('responses_ttl_days', 30)
+        max_entries = cache_config.get('responses_max_entries', 1000)
+        return cls(cache_dir / 'responses.sqlite3', ttl_days * 86400, max_entries)
+
+    def key(self, request: Dict) -> str:
+        """Hash a request (model, temperature, system prompt, messages, ...)"""
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss or expired entry"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT response FROM responses WHERE key = ? AND created > ?',
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row:
+                conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (now, key))
+
+        with self._lock:
+            if row:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return row[0] if row else None
+
+    def put(self, key: str, response: str):
+        """Store a response, then drop expired and least-recently-used entries"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)',
+                (key, response, now, now)
+            )
+            conn.execute('DELETE FROM responses WHERE created <= ?', (now - self.ttl_seconds,))
+            conn.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+
+    def clear(self) -> int:
+        """Remove every cached response, returning the number removed"""
+        with self._connect() as conn:
+            return conn.execute('DELETE FROM responses').rowcount
+
+    def count(self) -> int:
+        """Number of cached responses"""
+        with self._connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @contextmanager
+    def _connect(self):
+        # A connection per operation keeps the cache safe to share across threads
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,306 @@
+"""
+Search Index for Blog Post Generator
+Static inverted index of every HTML page on the site, split into gzipped
+shards by term prefix so the browser only downloads the shards a query needs
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from related_posts import STOPWORDS
+
+
+INDEX_NAME = '.search-index.json'
+INDEX_VERSION = 2
+FORMAT_VERSION = 2
+
+ASSET_DIR = Path(__file__).parent / 'assets'
+
+# Must agree with tokenize() in assets/search.js
+_WORD = re.compile(r'[^\W_]+')
+
+# Occurrences a title word or tag counts for, relative to one in the body
+TITLE_WEIGHT = 5
+TAG_WEIGHT = 3
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words of two or more characters, minus stopwords"""
+    return [word for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+
+
+class PageText(HTMLParser):
+    """
+    Title, description and body text of an HTML page
+
+    Body text is taken from <article> elements, else <main>, when they hold
+    most of the page's text, and from the whole <body> otherwise.
+    Navigation, asides, footers and scripts are left out either way.
+    """
+
+    SKIP = {'script', 'style', 'noscript', 'svg', 'template', 'nav', 'aside', 'footer', 'form'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ''
+        self.description = ''
+        self.text: Dict[str, List[str]] = {'article': [], 'main': [], 'body': []}
+        self.open: Dict[str, int] = {'title': 0, 'article': 0, 'main': 0, 'body': 0}
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            attrs = dict(attrs)
+            if attrs.get('name') == 'description':
+                self.description = attrs.get('content') or ''
+        # Only skipped and section tags are counted, so unclosed <p> or <li> don't matter
+        if tag in self.SKIP:
+            self.skip += 1
+        elif tag in self.open:
+            self.open[tag] += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP:
+            self.skip = max(0, self.skip - 1)
+        elif tag in self.open and self.open[tag]:
+            self.open[tag] -= 1
+
+    def handle_data(self, data):
+        if self.open['title']:
+            self.title += data
+        if self.skip:
+            return
+        for section in ('article', 'main', 'body'):
+            if self.open[section]:
+                self.text[section].append(data)
+
+    def body(self) -> str:
+        body = ' '.join(self.text['body'])
+        for section in ('article', 'main'):
+            # Some pages only wrap their header in <article>; that isn't the content
+            text = ' '.join(self.text[section])
+            if len(text) * 2 >= len(body):
+                return text
+        return body
+
+
+def read_page(path: Path) -> Dict:
+    """{'title', 'excerpt', 'text'} of an HTML page; ' | Site name' is dropped from the title"""
+    parser = PageText()
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        parser.feed(f.read())
+    parser.close()
+    return {
+        'title': ' '.join(parser.title.split(' | ')[0].split()) or path.stem,
+        'excerpt': ' '.join(parser.description.split()),
+        'text': parser.body(),
+    }
+
+
+class SearchIndex:
+    """
+    Per-page term counts, turned into a sharded inverted index on every build
+
+    Every *.html page in the output dir is indexed - rendered posts and the
+    hand-written essays, notes and tutorials alike - except listing pages
+    named in search.exclude. Only pages whose size or mtime changed are
+    re-read. Shard files are named by content hash, so unchanged shards are
+    neither rewritten nor re-downloaded; shards no longer in the manifest
+    are removed.
+    """
+
+    def __init__(self, config: Dict, output_dir: str):
+        search = config.get('search', {})
+        self.config = config
+        self.enabled = search.get('enabled', True)
+        self.shard_bytes = search.get('shard_kb', 64) * 1024
+        self.exclude = set(search.get('exclude', ['index.html', 'writing.html']))
+        self.output_dir = Path(output_dir)
+        self.search_dir = self.output_dir / search.get('dir', 'search')
+        self.index_path = self.output_dir / INDEX_NAME
+
+    def find_pages(self) -> List[Path]:
+        """HTML pages in the output dir to index"""
+        return [
+            path for path in sorted(self.output_dir.glob('*.html'))
+            if path.is_file() and path.name not in self.exclude
+        ]
+
+    def update(self, posts: Optional[Dict[str, Dict]] = None) -> Dict:
+        """
+        Re-read changed pages and write the index under search_dir
+
+        Args:
+            posts: PostIndex.refresh() entries; pages rendered from them get
+                their date and tags, and newer pages win ties in the browser
+
+        Returns:
+            {
+                'pages': int,
+                'terms': int,
+                'shards': int,
+                'bytes': int,  # Gzipped size of the docs list and all shards
+                'written': int,  # Files written this build
+            }
+        """
+        by_output = {Path(entry['output']).name: entry for entry in (posts or {}).values()}
+        cached = self._load()
+
+        pages = {}
+        for path in self.find_pages():
+            stat = path.stat()
+            entry = by_output.get(path.name, {})
+            stamp = [stat.st_mtime_ns, stat.st_size, entry.get('date', ''), entry.get('tags', [])]
+            page = cached.get(path.name)
+            if not page or page['stamp'] != stamp:
+                page = self._read_page(path, entry, stamp)
+            pages[path.name] = page
+        if pages != cached:
+            self._save(pages)
+
+        docs = sorted(pages, key=lambda name: (pages[name]['date'], name), reverse=True)
+        postings: Dict[str, List[int]] = {}
+        for doc_id, name in enumerate(docs):
+            for term, weight in pages[name]['terms'].items():
+                postings.setdefault(term, []).extend((doc_id, weight))
+
+        self.search_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+
+        doc_list = [[name, pages[name]['title'], pages[name]['excerpt'], pages[name]['date']] for name in docs]
+        docs_name, docs_data = self._encode('docs', doc_list)
+        written += self._write(docs_name, docs_data)
+        total_bytes = len(docs_data)
+
+        shards = {}
+        for number, (prefixes, terms) in enumerate(self._shard(postings)):
+            name, data = self._encode(f'shard-{number}', {term: self._delta(postings[term]) for term in terms})
+            written += self._write(name, data)
+            total_bytes += len(data)
+            for prefix in prefixes:
+                shards[prefix] = name
+
+        manifest = json.dumps({
+            'version': FORMAT_VERSION,
+            'count': len(docs),
+            'docs': docs_name,
+            # Page links in docs are relative to the output dir
+            'root': Path(os.path.relpath(self.output_dir, self.search_dir)).as_posix() + '/',
+            'shards': shards,
+            'stopwords': sorted(STOPWORDS),
+        }, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        written += self._write('manifest.json', manifest, replace=True)
+        written += self._write('search.js', (ASSET_DIR / 'search.js').read_bytes(), replace=True)
+
+        keep = {docs_name, *shards.values()}
+        for path in self.search_dir.glob('*.json.gz'):
+            if path.name not in keep:
+                path.unlink()
+
+        return {
+            'pages': len(docs),
+            'terms': len(postings),
+            'shards': len(set(shards.values())),
+            'bytes': total_bytes,
+            'written': written,
+        }
+
+    def _read_page(self, path: Path, entry: Dict, stamp: List) -> Dict:
+        page = read_page(path)
+        counts = Counter(tokenize(page['text']))
+        for term in tokenize(page['title']):
+            counts[term] += TITLE_WEIGHT
+        for tag in entry.get('tags', []):
+            for term in tokenize(tag):
+                counts[term] += TAG_WEIGHT
+        return {
+            'stamp': stamp,
+            'title': page['title'],
+            'excerpt': page['excerpt'] or entry.get('excerpt', ''),
+            'date': entry.get('date', ''),
+            'terms': dict(counts),
+        }
+
+    def _shard(self, postings: Dict[str, List[int]]) -> List[Tuple[List[str], List[str]]]:
+        """
+        Group terms into (prefixes, terms) shards of about shard_bytes each
+
+        Terms are grouped by first character, and a group too large for one
+        shard is split by its first two characters. Neighbouring groups are
+        then packed together until a shard is full.
+        """
+        def size(terms):
+            return sum(len(term) + 4 + 4 * len(postings[term]) for term in terms)
+
+        by_first: Dict[str, List[str]] = {}
+        for term in sorted(postings):
+            by_first.setdefault(term[0], []).append(term)
+
+        groups = []
+        for first, terms in by_first.items():
+            if size(terms) <= self.shard_bytes:
+                groups.append((first, terms))
+                continue
+            by_second: Dict[str, List[str]] = {}
+            for term in terms:
+                by_second.setdefault(term[:2], []).append(term)
+            groups.extend(by_second.items())
+
+        shards: List[Tuple[List[str], List[str]]] = []
+        current_size = 0
+        for prefix, terms in groups:
+            group_size = size(terms)
+            if not shards or current_size + group_size > self.shard_bytes:
+                shards.append(([], []))
+                current_size = 0
+            shards[-1][0].append(prefix)
+            shards[-1][1].extend(terms)
+            current_size += group_size
+        return shards
+
+    def _delta(self, posting: List[int]) -> List[int]:
+        """[doc, weight, ...] with each doc id stored as the gap from the previous one"""
+        encoded = list(posting)
+        for i in range(len(encoded) - 2, 0, -2):
+            encoded[i] -= encoded[i - 2]
+        return encoded
+
+    def _encode(self, stem: str, value) -> Tuple[str, bytes]:
+        """(content-hashed filename, gzipped compact JSON)"""
+        raw = json.dumps(value, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        digest = hashlib.sha256(raw).hexdigest()[:10]
+        # mtime=0 keeps the bytes identical between builds of the same index
+        return f'{stem}.{digest}.json.gz', gzip.compress(raw, compresslevel=9, mtime=0)
+
+    def _write(self, name: str, data: bytes, replace: bool = False) -> int:
+        """Write a file into search_dir unless it's already there, returning 1 if written"""
+        path = self.search_dir / name
+        if path.exists() and (not replace or path.read_bytes() == data):
+            return 0
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return 1
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data.get('posts', {}) if data.get('version') == INDEX_VERSION else {}
+
+    def _save(self, posts: Dict[str, Dict]):
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'posts': posts}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
@@ -0,0 +1,183 @@
+"""
+Site Builder for Blog Post Generator
+Incrementally re-renders post markdown files whose inputs or neighbours changed
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from html_generator import HTMLGenerator
+from post_index import PostIndex
+
+
+MANIFEST_NAME = '.build-manifest.json'
+
+
+def _render_post(
+    config: Dict,
+    source: str,
+    output: str,
+    prev_link: Optional[str] = None,
+    next_link: Optional[str] = None,
+    related: Optional[List[Tuple[str, str]]] = None
+) -> float:
+    """Process pool worker - render one markdown post to HTML, returning seconds taken"""
+    start = time.perf_counter()
+
+    html_gen = HTMLGenerator(config)
+    frontmatter, markdown_content = html_gen.load_markdown(source)
+    html = html_gen.generate_html(
+        title=frontmatter.get('title', 'Untitled'),
+        content=markdown_content,
+        excerpt=frontmatter.get('excerpt', ''),
+        category=frontmatter.get('category', 'Research'),
+        date=frontmatter.get('date'),
+        prev_link=prev_link,
+        next_link=next_link,
+        related=related
+    )
+    html_gen.save_html(html, output)
+
+    return time.perf_counter() - start
+
+
+class SiteBuilder:
+    """Build every post in a directory, skipping posts whose outputs are current"""
+
+    def __init__(
+        self,
+        config: Dict,
+        source_dir: str = '.',
+        output_dir: Optional[str] = None,
+        pattern: str = '*.md'
+    ):
+        self.config = config
+        self.source_dir = Path(source_dir)
+        self.output_dir = Path(output_dir) if output_dir else self.source_dir
+        self.pattern = pattern
+        self.index = PostIndex(config, source_dir, self.output_dir, pattern)
+
+        # numpy is only needed for a build, not at CLI startup
+        from related_posts import RelatedIndex
+        from search_index import SearchIndex
+        self.related = RelatedIndex(config, self.output_dir)
+        self.search = SearchIndex(config, self.output_dir)
+        self.workers = config.get('build', {}).get('workers') or os.cpu_count() or 1
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+
+    def find_posts(self) -> List[Path]:
+        """Markdown files under source_dir that carry post frontmatter"""
+        return self.index.find_posts()
+
+    def build(self, force: bool = False) -> Dict:
+        """
+        Render dirty posts and update the manifest
+
+        A post is dirty when its source, the templates, its prev/next links
+        or its related posts changed, so adding a post re-renders it, its
+        neighbour and the posts it now appears under as related reading.
+
+        Returns:
+            {
+                'rebuilt': list,  # (source, seconds) for each re-rendered post
+                'skipped': list,  # Sources whose outputs were current
+                'failed': list,  # (source, error) pairs
+                'search': dict,  # SearchIndex.update() stats, None if disabled
+                'elapsed': float,  # Wall-clock seconds
+            }
+        """
+        start = time.monotonic()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = self._load_manifest()
+        html_gen = HTMLGenerator(self.config)
+        template_hash = html_gen.template_fingerprint()
+        # Every page links the shared stylesheet, skipped or not
+        html_gen.save_stylesheet(str(self.output_dir))
+
+        posts = self.index.refresh()
+        navigation = self.index.navigation()
+        related = self.related.update(posts)
+
+        dirty = []
+        skipped = []
+        entries = {}
+        for key in sorted(posts):
+            source = Path(key)
+            output = self.output_dir / source.with_suffix('.html').name
+            prev_link, next_link = navigation.get(key, (None, None))
+            entry = {
+                'source_hash': self._hash_file(source),
+                'template_hash': template_hash,
+                'output': str(output),
+                'prev': prev_link,
+                'next': next_link,
+                # Lists rather than tuples so the entry compares equal to the saved manifest
+                'related': [
+                    [Path(posts[other]['output']).name, posts[other]['title']]
+                    for other, _ in related.get(key, [])
+                ],
+            }
+            entries[key] = entry
+
+            if not force and manifest.get(key) == entry and output.exists():
+                skipped.append(key)
+            else:
+                dirty.append(key)
+
+        rebuilt = []
+        # Posts whose frontmatter couldn't be read count as failed, not the whole build
+        failed = list(self.index.failed.items())
+        if dirty:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(dirty))) as pool:
+                futures = {
+                    pool.submit(
+                        _render_post, self.config, key, entries[key]['output'],
+                        entries[key]['prev'], entries[key]['next'], entries[key]['related']
+                    ): key
+                    for key in dirty
+                }
+                for future in as_completed(futures):
+                    key = futures[future]
+                    try:
+                        rebuilt.append((key, future.result()))
+                    except Exception as e:
+                        failed.append((key, str(e)))
+                        entries.pop(key)
+
+        # Keep stale entries for failed posts out so they retry next build
+        for key, _ in failed:
+            manifest.pop(key, None)
+        manifest.update(entries)
+        self._save_manifest(manifest)
+
+        search = self.search.update(posts) if self.search.enabled else None
+
+        return {
+            'rebuilt': sorted(rebuilt),
+            'skipped': skipped,
+            'failed': sorted(failed),
+            'search': search,
+            'elapsed': time.monotonic() - start,
+        }
+
+    def _hash_file(self, path: Path) -> str:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save_manifest(self, manifest: Dict):
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
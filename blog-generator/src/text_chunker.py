@@ -0,0 +1,97 @@
+"""
+Text Chunker for Blog Post Generator
+Splits long sources into token-budgeted chunks on natural boundaries
+"""
+
+import re
+from typing import List
+
+
+# Rough average for English prose; good enough for budgeting without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Transcript turns: "Speaker 1:", "JANE DOE:", "[00:12:34]"
+SPEAKER_LINE = re.compile(r'^\s*(?:\[\d{1,2}:\d{2}(?::\d{2})?\]|[A-Z][\w .\'-]{0,40}:)')
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most max_tokens (estimated)
+
+    Paragraph breaks are preferred, then speaker turns, then sentences; only
+    text with none of those is split mid-run.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    chunks = []
+    current = []
+    current_len = 0
+
+    for piece in _split_units(text, max_chars):
+        # +2 for the blank line that rejoins paragraphs
+        if current and current_len + len(piece) + 2 > max_chars:
+            chunks.append('\n\n'.join(current))
+            current = []
+            current_len = 0
+        current.append(piece)
+        current_len += len(piece) + 2
+
+    if current:
+        chunks.append('\n\n'.join(current))
+
+    return chunks
+
+
+def _split_units(text: str, max_chars: int) -> List[str]:
+    """Break text into units no longer than max_chars along the best boundary"""
+    units = []
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            units.append(paragraph)
+            continue
+
+        for turn in _split_turns(paragraph):
+            if len(turn) <= max_chars:
+                units.append(turn)
+                continue
+
+            for sentence_run in _pack(SENTENCE_END.split(turn), max_chars, ' '):
+                if len(sentence_run) <= max_chars:
+                    units.append(sentence_run)
+                else:
+                    units.extend(
+                        sentence_run[i:i + max_chars]
+                        for i in range(0, len(sentence_run), max_chars)
+                    )
+    return units
+
+
+def _split_turns(paragraph: str) -> List[str]:
+    """Split a paragraph into transcript speaker turns"""
+    turns = []
+    for line in paragraph.split('\n'):
+        if turns and not SPEAKER_LINE.match(line):
+            turns[-1] += '\n' + line
+        else:
+            turns.append(line)
+    return turns
+
+
+def _pack(pieces: List[str], max_chars: int, separator: str) -> List[str]:
+    """Greedily join pieces while they fit in max_chars"""
+    packed = []
+    for piece in pieces:
+        if packed and len(packed[-1]) + len(separator) + len(piece) <= max_chars:
+            packed[-1] += separator + piece
+        else:
+            packed.append(piece)
+    return packed
@@ -0,0 +1,281 @@
+"""
+Tracing for Blog Post Generator
+Lightweight spans (duration, bytes, pages, tokens) around pipeline stages,
+written as JSONL or OpenTelemetry (OTLP/JSON) when --profile is on
+"""
+
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+
+# Attributes summed per span name in the summary table
+SUMMED_ATTRIBUTES = [
+    'bytes', 'pages', 'input_tokens', 'cache_write_tokens', 'cache_read_tokens', 'output_tokens'
+]
+
+_tracer: Optional['Tracer'] = None
+
+
+class Span:
+    """One timed operation; attributes can be added until it ends"""
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns', 'attributes', 'thread')
+
+    # Lets call sites skip working out attributes nobody will see
+    recording = True
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.thread = threading.current_thread().name
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def seconds(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e9
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round(self.seconds * 1000, 3),
+            'thread': self.thread,
+            'attributes': self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is off, so call sites need no checks"""
+
+    recording = False
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _ActiveSpan:
+    """Context manager that opens a span on the current thread's stack"""
+
+    def __init__(self, tracer: 'Tracer', name: str, parent: Optional[Span], attributes: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.parent = parent
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Span:
+        self.span = self.tracer.start(self.name, self.parent, self.attributes)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.span.set(error=f"{exc_type.__name__}: {exc}")
+        self.tracer.end(self.span)
+        return False
+
+
+class Tracer:
+    """Collects finished spans for one run"""
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.root: Optional[Span] = None
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def current(self) -> Optional[Span]:
+        stack = self._stack()
+        return stack[-1] if stack else self.root
+
+    def start(self, name: str, parent: Optional[Span], attributes: Dict) -> Span:
+        parent = parent or self.current()
+        span = Span(name, self.trace_id, parent.span_id if parent else None, attributes)
+        self._stack().append(span)
+        if self.root is None:
+            self.root = span
+        return span
+
+    def end(self, span: Span):
+        span.end_ns = time.time_ns()
+        stack = self._stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+        with self.lock:
+            self.spans.append(span)
+
+    def record(self, name: str, seconds: float, parent: Optional[Span] = None, **attributes):
+        """Add an already-finished span, e.g. timings reported back by a worker process"""
+        parent = parent or self.current()
+        span = Span(name, self.trace_id, parent.span_id if parent else None, attributes)
+        span.start_ns = parent.start_ns if parent else time.time_ns()
+        span.end_ns = span.start_ns + int(seconds * 1e9)
+        with self.lock:
+            self.spans.append(span)
+
+    def summary(self) -> List[Dict]:
+        """
+        Aggregate spans by name, in order of first appearance
+
+        Returns:
+            [{
+                'name': str,
+                'count': int,
+                'total': float,  # Seconds summed over all spans
+                'max': float,
+                'attributes': dict,  # Sums of SUMMED_ATTRIBUTES present
+            }]
+        """
+        rows: Dict[str, Dict] = {}
+        for span in sorted(self.spans, key=lambda s: s.start_ns):
+            row = rows.setdefault(span.name, {
+                'name': span.name, 'count': 0, 'total': 0.0, 'max': 0.0, 'attributes': {}
+            })
+            row['count'] += 1
+            row['total'] += span.seconds
+            row['max'] = max(row['max'], span.seconds)
+            for key in SUMMED_ATTRIBUTES:
+                value = span.attributes.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row['attributes'][key] = row['attributes'].get(key, 0) + value
+        return list(rows.values())
+
+    def write(self, path: str, format: str = 'jsonl'):
+        """Write spans as JSONL (one span per line) or an OTLP/JSON export"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        spans = sorted(self.spans, key=lambda s: s.start_ns)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            if format == 'otlp':
+                json.dump(_otlp(spans), f)
+            else:
+                for span in spans:
+                    f.write(json.dumps(span.to_dict()) + '\n')
+
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp(spans: List[Span]) -> Dict:
+    """Spans in the OTLP/JSON trace format accepted by OpenTelemetry collectors"""
+    return {'resourceSpans': [{
+        'resource': {'attributes': [
+            {'key': 'service.name', 'value': {'stringValue': 'blog-generator'}},
+            {'key': 'process.pid', 'value': {'intValue': str(os.getpid())}},
+        ]},
+        'scopeSpans': [{
+            'scope': {'name': 'blog-generator'},
+            'spans': [{
+                'traceId': span.trace_id,
+                'spanId': span.span_id,
+                'parentSpanId': span.parent_id or '',
+                'name': span.name,
+                'kind': 1,
+                'startTimeUnixNano': str(span.start_ns),
+                'endTimeUnixNano': str(span.end_ns),
+                'attributes': [
+                    {'key': key, 'value': _otlp_value(value)}
+                    for key, value in span.attributes.items() if value is not None
+                ],
+                'status': {'code': 2, 'message': span.attributes['error']}
+                if 'error' in span.attributes else {},
+            } for span in spans],
+        }],
+    }]}
+
+
+def enable() -> Tracer:
+    """Start collecting spans for this process"""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    """Stop collecting spans, returning the tracer that was active"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def span(name: str, parent: Optional[Span] = None, **attributes):
+    """
+    Time a block: `with span('html.render', bytes=n) as s: ...; s.set(...)`
+
+    Spans nest on the current thread. Work handed to a thread pool should
+    pass parent=current_span() captured before submitting.
+    """
+    if _tracer is None:
+        return _NOOP_SPAN
+    return _ActiveSpan(_tracer, name, parent, attributes)
+
+
+def current_span() -> Optional[Span]:
+    return _tracer.current() if _tracer else None
+
+
+def annotate(**attributes):
+    """Set attributes on the innermost open span (e.g. inside a @traced method)"""
+    if _tracer is not None:
+        current = _tracer.current()
+        if current is not None:
+            current.set(**attributes)
+
+
+def record(name: str, seconds: float, **attributes):
+    """Add a finished span under the current one (no-op while tracing is off)"""
+    if _tracer is not None:
+        _tracer.record(name, seconds, **attributes)
+
+
+def traced(name: str) -> Callable:
+    """Decorator wrapping every call of a function in a span"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _ActiveSpan(_tracer, name, None, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
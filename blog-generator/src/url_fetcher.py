@@ -0,0 +1,244 @@
+"""
+URL Fetcher for Blog Post Generator
+Pooled HTTP fetching with retries, conditional revalidation and a size cap
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# One session per process and pool shape, so connections are reused across
+# InputProcessor instances and threads
+_sessions: Dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(connections_per_host: int, retries: int) -> requests.Session:
+    """Return the shared pooled session for these settings"""
+    key = (connections_per_host, retries)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            retry = Retry(
+                total=retries,
+                backoff_factor=0.5,
+                backoff_jitter=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET', 'HEAD'],
+                respect_retry_after_header=True
+            )
+            # pool_block caps simultaneous connections to any one host
+            adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=connections_per_host,
+                pool_block=True,
+                max_retries=retry
+            )
+            session = requests.Session()
+            session.headers['User-Agent'] = USER_AGENT
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _sessions[key] = session
+        return session
+
+
+class URLFetcher:
+    """Fetch pages through a pooled session, revalidating against a local store"""
+
+    def __init__(
+        self,
+        timeout: float = 30,
+        max_bytes: int = 10485760,
+        connections_per_host: int = 4,
+        retries: int = 3,
+        store_dir: Optional[str] = None,
+        store_max_bytes: int = 104857600
+    ):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.session = _get_session(connections_per_host, retries)
+        self.store_dir = Path(store_dir).expanduser() if store_dir else None
+        self.store_max_bytes = store_max_bytes
+
+    @classmethod
+    def from_config(cls, config: Dict, use_store: bool = True) -> 'URLFetcher':
+        """Build a fetcher from the `processing:` and `cache:` sections of config.yaml"""
+        processing = config.get('processing', {})
+        cache_config = config.get('cache', {})
+        store_dir = None
+        if use_store:
+            cache_dir = cache_config.get('dir', '~/.cache/blog-generator')
+            store_dir = Path(cache_dir).expanduser() / 'http'
+
+        return cls(
+            timeout=processing.get('fetch_timeout', 30),
+            max_bytes=processing.get('fetch_max_bytes', 10485760),
+            connections_per_host=processing.get('fetch_connections_per_host', 4),
+            retries=processing.get('fetch_retries', 3),
+            store_dir=store_dir,
+            store_max_bytes=cache_config.get('http_max_mb', 100) * 1024 * 1024
+        )
+
+    def fetch(self, url: str) -> Dict:
+        """
+        Fetch a URL, using If-None-Match/If-Modified-Since when a copy is stored
+
+        Returns:
+            {
+                'content': bytes,  # Response body (capped at max_bytes)
+                'validators': dict,  # ETag / Last-Modified of this version
+                'not_modified': bool,  # True if served from the local store
+                'truncated': bool,  # True if the body hit max_bytes
+            }
+        """
+        stored = self._load(url)
+
+        headers = {}
+        if stored:
+            if 'ETag' in stored['validators']:
+                headers['If-None-Match'] = stored['validators']['ETag']
+            if 'Last-Modified' in stored['validators']:
+                headers['If-Modified-Since'] = stored['validators']['Last-Modified']
+
+        with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+            if response.status_code == 304 and stored:
+                return {
+                    'content': stored['content'],
+                    'validators': stored['validators'],
+                    'not_modified': True,
+                    'truncated': stored['truncated'],
+                }
+
+            response.raise_for_status()
+            content, truncated = self._read_capped(response)
+            validators = {
+                header: response.headers[header]
+                for header in ('ETag', 'Last-Modified')
+                if header in response.headers
+            }
+
+        if validators:
+            self._save(url, content, validators, truncated)
+
+        return {
+            'content': content,
+            'validators': validators,
+            'not_modified': False,
+            'truncated': truncated,
+        }
+
+    def _read_capped(self, response: requests.Response):
+        """Read a streamed body, stopping once max_bytes have arrived"""
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=65536):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= self.max_bytes:
+                return b''.join(chunks)[:self.max_bytes], True
+        return b''.join(chunks), False
+
+    def _load(self, url: str) -> Optional[Dict]:
+        """Load the stored copy of a URL, if any"""
+        if not self.store_dir:
+            return None
+
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            with open(body_path, 'rb') as f:
+                meta['content'] = f.read()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        # Bump mtime so eviction treats this copy as recently used
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+
+        return meta
+
+    def _save(self, url: str, content: bytes, validators: Dict, truncated: bool):
+        """Store a fetched copy for later revalidation"""
+        if not self.store_dir:
+            return
+
+        meta_path, body_path = self._paths(url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_suffix = f'.{os.getpid()}.{threading.get_ident()}.tmp'
+        body_tmp = body_path.with_suffix(tmp_suffix)
+        with open(body_tmp, 'wb') as f:
+            f.write(content)
+        os.replace(body_tmp, body_path)
+
+        meta_tmp = meta_path.with_suffix(tmp_suffix)
+        with open(meta_tmp, 'w', encoding='utf-8') as f:
+            json.dump({'url': url, 'validators': validators, 'truncated': truncated}, f)
+        os.replace(meta_tmp, meta_path)
+
+        self._evict()
+
+    def clear(self) -> int:
+        """Remove every stored copy, returning the number removed"""
+        removed = 0
+        for meta_path in self._entries():
+            for path in (meta_path, meta_path.with_suffix('.body')):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+            removed += 1
+        return removed
+
+    def size(self) -> int:
+        """Total bytes currently stored"""
+        return sum(self._stat(meta_path)[1] for meta_path in self._entries())
+
+    def _evict(self):
+        """Drop least recently used copies until the store fits in store_max_bytes"""
+        entries = [(meta_path, *self._stat(meta_path)) for meta_path in self._entries()]
+        total = sum(size for _, _, size in entries)
+        if total <= self.store_max_bytes:
+            return
+
+        for meta_path, _, size in sorted(entries, key=lambda entry: entry[1]):
+            for path in (meta_path, meta_path.with_suffix('.body')):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+            total -= size
+            if total <= self.store_max_bytes:
+                break
+
+    def _entries(self):
+        if not self.store_dir or not self.store_dir.exists():
+            return []
+        return list(self.store_dir.glob('*/*.json'))
+
+    def _stat(self, meta_path: Path):
+        """(mtime of the metadata, bytes of metadata and body together)"""
+        try:
+            stat = meta_path.stat()
+            body_size = meta_path.with_suffix('.body').stat().st_size
+            return stat.st_mtime, stat.st_size + body_size
+        except FileNotFoundError:
+            return 0.0, 0
+
+    def _paths(self, url: str):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = self.store_dir / digest[:2] / digest
+        return base.with_suffix('.json'), base.with_suffix('.body')
@@ -0,0 +1,6 @@
+"""Make src importable the same way generate.py does"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
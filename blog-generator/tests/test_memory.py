@@ -0,0 +1,73 @@
+"""
+Peak-memory bounds for extraction on large inputs
+
+Each input is built before tracing starts, so the peak is what the code
+under test allocates on top of it. The text never repeats, so shingle sets
+or word lists that grow with the input can't hide behind deduplication.
+"""
+
+import random
+import tracemalloc
+
+import pytest
+
+from fingerprint import simhash
+from input_processor import InputProcessor, _iter_clean_text, _iter_page_texts
+
+
+MB = 1_000_000
+
+
+def unique_text(chars: int, seed: int = 0) -> str:
+    """Prose-like ASCII text of about `chars` characters with few repeated shingles"""
+    rng = random.Random(seed)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    vocabulary = [''.join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(50000)]
+    words = []
+    size = 0
+    while size < chars:
+        word = rng.choice(vocabulary)
+        words.append(word + ('.\n\n' if rng.random() < 0.02 else ' '))
+        size += len(words[-1])
+    return ''.join(words)
+
+
+def peak_bytes(fn) -> int:
+    """Peak traced allocation while fn runs"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(scope='module')
+def text() -> str:
+    return unique_text(2 * MB)
+
+
+def test_clean_pages_peak(text):
+    """Cleaning PDF pages holds the cleaned pieces and the joined result, not the raw pages again"""
+    pages = [
+        {'index': number + 1, 'text': text[offset:offset + 4000]}
+        for number, offset in enumerate(range(0, len(text), 4000))
+    ]
+    peak = peak_bytes(lambda: ''.join(_iter_clean_text(_iter_page_texts(pages))))
+    assert peak < 2.5 * len(text)
+
+
+def test_simhash_peak(text):
+    """Shingles are hashed as they are read, so memory doesn't grow with the text"""
+    peak = peak_bytes(lambda: simhash(text))
+    assert peak < 8 * MB
+
+
+def test_process_text_file_peak(text, tmp_path):
+    """process() on a large transcript: the content, one read buffer and simhash's fixed buffers"""
+    path = tmp_path / 'transcript.txt'
+    path.write_text(text, encoding='utf-8')
+    processor = InputProcessor({}, use_cache=False)
+
+    peak = peak_bytes(lambda: processor.process(str(path)))
+    assert peak < 3 * len(text) + 8 * MB